@@ -0,0 +1,229 @@
+"""
+Bootstrapping de las curvas TIIE28 y FTIIE con NumPy, para muchos vectores de
+cotizaciones a la vez.
+
+QuantLib ajusta un helper a la vez a través de SWIG, lo que está bien para una
+curva pero es lento para miles de escenarios. `AjusteVectorizado` toma de los
+helpers de `curvas.py` (`TIIE28Helpers` y `FTIIESwapHelpers`) las fechas de
+cada cupón una sola vez y después ajusta lotes de cotizaciones en NumPy:
+
+- Los nodos son las fechas pilar de los helpers, como en QuantLib, y la curva
+  es un spline cúbico natural sobre el logaritmo del factor de descuento
+  (`PiecewiseNaturalLogCubicDiscount`). Con los nodos fijos, el logaritmo del
+  factor en cualquier fecha es lineal en los logaritmos de los nodos, así que
+  basta con una matriz de pesos (calculada con `consulta.CurvaVectorizada`).
+- El cupón flotante de un swap (TIIE28 con cupones par o FTIIE compuesto
+  diario) paga P(inicio)/P(fin) - 1 por unidad de nocional (escalado por
+  plazo de devengo entre plazo del índice en TIIE28), descontado con la curva
+  de descuento. La pata fija paga la tasa por el plazo de devengo.
+- Se resuelve que todas las tasas par coincidan a la vez con el método de
+  Newton (Jacobiano exacto), en lote para todos los escenarios. QuantLib llega
+  a la misma solución, pues el spline es global y repite la pasada del
+  bootstrapping hasta que converge.
+
+La curva de descuento es la misma para todos los escenarios. La curva FTIIE se
+ajusta solo con swaps (sin futuros), como `genFTIIE` cuando no hay futuros.
+
+>>> ajuste = AjusteVectorizado('TIIE28', tenors_tiie28, crvDISCTIIE)
+>>> factores = ajuste.ajustar(tasas)   # (escenarios x nodos)
+>>> curva = ajuste.curvaVectorizada(factores[0])
+
+`benchmarks/ajuste_vectorizado.py` compara los nodos contra QuantLib.
+"""
+
+import warnings
+
+import numpy as np
+import QuantLib as ql
+
+from consulta import CurvaVectorizada
+from convenciones import actual360, calendario_mexico, convenciones, fechaEvaluacion
+from curvas import FTIIESwapHelpers, TIIE28Helpers
+from persistencia import curvaDeNodos
+
+
+def _curvaQL(curva):
+    """ Curva de QuantLib sobre los nodos de una `CurvaVectorizada`. """
+
+    referencia = ql.Date.from_date(curva.referencia.astype(object))
+    fechas = [referencia + int(round(t*360)) for t in curva.tiempos] # Actual/360
+    return curvaDeNodos(fechas, list(curva.factores), curva.interpolacion)
+
+
+class AjusteVectorizado:
+    """
+    Bootstrapping en NumPy de la curva TIIE28 o FTIIE para una curva de descuento.
+
+    Parameters
+    ----------
+    curva : str
+        'TIIE28' o 'FTIIE'.
+    tenors : list
+        Tenors de los insumos (`tenors_tiie28` o `tenors_ftiie`).
+    curva_descuento : ql.YieldTermStructure or CurvaVectorizada
+        Curva de descuento (p. ej. Descuento MXN).
+    fecha : ql.Date, optional
+        Fecha de evaluación. Por defecto la fecha de evaluación actual.
+    """
+
+    def __init__(self, curva, tenors, curva_descuento, fecha=None):
+
+        if curva not in ('TIIE28', 'FTIIE'):
+            raise ValueError(f'Curva no soportada: {curva!r}')
+        self.curva = curva
+        self.tenors = list(tenors)
+
+        with fechaEvaluacion(fecha) as referencia:
+            # Los helpers necesitan una curva de QuantLib; una `CurvaVectorizada` se
+            # pasa a una curva sobre sus nodos (las fechas de los helpers no dependen de ella)
+            descuento_ql = curva_descuento
+            if isinstance(curva_descuento, CurvaVectorizada):
+                descuento_ql = _curvaQL(curva_descuento)
+
+            # Las tasas no cambian las fechas de los helpers
+            tasas = [5.0]*len(self.tenors)
+            if curva == 'TIIE28':
+                helpers = TIIE28Helpers(tasas, self.tenors, descuento_ql)
+            else:
+                helpers = FTIIESwapHelpers(tasas, self.tenors, descuento_ql)
+            cupones, fijos = self._cupones(helpers)
+
+            # Factores de descuento de los pagos, con la curva en la fecha de evaluación
+            pagos = [c[3] for c in cupones] + [f[1] for f in fijos]
+            if isinstance(curva_descuento, CurvaVectorizada):
+                factores_pago = curva_descuento.descuento([d.ISO() for d in pagos])
+            else:
+                factores_pago = np.array([curva_descuento.discount(d) for d in pagos])
+
+            # Nodos: fecha de referencia y fecha pilar de cada helper
+            pilares = [h.pillarDate() for h in helpers]
+
+        if any(b <= a for a, b in zip(pilares, pilares[1:])):
+            raise ValueError('Las fechas pilar de los helpers deben ser crecientes')
+        self.referencia = referencia.to_date()
+        self.fechas = [referencia] + pilares
+        self.tiempos = np.array([actual360.yearFraction(referencia, d) for d in self.fechas])
+
+        # Cupones flotantes: helper, inicio, fin y peso (descuento del pago x devengo / plazo del índice)
+        helper, inicios, fines, _, escala = (list(c) for c in zip(*cupones))
+        pesos = factores_pago[:len(cupones)]*np.array(escala)
+        self._pesos = np.zeros((len(helpers), len(pesos)))
+        self._pesos[helper, np.arange(len(pesos))] = pesos
+
+        # Anualidad de la pata fija de cada helper (por unidad de tasa)
+        helper, _, devengo = (list(c) for c in zip(*fijos))
+        self._anualidad = np.bincount(helper, factores_pago[len(cupones):]*np.array(devengo), minlength=len(helpers))
+
+        # log P(inicio) - log P(fin) de cada cupón es lineal en los logaritmos de los nodos
+        pesos_inicio = self._pesosSpline([actual360.yearFraction(referencia, d) for d in inicios])
+        pesos_fin = self._pesosSpline([actual360.yearFraction(referencia, d) for d in fines])
+        self._delta = pesos_inicio - pesos_fin # (cupones x nodos sin la referencia)
+
+    def _cupones(self, helpers):
+        """ Cupones flotantes (helper, inicio, fin, pago, escala) y fijos (helper, pago, devengo) de los helpers. """
+
+        cupones, fijos = [], []
+        for i, h in enumerate(helpers):
+            if isinstance(h, ql.DepositRateHelper):
+                # Depósito: tasa = (P(inicio)/P(fin) - 1)/plazo, sin descuento
+                inicio, fin = h.earliestDate(), h.maturityDate()
+                cupones.append((i, inicio, fin, None, 1.0))
+                fijos.append((i, None, actual360.yearFraction(inicio, fin)))
+                continue
+
+            swap = h.swap()
+            for cf in swap.fixedLeg():
+                cupon = ql.as_coupon(cf)
+                fijos.append((i, cupon.date(), cupon.accrualPeriod()))
+
+            if isinstance(h, ql.OISRateHelper):
+                # Cupón compuesto diario: las tasas overnight se telescopian en P(inicio)/P(fin)
+                for cf in swap.overnightLeg():
+                    cupon = ql.as_coupon(cf)
+                    cupones.append((i, cupon.accrualStartDate(), cupon.accrualEndDate(), cupon.date(), 1.0))
+            else:
+                # Cupón de TIIE28 par: del valor del fixing al fin del periodo de devengo
+                conv = convenciones['TIIE28']
+                calendario, dias_liq = conv['calendario'], conv['dias_liq']
+                for cf in swap.floatingLeg():
+                    cupon = ql.as_floating_rate_coupon(cf)
+                    inicio = cupon.index().valueDate(cupon.fixingDate())
+                    fin = calendario.advance(calendario.advance(cupon.accrualEndDate(), -dias_liq, ql.Days),
+                                             dias_liq, ql.Days)
+                    escala = cupon.accrualPeriod()/conv['conteo'].yearFraction(inicio, fin)
+                    cupones.append((i, inicio, fin, cupon.date(), escala))
+
+        # Los depósitos no se descuentan: se les da la fecha de referencia (factor 1)
+        hoy = ql.Settings.instance().evaluationDate
+        cupones = [(i, a, b, hoy if p is None else p, e) for i, a, b, p, e in cupones]
+        fijos = [(i, hoy if p is None else p, t) for i, p, t in fijos]
+        return cupones, fijos
+
+    def _pesosSpline(self, tiempos):
+        """ Matriz W tal que log P(tiempos) = W @ log P(nodos), sin la columna de la referencia. """
+
+        n = len(self.tiempos)
+        W = np.empty((len(tiempos), n - 1))
+        for k in range(1, n):
+            log_nodos = np.zeros(n)
+            log_nodos[k] = 1.0
+            curva = CurvaVectorizada(self.referencia, self.tiempos, np.exp(log_nodos))
+            W[:, k-1] = np.log(curva.descuento(np.asarray(tiempos, dtype=float)))
+        return W
+
+    def ajustar(self, tasas, precision=1e-13, max_iteraciones=20):
+        """
+        Factores de descuento de los nodos que reprecian las tasas par.
+
+        Parameters
+        ----------
+        tasas : array
+            Tasas en % en el orden de `tenors`; un vector o una matriz
+            (escenarios x tenors).
+        precision : float
+            Error máximo de repreciación (en tasa decimal).
+        max_iteraciones : int
+            Iteraciones de Newton.
+
+        Returns
+        -------
+        np.ndarray
+            Factores de descuento en `fechas` (el primero es 1), con la misma
+            dimensión que `tasas`. Los escenarios que no convergen quedan en NaN.
+        """
+
+        tasas = np.asarray(tasas, dtype=float)
+        una = tasas.ndim == 1
+        K = np.atleast_2d(tasas)/100
+        if K.shape[1] != len(self.tenors):
+            raise ValueError(f'Se esperaban {len(self.tenors)} tasas por escenario')
+
+        y = -K*self.tiempos[1:] # Arranque con la curva plana en cada tasa
+        for _ in range(max_iteraciones):
+            E = np.exp(y @ self._delta.T) # P(inicio)/P(fin) de cada cupón
+            residuo = (E - 1) @ self._pesos.T - K*self._anualidad
+            error = np.abs(residuo)/self._anualidad
+            if np.all(error < precision):
+                break
+            J = (E[:, None, :]*self._pesos) @ self._delta # Jacobiano (escenarios x helpers x nodos)
+            with np.errstate(invalid='ignore', over='ignore'):
+                y = y - np.linalg.solve(J, residuo[..., None])[..., 0]
+        else:
+            E = np.exp(y @ self._delta.T)
+            error = np.abs((E - 1) @ self._pesos.T - K*self._anualidad)/self._anualidad
+
+        factores = np.hstack([np.ones((len(K), 1)), np.exp(y)])
+        fallidos = ~np.all(error < precision, axis=1)
+        if fallidos.any():
+            factores[fallidos] = np.nan
+            warnings.warn(f'{fallidos.sum()} escenarios no convergieron y quedan en NaN')
+        return factores[0] if una else factores
+
+    def curvaVectorizada(self, factores):
+        """ `CurvaVectorizada` de un escenario a partir de sus factores de descuento. """
+        return CurvaVectorizada(self.referencia, self.tiempos, factores)
+
+    def curvaQL(self, factores):
+        """ Curva de QuantLib sobre los nodos de un escenario (sin bootstrapping). """
+
+        return curvaDeNodos(self.fechas, list(factores), 'cubica', actual360, calendario_mexico)
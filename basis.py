@@ -0,0 +1,161 @@
+"""
+Basis TIIE28 - TIIE de Fondeo a lo largo del histórico.
+
+A partir de las curvas TIIE28 y FTIIE de muchas fechas se calcula, para cada
+fecha de valuación, la estructura temporal del basis forward: la diferencia
+entre el forward de TIIE28 y el forward compuesto de FTIIE sobre el mismo
+periodo de 28 días, en una malla fija de inicios (`plazos_basis`, en periodos
+de 28 días). El resultado es una matriz fechas x plazos en puntos base.
+
+Las curvas se toman de la tabla de nodos de `historico.genHistorico` (o de
+fotografías guardadas, ver `persistencia.nodosGuardados`), o se construyen al
+momento con `basisDesdeInsumos`. Las curvas de todas las fechas se evalúan a la
+vez con `consulta.descuentoLote`: las fechas se agrupan por número de nodos
+(normalmente uno o dos grupos) y cada grupo es una sola operación de NumPy.
+
+>>> historico = genHistorico(insumos_por_fecha)
+>>> basis = basisHistorico(historico)      # fechas x plazos, en pb
+>>> resumenBasis(basis)                    # estadísticas por plazo
+"""
+
+import numpy as np
+import pandas as pd
+
+from consulta import descuentoLote
+from historico import genHistorico
+
+
+# Inicio de cada forward en periodos de 28 días (0 = forward a 28 días desde hoy)
+plazos_basis = (0, 1, 3, 6, 9, 13, 26, 39, 52, 65, 91, 130, 195, 260)
+
+
+def forwardsHistorico(historico, curva, plazos=plazos_basis, dias=28):
+    """
+    Tasas forward de una curva en todas las fechas del histórico.
+
+    Parameters
+    ----------
+    historico : pd.DataFrame
+        Nodos con columnas 'Fecha Valuación', 'Curva', 'Fecha' y 'Factor de
+        Descuento' (ver `historico.genHistorico`).
+    curva : str
+        Nombre de la curva (p. ej. 'TIIE28' o 'FTIIE').
+    plazos : sequence
+        Inicio de cada forward en periodos de 28 días.
+    dias : int
+        Días naturales del periodo del forward.
+
+    Returns
+    -------
+    pd.DataFrame
+        Tasas forward simples Actual/360 en % (fechas x plazos).
+    """
+
+    tabla = historico.loc[historico['Curva'] == curva, ['Fecha Valuación', 'Fecha', 'Factor de Descuento']]
+    if tabla.empty:
+        raise KeyError(f'No hay nodos de la curva {curva} en el histórico')
+    tabla = tabla.assign(**{'Fecha Valuación': pd.to_datetime(tabla['Fecha Valuación']),
+                            'Fecha': pd.to_datetime(tabla['Fecha'])})
+    tabla = tabla.sort_values(['Fecha Valuación', 'Fecha'], kind='stable')
+    tiempos = (tabla['Fecha'] - tabla['Fecha Valuación']).dt.days.to_numpy()/360
+    factores = tabla['Factor de Descuento'].to_numpy(dtype=float)
+
+    inicio = np.asarray(plazos, dtype=float)*28/360
+    fin = inicio + dias/360
+
+    # Fechas agrupadas por número de nodos: cada grupo es una matriz (fechas x nodos)
+    nodos = tabla.groupby('Fecha Valuación', sort=True).size()
+    posicion = np.concatenate([[0], np.cumsum(nodos.to_numpy())[:-1]])
+    resultado = np.empty((len(nodos), len(inicio)))
+    for n in np.unique(nodos.to_numpy()):
+        renglones = np.flatnonzero(nodos.to_numpy() == n)
+        indices = posicion[renglones, None] + np.arange(n)
+        P = descuentoLote(tiempos[indices], factores[indices], np.concatenate([inicio, fin]))
+        resultado[renglones] = (P[:, :len(inicio)]/P[:, len(inicio):] - 1)/(dias/360)*100
+
+    return pd.DataFrame(resultado, index=pd.DatetimeIndex(nodos.index, name='Fecha Valuación'),
+                        columns=pd.Index(plazos, name='Plazo'))
+
+
+def basisHistorico(historico, plazos=plazos_basis, dias=28):
+    """
+    Basis forward TIIE28 - FTIIE en todas las fechas del histórico.
+
+    Parameters
+    ----------
+    historico : pd.DataFrame
+        Nodos con las curvas 'TIIE28' y 'FTIIE' (ver `forwardsHistorico`).
+    plazos : sequence
+        Inicio de cada forward en periodos de 28 días.
+    dias : int
+        Días naturales del periodo de los forwards.
+
+    Returns
+    -------
+    pd.DataFrame
+        Basis en puntos base (fechas x plazos), solo para las fechas que tienen
+        ambas curvas. La transpuesta es la matriz plazos x fechas.
+    """
+
+    tiie28 = forwardsHistorico(historico, 'TIIE28', plazos, dias)
+    ftiie = forwardsHistorico(historico, 'FTIIE', plazos, dias)
+    tiie28, ftiie = tiie28.align(ftiie, join='inner', axis=0)
+    return (tiie28 - ftiie)*100
+
+
+def basisDesdeInsumos(insumos_por_fecha, plazos=plazos_basis, dias=28, **opciones):
+    """
+    Construye las curvas de cada fecha y calcula su basis forward TIIE28 - FTIIE.
+
+    Parameters
+    ----------
+    insumos_por_fecha : dict
+        Insumos de mercado por fecha (ver `historico.genHistorico`).
+    plazos, dias
+        Ver `basisHistorico`.
+    **opciones
+        Se pasan a `historico.genHistorico` (p. ej. `n_procesos`,
+        `omitir_errores` o `arranque_caliente`).
+
+    Returns
+    -------
+    pd.DataFrame
+        Basis en puntos base (fechas x plazos).
+    """
+
+    return basisHistorico(genHistorico(insumos_por_fecha, **opciones), plazos, dias)
+
+
+def resumenBasis(basis, cuantiles=(0.05, 0.5, 0.95)):
+    """
+    Estadísticas del basis por plazo.
+
+    Parameters
+    ----------
+    basis : pd.DataFrame
+        Basis por fecha y plazo (ver `basisHistorico`).
+    cuantiles : sequence
+        Cuantiles que se reportan.
+
+    Returns
+    -------
+    pd.DataFrame
+        Por plazo: observaciones, media, desviación estándar, mínimo, cuantiles,
+        máximo, último valor, volatilidad del cambio diario (desviación estándar
+        de las diferencias entre fechas consecutivas) y cambio total en el periodo.
+    """
+
+    cambios = basis.diff()
+    resumen = pd.DataFrame({
+        'observaciones': basis.count(),
+        'media': basis.mean(),
+        'desviacion': basis.std(),
+        'minimo': basis.min(),
+        **{f'p{round(100*q):02d}': basis.quantile(q) for q in cuantiles},
+        'maximo': basis.max(),
+        'ultimo': basis.ffill().iloc[-1] if len(basis) else np.nan,
+        'vol_diaria': cambios.std(),
+        'cambio_total': basis.ffill().iloc[-1] - basis.bfill().iloc[0] if len(basis) else np.nan,
+    })
+    resumen.index.name = 'Plazo'
+    return resumen
@@ -0,0 +1,137 @@
+"""
+Valida el bootstrapping en NumPy (`ajuste_vectorizado.py`) contra QuantLib y
+compara su velocidad.
+
+Con los insumos del 19 de febrero de 2025 se generan escenarios de tasas de
+TIIE28 y FTIIE con movimientos al azar (incluye las tasas del ejemplo). Para
+una muestra de escenarios se construye la curva de QuantLib (`genTIIE28` y
+`genFTIIE` sin futuros) y se comparan:
+
+- las fechas de los nodos, que deben ser las mismas;
+- los factores de descuento de los nodos;
+- las tasas par de los swaps de `swaps.py` proyectados con una y otra curva;
+- los factores de un ajuste cuya curva de descuento es una
+  `consulta.CurvaVectorizada` contra los del ajuste con la curva de QuantLib.
+
+Después se mide el tiempo de ajustar todos los escenarios en lote contra el
+de QuantLib por curva. Cada resultado es una línea JSON; si alguna diferencia
+rebasa su tolerancia el script termina con código de salida 1.
+
+Uso:
+    python benchmarks/ajuste_vectorizado.py [escenarios]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+import swaps # noqa: E402
+from ajuste_vectorizado import AjusteVectorizado # noqa: E402
+from consulta import CurvaVectorizada # noqa: E402
+from curvas import insumos_ejemplo as ins # noqa: E402
+
+
+tolerancia_factores = 1e-10 # Diferencia máxima en factores de descuento
+tolerancia_tasas = 1e-10 # Diferencia máxima en tasas par (decimales)
+muestra = 25 # Escenarios que se comparan contra QuantLib
+
+
+def curvaQuantLib(nombre, tasas, curva_descuento):
+    """ Curva de QuantLib con las tasas de un escenario. """
+
+    if nombre == 'TIIE28':
+        return curvas.genTIIE28(list(tasas), ins['tenors_tiie28'], curva_descuento)
+    return curvas.genFTIIE(list(tasas), ins['tenors_ftiie'], curva_descuento)
+
+
+def tasasPar(nombre, tenors, curva_proyeccion, curva_descuento):
+    """ Tasas par (decimales) de los swaps de `swaps.py` proyectados con `curva_proyeccion`. """
+
+    crear = swaps.swapTIIE28 if nombre == 'TIIE28' else swaps.swapFTIIE
+    return [crear(1, 5.0, t, curva_proyeccion, curva_descuento).fairRate() for t in tenors]
+
+
+def validar(nombre, ajuste, escenarios, curva_descuento):
+    """ Diferencias máximas contra QuantLib en una muestra de escenarios. """
+
+    factores = ajuste.ajustar(escenarios[:muestra])
+    fechas_iguales, error_factores, error_tasas = True, 0.0, 0.0
+    for tasas, factores_numpy in zip(escenarios[:muestra], factores):
+        curva = curvaQuantLib(nombre, tasas, curva_descuento)
+        fechas_iguales &= list(curva.dates()) == ajuste.fechas
+        error_factores = max(error_factores, np.abs(np.array(curva.data()) - factores_numpy).max())
+
+        # Tasas par de los swaps con una y otra curva (el depósito de TIIE28 se omite)
+        tenors = ajuste.tenors[1:] if nombre == 'TIIE28' else ajuste.tenors
+        par_numpy = tasasPar(nombre, tenors, ajuste.curvaQL(factores_numpy), curva_descuento)
+        par_quantlib = tasasPar(nombre, tenors, curva, curva_descuento)
+        error_tasas = max(error_tasas, np.abs(np.array(par_numpy) - par_quantlib).max())
+    return fechas_iguales, error_factores, error_tasas
+
+
+def velocidad(nombre, ajuste, escenarios, curva_descuento):
+    """ Segundos por escenario de NumPy (en lote) y de QuantLib (una curva a la vez). """
+
+    t0 = time.perf_counter()
+    ajuste.ajustar(escenarios)
+    numpy = (time.perf_counter() - t0)/len(escenarios)
+
+    t0 = time.perf_counter()
+    for tasas in escenarios[:muestra]:
+        curvaQuantLib(nombre, tasas, curva_descuento).nodes()
+    quantlib = (time.perf_counter() - t0)/muestra
+    return numpy, quantlib
+
+
+if __name__ == '__main__':
+    n_escenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    crv = curvas.genCurvas(ins)
+    rng = np.random.default_rng(0)
+
+    fallidas = []
+    for nombre, tenors, tasas in (('TIIE28', ins['tenors_tiie28'], ins['tasas_tiie28']),
+                                  ('FTIIE', ins['tenors_ftiie'], ins['tasas_ftiie'])):
+        # Movimientos paralelos y por tenor de hasta ~1%
+        choques = 0.5*rng.standard_normal((n_escenarios, 1)) + 0.2*rng.standard_normal((n_escenarios, len(tasas)))
+        escenarios = np.vstack([tasas, np.array(tasas) + choques[1:]])
+
+        t0 = time.perf_counter()
+        ajuste = AjusteVectorizado(nombre, tenors, crv['DISCTIIE'])
+        preparacion = time.perf_counter() - t0
+
+        fechas_iguales, error_factores, error_tasas = validar(nombre, ajuste, escenarios, crv['DISCTIIE'])
+
+        # Misma curva de descuento dada como `CurvaVectorizada`
+        ajuste_numpy = AjusteVectorizado(nombre, tenors, CurvaVectorizada.desdeQL(crv['DISCTIIE']))
+        fechas_iguales &= ajuste_numpy.fechas == ajuste.fechas
+        error_vectorizada = np.abs(ajuste_numpy.ajustar(escenarios[:muestra])
+                                   - ajuste.ajustar(escenarios[:muestra])).max()
+        numpy, quantlib = velocidad(nombre, ajuste, escenarios, crv['DISCTIIE'])
+        print(json.dumps({
+            'curva': nombre,
+            'escenarios': n_escenarios,
+            'fechas_iguales': fechas_iguales,
+            'error_factores': error_factores,
+            'error_tasas': error_tasas,
+            'error_descuento_vectorizado': error_vectorizada,
+            'segundos_preparacion': preparacion,
+            'segundos_escenario_numpy': numpy,
+            'segundos_escenario_quantlib': quantlib,
+            'quantlib': ql.__version__,
+        }), flush=True)
+        if (not fechas_iguales or error_factores > tolerancia_factores or error_tasas > tolerancia_tasas
+                or error_vectorizada > tolerancia_factores):
+            fallidas.append(nombre)
+
+    if fallidas:
+        print(f'El bootstrapping en NumPy no coincide con QuantLib: {fallidas}', file=sys.stderr)
+        sys.exit(1)
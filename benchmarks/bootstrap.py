@@ -0,0 +1,210 @@
+"""
+Mide por separado cada etapa de la construcción de curvas con los insumos del
+19 de febrero de 2025:
+
+- 'helpers': creación de los helpers de cada fábrica de `curvas.py`.
+- 'bootstrap': primera llamada a `nodes()` de cada `gen*`, que es la que corre
+  el bootstrapping (las curvas base ya están ajustadas).
+- 'cadena': `genCurvas` completo más el ajuste de las cuatro curvas.
+- 'escalamiento': bootstrapping con los primeros k tenors de swaps y los
+  primeros k futuros, para ver cómo crece el costo.
+- 'interpolacion': bootstrapping de los mismos helpers de TIIE28 y FTIIE con
+  distintas curvas por tramos de QuantLib.
+- 'arranque': serie de días hábiles con cotizaciones que se mueven al azar,
+  construida con las mismas funciones que `historico.genHistorico`: desde cero
+  (`historico.nodosFecha`, 'frio') y con `arranque_caliente=True`
+  (`historico.nodosFechaCaliente`, 'caliente'). Las repeticiones de ambos modos
+  se alternan para que el ruido de la máquina afecte a los dos por igual.
+  QuantLib no expone el número de iteraciones del solver, así que se compara
+  el tiempo total. La serie no usa futuros FTIIE, pues solo hay fixings de
+  Banxico hasta la fecha del ejemplo.
+
+Cada medición se escribe como una línea JSON con la mediana y el mínimo de
+varias repeticiones, de modo que se puede guardar y comparar entre versiones.
+
+Uso:
+    python benchmarks/bootstrap.py [repeticiones] > bootstrap.jsonl
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+import historico # noqa: E402
+from curvas import insumos_ejemplo as ins # noqa: E402
+from curvas_vivas import clavesInsumos, insumosDeValores # noqa: E402
+
+
+# Curvas por tramos con las que se compara la interpolación de TIIE28 y FTIIE
+interpolaciones = {
+    'NaturalLogCubicDiscount': ql.PiecewiseNaturalLogCubicDiscount,
+    'LogLinearDiscount': ql.PiecewiseLogLinearDiscount,
+    'LogCubicDiscount': ql.PiecewiseLogCubicDiscount,
+    'LinearZero': ql.PiecewiseLinearZero,
+    'CubicZero': ql.PiecewiseCubicZero,
+}
+
+
+def medir(funcion, repeticiones):
+    """
+    Corre `funcion` varias veces y regresa los tiempos y el último resultado.
+
+    `funcion` regresa una función sin argumentos que es la parte que se mide,
+    de modo que la preparación (p. ej. crear los helpers) no cuenta.
+    """
+
+    tiempos = []
+    for _ in range(repeticiones):
+        paso = funcion()
+        t0 = time.perf_counter()
+        resultado = paso()
+        tiempos.append(time.perf_counter() - t0)
+    return tiempos, resultado
+
+
+def registro(etapa, nombre, tiempos, **extra):
+    """ Línea JSON de una medición. """
+
+    print(json.dumps({
+        'etapa': etapa,
+        'nombre': nombre,
+        **extra,
+        'repeticiones': len(tiempos),
+        'segundos_mediana': statistics.median(tiempos),
+        'segundos_minimo': min(tiempos),
+        'quantlib': ql.__version__,
+    }), flush=True)
+
+
+def fabricas(crv):
+    """ Creación de los helpers de cada fábrica, con las curvas base ya ajustadas. """
+
+    return {
+        'futureIMMHelpers': lambda: curvas.futureIMMHelpers(ins['sofr_futures'], ins['tenors_fut_sofr']),
+        'SOFRHelpers': lambda: curvas.SOFRHelpers(ins['sofr_swaps'], ins['tenors_sofr'],
+                                                  ins['depo'], ins['tenor_depo']),
+        'FXAndXCCYHelpers': lambda: curvas.FXAndXCCYHelpers(
+            ins['tasas_fwd_fx'], ins['tenors_fwd_fx'], ins['t_mxn_usd_spot'], ins['tasas_xccy'],
+            ins['tasas_ftiie'], ins['tenors_xccy'], crv['SOFR']),
+        'TIIE28Helpers': lambda: curvas.TIIE28Helpers(ins['tasas_tiie28'], ins['tenors_tiie28'], crv['DISCTIIE']),
+        'FTIIEHelpers': lambda: curvas.FTIIEHelpers(
+            ins['precios_fut'], ins['tenors_futuros'], ins['tasas_ftiie'], ins['tenors_ftiie'],
+            crv['DISCTIIE'], ins['fechas_banxico'], ins['tasas_banxico']),
+    }
+
+
+def generadores(crv, k=None, k_fut=None):
+    """
+    Creación de cada curva con las curvas base ya ajustadas.
+
+    Con `k` se usan solo los primeros k tenors de swaps y con `k_fut` los
+    primeros k futuros.
+    """
+
+    s, f = slice(k), slice(k_fut)
+    return {
+        'genSOFR': lambda: curvas.genSOFR(ins['sofr_futures'][f], ins['tenors_fut_sofr'][f], ins['sofr_swaps'][s],
+                                          ins['tenors_sofr'][s], ins['depo'], ins['tenor_depo']),
+        'genDISCTIIE': lambda: curvas.genDISCTIIE(
+            ins['t_mxn_usd_spot'], ins['tasas_fwd_fx'], ins['tenors_fwd_fx'], ins['tasas_xccy'][s],
+            ins['tenors_xccy'][s], ins['tasas_ftiie'], crv['SOFR']),
+        'genTIIE28': lambda: curvas.genTIIE28(ins['tasas_tiie28'][s], ins['tenors_tiie28'][s], crv['DISCTIIE']),
+        'genFTIIE': lambda: curvas.genFTIIE(ins['tasas_ftiie'][s], ins['tenors_ftiie'][s], crv['DISCTIIE'],
+                                            ins['precios_fut'][f], ins['tenors_futuros'][f],
+                                            ins['fechas_banxico'], ins['tasas_banxico']),
+    }
+
+
+def serieAleatoria(n_fechas, semilla=0):
+    """ Insumos de días hábiles consecutivos a partir del ejemplo, con movimientos de ~2 pb diarios. """
+
+    rng = np.random.default_rng(semilla)
+    base = {k: v for k, v in ins.items() if k not in ('precios_fut', 'tenors_futuros', 'fechas_banxico', 'tasas_banxico')}
+    valores = clavesInsumos(base)
+    serie = []
+    for fecha in pd.bdate_range(curvas.fecha_ejemplo.to_date() + pd.Timedelta(days=12), periods=n_fechas):
+        valores = {c: v + (0.02*rng.standard_normal() if c[0] in ('SOFR', 'XCCY', 'TIIE28', 'FTIIE') else 0)
+                   for c, v in valores.items()}
+        serie.append((fecha.date(), insumosDeValores(base, valores)))
+    return serie
+
+
+# Función de `historico` que construye cada fecha en cada modo de arranque
+modos_arranque = {'frio': historico.nodosFecha, 'caliente': historico.nodosFechaCaliente}
+
+
+def arranque(modo, serie):
+    """ Construye las curvas de toda la serie con un modo de arranque y regresa el número de nodos. """
+
+    historico._estado.clear()
+    return sum(len(modos_arranque[modo](fecha, insumos)) for fecha, insumos in serie)
+
+
+def bootstrap(generador):
+    """ Crea la curva (sin medir) y regresa la función que la ajusta. """
+
+    curva = generador()
+    return lambda: len(curva.nodes())
+
+
+if __name__ == '__main__':
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    crv = curvas.genCurvas(ins)
+    for c in crv.values():
+        c.nodes() # Las curvas base se ajustan antes de medir
+
+    for nombre, fabrica in fabricas(crv).items():
+        tiempos, helpers = medir(lambda: fabrica, repeticiones)
+        registro('helpers', nombre, tiempos, helpers=len(helpers))
+
+    for nombre, generador in generadores(crv).items():
+        tiempos, nodos = medir(lambda: bootstrap(generador), repeticiones)
+        registro('bootstrap', nombre, tiempos, nodos=nodos)
+
+    def cadena():
+        nuevas = curvas.genCurvas(ins)
+        return sum(len(c.nodes()) for c in nuevas.values())
+    tiempos, nodos = medir(lambda: cadena, repeticiones)
+    registro('cadena', 'genCurvas', tiempos, nodos=nodos)
+
+    # Costo del bootstrapping según el número de tenors de swaps
+    for nombre in ('genSOFR', 'genDISCTIIE', 'genTIIE28', 'genFTIIE'):
+        for k in (3, 6, 9, 12, None):
+            tiempos, nodos = medir(lambda: bootstrap(generadores(crv, k=k)[nombre]), repeticiones)
+            registro('escalamiento', nombre, tiempos, tenors=k, futuros=None, nodos=nodos)
+
+    # Costo según el número de futuros (SOFR y FTIIE)
+    for nombre in ('genSOFR', 'genFTIIE'):
+        for k_fut in range(0, len(ins['sofr_futures' if nombre == 'genSOFR' else 'precios_fut']) + 1):
+            tiempos, nodos = medir(lambda: bootstrap(generadores(crv, k_fut=k_fut)[nombre]), repeticiones)
+            registro('escalamiento', nombre, tiempos, tenors=None, futuros=k_fut, nodos=nodos)
+
+    # Mismos helpers con distintas interpolaciones
+    for nombre, fabrica in (('TIIE28', fabricas(crv)['TIIE28Helpers']), ('FTIIE', fabricas(crv)['FTIIEHelpers'])):
+        for interpolacion, clase in interpolaciones.items():
+            def ajuste():
+                curva = clase(0, ql.Mexico(), fabrica(), ql.Actual360())
+                return lambda: len(curva.nodes())
+            tiempos, nodos = medir(ajuste, repeticiones)
+            registro('interpolacion', nombre, tiempos, interpolacion=interpolacion, nodos=nodos)
+
+    # Serie de fechas desde cero y con arranque caliente, alternando los modos
+    serie = serieAleatoria(10)
+    tiempos = {modo: [] for modo in modos_arranque}
+    for _ in range(repeticiones):
+        for modo in modos_arranque:
+            t, nodos = medir(lambda: lambda: arranque(modo, serie), 1)
+            tiempos[modo] += t
+    for modo, t in tiempos.items():
+        registro('arranque', modo, t, fechas=len(serie), nodos=nodos)
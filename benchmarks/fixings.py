@@ -0,0 +1,85 @@
+"""
+Comprueba que la curva FTIIE con futuros se puede construir con los fixings
+cargados desde `fixings.AlmacenFixings`, sin pasar `fechas_banxico`, con los
+insumos del 19 de febrero de 2025.
+
+Se importan los fixings de ejemplo a un almacén temporal, se cargan al índice de
+los futuros (`cargarEnIndice`) y se construye la curva con `genFTIIE` sin
+fixings, como en el docstring de `fixings.py`. Se reportan los fixings del índice
+antes y después de la construcción, la diferencia máxima contra la curva
+construida con `fechas_banxico` y los tiempos de carga y de bootstrapping. Si la
+construcción falla, se pierden fixings o las curvas no coinciden, el script
+termina con código de salida 1.
+
+Uso:
+    python benchmarks/fixings.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+from convenciones import indice # noqa: E402
+from curvas import insumos_ejemplo as ins # noqa: E402
+from fixings import AlmacenFixings # noqa: E402
+
+
+def genFTIIEEjemplo(crv, **fixings):
+    """ Curva FTIIE con futuros de los insumos de ejemplo, ya ajustada. """
+
+    curva = curvas.genFTIIE(ins['tasas_ftiie'], ins['tenors_ftiie'], crv['DISCTIIE'],
+                            ins['precios_fut'], ins['tenors_futuros'], **fixings)
+    curva.nodes()
+    return curva
+
+
+def numeroFixings():
+    return len(indice('FUT_FTIIE').timeSeries().dates())
+
+
+if __name__ == '__main__':
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    crv = curvas.genCurvas(ins)
+    referencia = genFTIIEEjemplo(crv, fechas_banxico=ins['fechas_banxico'],
+                                 tasas_banxico=ins['tasas_banxico']).nodes()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenFixings(os.path.join(directorio, 'fixings_ftiie.bin'))
+        almacen.importar(ins['fechas_banxico'], ins['tasas_banxico'])
+        almacen.limpiarIndice()
+
+        t0 = time.perf_counter()
+        almacen.cargarEnIndice()
+        segundos_carga = time.perf_counter() - t0
+        antes = numeroFixings()
+
+        t0 = time.perf_counter()
+        try:
+            nodos = genFTIIEEjemplo(crv).nodes()
+            error = None
+        except RuntimeError as e:
+            nodos, error = [], str(e)
+        segundos_bootstrap = time.perf_counter() - t0
+        despues = numeroFixings()
+
+    diferencia = (max(abs(a[1] - b[1]) for a, b in zip(referencia, nodos))
+                  if len(nodos) == len(referencia) else None)
+    print(json.dumps({
+        'fixings_antes': antes,
+        'fixings_despues': despues,
+        'error': error,
+        'diferencia_factores': diferencia,
+        'segundos_carga': segundos_carga,
+        'segundos_bootstrap': segundos_bootstrap,
+        'quantlib': ql.__version__,
+    }))
+
+    if error is not None or despues != antes or diferencia is None or diferencia > 1e-12:
+        sys.exit(1)
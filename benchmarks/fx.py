@@ -0,0 +1,67 @@
+"""
+Compara los forwards de tipo de cambio vectorizados de `fx.py` contra un ciclo
+de `ql.Date` sobre las curvas de QuantLib, con las curvas del 19 de febrero de
+2025.
+
+Se reportan la diferencia máxima en los puntos forward de los instrumentos de
+`tasas_fwd_fx` (que las curvas deben reproducir), la diferencia máxima contra
+QuantLib en una malla de días hábiles y la velocidad de ambos caminos. Los
+resultados se escriben como una línea JSON.
+
+Uso:
+    python benchmarks/fx.py [n_fechas]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+from convenciones import convenciones # noqa: E402
+from curvas import insumos_ejemplo as ins # noqa: E402
+from fx import ForwardsFX # noqa: E402
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    crv = curvas.genCurvas(ins)
+    spot = ins['t_mxn_usd_spot']
+
+    t0 = time.perf_counter()
+    fwd = ForwardsFX.desdeCurvas(crv, spot)
+    preparacion = time.perf_counter() - t0
+
+    # Puntos forward de los instrumentos con los que se ajustó la curva
+    conv = convenciones['FX']
+    vencimientos = [conv['calendario'].advance(curvas.fecha_ejemplo, ql.Period(t), conv['ajuste']).to_date()
+                    for t in ins['tenors_fwd_fx']]
+    error_puntos = np.abs(fwd.puntos(np.array(vencimientos, dtype='datetime64[D]')) - ins['tasas_fwd_fx']).max()
+
+    fechas = pd.bdate_range(curvas.fecha_ejemplo.to_date(), periods=n).to_numpy().astype('datetime64[D]')
+    t0 = time.perf_counter()
+    vectorizado = fwd.forward(fechas)
+    segundos_numpy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fechas_ql = [ql.Date.from_date(f.astype(object)) for f in fechas]
+    quantlib = np.array([spot*crv['SOFR'].discount(d)/crv['DISCTIIE'].discount(d) for d in fechas_ql])
+    segundos_quantlib = time.perf_counter() - t0
+
+    print(json.dumps({
+        'fechas': n,
+        'error_puntos_instrumentos': error_puntos,
+        'error_forward': np.abs(vectorizado - quantlib).max(),
+        'segundos_preparacion': preparacion,
+        'segundos_numpy': segundos_numpy,
+        'segundos_quantlib': segundos_quantlib,
+        'quantlib': ql.__version__,
+    }))
@@ -0,0 +1,73 @@
+"""
+Mide el tiempo de importación de los módulos de la librería.
+
+Se usa `python -X importtime` en un proceso nuevo para separar el tiempo propio
+de cada módulo (definir funciones e insumos) del de sus dependencias
+(numpy, pandas, QuantLib). Si algún módulo rebasa su presupuesto el script
+termina con código de salida 1.
+
+Uso:
+    python benchmarks/importacion.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de tiempo propio de importación por módulo (en milisegundos)
+presupuestos = {
+    'curvas': 20,
+    'historico': 10,
+    'curvas_vivas': 10,
+}
+
+
+def tiempoImportacion(modulo, repeticiones=5):
+    """
+    Mide el tiempo propio de importación de un módulo.
+
+    Parameters
+    ----------
+    modulo : str
+        Nombre del módulo a importar.
+    repeticiones : int
+        Número de procesos nuevos en los que se mide; se reporta el mínimo.
+
+    Returns
+    -------
+    dict
+        Tiempo propio y acumulado (con dependencias) en milisegundos.
+    """
+
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+            cwd=raiz, capture_output=True, text=True, check=True).stderr
+
+        # Cada renglón es: "import time: propio | acumulado | modulo"
+        for renglon in salida.splitlines():
+            propio, acumulado, nombre = renglon.split(':', 1)[1].split('|')
+            if nombre.strip() == modulo:
+                tiempos.append((int(propio)/1000, int(acumulado)/1000))
+
+    propio, acumulado = min(tiempos)
+    return {'modulo': modulo, 'propio_ms': propio, 'acumulado_ms': acumulado}
+
+
+if __name__ == '__main__':
+    excedidos = []
+    for modulo, presupuesto in presupuestos.items():
+        resultado = tiempoImportacion(modulo)
+        resultado['presupuesto_ms'] = presupuesto
+        print(json.dumps(resultado))
+        if resultado['propio_ms'] > presupuesto:
+            excedidos.append(modulo)
+
+    if excedidos:
+        print(f'Presupuesto de importación excedido: {excedidos}', file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""
+Compara la velocidad y la precisión de los perfiles de construcción de
+`curvas.py` (`curvas.perfiles`) con los insumos del 19 de febrero de 2025.
+
+Para cada perfil se construye la cadena completa varias veces con la
+instrumentación activa (`instrumentacion.ColectorEventos`) y, por curva, se
+reporta:
+
+- 'segundos_bootstrap': mediana del tiempo de bootstrapping;
+- 'error_repreciacion': error máximo entre la cotización de cada helper y la
+  implícita en la curva (en las unidades del helper);
+- 'diferencia_forward_pb': diferencia máxima contra el perfil oficial de los
+  forwards a 28 días en una malla mensual a 30 años, en puntos base;
+- 'rugosidad_pb' y 'salto_maximo_pb': suavidad de los forwards a un día en una
+  malla diaria a 30 años, como la raíz del promedio de las segundas diferencias
+  al cuadrado y el mayor cambio de un día al siguiente, en puntos base.
+
+Además de los perfiles de `curvas.perfiles` se mide 'cubica_rapida' (la
+interpolación oficial con el solver del perfil de escenarios), para separar el
+efecto de la interpolación del de la precisión del solver. Cada resultado es
+una línea JSON.
+
+Uso:
+    python benchmarks/perfiles.py [repeticiones] > perfiles.jsonl
+"""
+
+import json
+import os
+import statistics
+import sys
+
+import numpy as np
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+from consulta import CurvaVectorizada # noqa: E402
+from curvas import insumos_ejemplo as ins # noqa: E402
+from instrumentacion import ColectorEventos, instrumentar # noqa: E402
+
+
+# Perfiles que se comparan
+perfiles_reporte = {
+    **curvas.perfiles,
+    'cubica_rapida': {k: v for k, v in curvas.perfiles['escenarios'].items() if k != 'interpolacion'},
+}
+
+# Nombre de la curva que construye cada función `gen*`
+curva_por_funcion = {'genSOFR': 'SOFR', 'genDISCTIIE': 'DISCTIIE', 'genTIIE28': 'TIIE28', 'genFTIIE': 'FTIIE'}
+
+anios = 30 # Horizonte de las mallas de forwards
+
+
+def construir(perfil, repeticiones):
+    """ Curvas de un perfil y los eventos de instrumentación de todas las repeticiones. """
+
+    colector = ColectorEventos()
+    with instrumentar(colector):
+        for _ in range(repeticiones):
+            crv = curvas.genCurvas(ins, perfil=perfil)
+    return crv, colector.eventos
+
+
+def forwards28(curva):
+    """ Forwards a 28 días (decimales) en una malla mensual. """
+
+    return CurvaVectorizada.desdeQL(curva).forward28(np.arange(12*anios)*30/360)
+
+
+def suavidad(curva):
+    """ Rugosidad y salto máximo (pb) de los forwards a un día en una malla diaria. """
+
+    fwd = CurvaVectorizada.desdeQL(curva).forwardON(np.arange(360*anios)/360)*10000
+    return np.sqrt(np.mean(np.diff(fwd, 2)**2)), np.abs(np.diff(fwd)).max()
+
+
+if __name__ == '__main__':
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    oficiales, _ = construir('oficial', 1)
+    referencia = {nombre: forwards28(curva) for nombre, curva in oficiales.items()}
+
+    for perfil, configuracion in perfiles_reporte.items():
+        crv, eventos = construir(configuracion, repeticiones)
+        interpolacion = curvas.perfilBootstrap(configuracion)['interpolacion']
+        for funcion, nombre in curva_por_funcion.items():
+            propios = [e for e in eventos if e['funcion'] == funcion]
+            rugosidad, salto = suavidad(crv[nombre])
+            print(json.dumps({
+                'perfil': perfil,
+                'curva': nombre,
+                'interpolacion': interpolacion[nombre],
+                'precision': configuracion.get('precision'),
+                'max_evaluaciones': configuracion.get('max_evaluaciones'),
+                'repeticiones': len(propios),
+                'segundos_bootstrap': statistics.median(e['segundos_bootstrap'] for e in propios),
+                'error_repreciacion': max(e['error_maximo'] for e in propios),
+                'diferencia_forward_pb': float(np.abs(forwards28(crv[nombre]) - referencia[nombre]).max()*10000),
+                'rugosidad_pb': float(rugosidad),
+                'salto_maximo_pb': float(salto),
+                'quantlib': ql.__version__,
+            }), flush=True)
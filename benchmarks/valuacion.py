@@ -0,0 +1,87 @@
+"""
+Compara la valuación vectorizada de `valuacion.py` contra un objeto de QuantLib
+por operación (`swaps.py`) en un libro aleatorio de swaps TIIE28 y FTIIE.
+
+La valuación por objeto se mide en una muestra del libro y se reporta su
+velocidad (operaciones por segundo); la diferencia máxima entre ambas
+valuaciones se mide en esa misma muestra. Los resultados se escriben como
+una línea JSON.
+
+Uso:
+    python benchmarks/valuacion.py [n_operaciones] [n_muestra]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import curvas # noqa: E402
+import swaps # noqa: E402
+from valuacion import valuarLibroVectorizado # noqa: E402
+
+
+def libroAleatorio(n, referencia, semilla=0):
+    """ Libro aleatorio de swaps TIIE28 y FTIIE, la mitad spot y la mitad forward. """
+
+    rng = np.random.default_rng(semilla)
+    inicio = pd.Series(pd.Timestamp(referencia) + pd.to_timedelta(rng.integers(3, 3*365, n), unit='D'))
+    inicio[rng.random(n) < 0.5] = pd.NaT
+    return pd.DataFrame({
+        'id': np.arange(n),
+        'curva': rng.choice(['TIIE28', 'FTIIE'], n),
+        'nocional': rng.integers(1, 100, n)*1e6,
+        'tasa_fija': rng.uniform(7, 10, n),
+        'plazo': rng.choice([3, 6, 13, 26, 39, 52, 65, 91, 130, 195, 260, 390], n),
+        'posicion': rng.choice(['recibe', 'paga'], n),
+        'inicio': inicio.dt.date,
+    })
+
+
+def operacionesQL(tabla):
+    """ Operaciones de un libro columnar en el formato de `swaps.crearLibro`. """
+
+    ops = tabla.to_dict('records')
+    for op in ops:
+        if pd.isna(op['inicio']):
+            op['inicio'] = None
+    return ops
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_muestra = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    ql.Settings.instance().evaluationDate = curvas.fecha_ejemplo
+    crv = curvas.genCurvas(curvas.insumos_ejemplo)
+    for c in crv.values():
+        c.nodes() # Las curvas se ajustan antes de medir
+
+    tabla = libroAleatorio(n, curvas.fecha_ejemplo.to_date())
+
+    t0 = time.perf_counter()
+    vectorizado = valuarLibroVectorizado(tabla, crv)
+    t_vect = time.perf_counter() - t0
+
+    muestra = tabla.iloc[:n_muestra]
+    t0 = time.perf_counter()
+    valores_ql = swaps.valuarLibro(swaps.crearLibro(operacionesQL(muestra), crv))
+    t_ql = time.perf_counter() - t0
+
+    diferencia = np.abs(vectorizado['Valor Presente'].to_numpy()[:n_muestra] - valores_ql)
+    print(json.dumps({
+        'operaciones': n,
+        'segundos_vectorizado': t_vect,
+        'operaciones_por_segundo_vectorizado': n/t_vect,
+        'muestra_quantlib': n_muestra,
+        'operaciones_por_segundo_quantlib': n_muestra/t_ql,
+        'aceleracion': (n/t_vect)/(n_muestra/t_ql),
+        'diferencia_maxima_mxn': float(diferencia.max()),
+        'diferencia_maxima_por_nocional': float((diferencia/muestra['nocional'].to_numpy()).max()),
+    }))
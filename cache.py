@@ -0,0 +1,239 @@
+"""
+Caché de curvas ajustadas en dos niveles: memoria (LRU) y disco.
+
+Los procesos de valuación y de reportes piden una y otra vez las mismas curvas
+de cierre; `CacheCurvas` evita volver a correr el bootstrapping de la cadena
+SOFR -> Descuento MXN -> TIIE28/FTIIE cuando ya se construyó una curva con los
+mismos insumos.
+
+La llave de cada curva es un hash de:
+
+- la versión del formato (`version`) y el nombre de la curva;
+- la fecha de evaluación;
+- todas las listas de insumos de su función `gen*`;
+- la llave de su curva base (SOFR para Descuento MXN, Descuento MXN para TIIE28
+  y FTIIE), de modo que un cambio en una cotización SOFR cambia la llave de
+  las cuatro curvas;
+- para FTIIE con futuros, los fixings de Banxico (los de los insumos o los que
+  estén cargados en el índice hasta la fecha de evaluación).
+
+Nivel 1: un `OrderedDict` con las últimas `max_memoria` curvas usadas. Nivel 2
+(opcional): un directorio con un archivo `.npz` por llave con los nodos de la
+curva (ver `persistencia.guardarCurvas`). Las curvas que regresa la caché son
+curvas de nodos fijas en su fecha (`persistencia.congelarCurvas`), con los
+mismos nodos e interpolación que las de `curvas.py`.
+
+>>> cache = CacheCurvas('cache_curvas', max_memoria=128)
+>>> curvas = cache.genCurvas(insumos, fecha)        # bootstrapping solo la primera vez
+>>> cache.estadisticas
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from convenciones import fechaEvaluacion, indice
+from curvas import genDISCTIIE, genFTIIE, genSOFR, genTIIE28
+from persistencia import cargarCurvas, congelarCurvas, guardarCurvas
+
+
+version = 1
+
+# Curva base de cada curva
+bases = {'SOFR': None, 'DISCTIIE': 'SOFR', 'TIIE28': 'DISCTIIE', 'FTIIE': 'DISCTIIE'}
+
+
+def _argumentos(nombre, insumos):
+    """ Insumos de la función `gen*` de una curva, sin la curva base. """
+
+    if nombre == 'SOFR':
+        return [insumos['sofr_futures'], insumos['tenors_fut_sofr'], insumos['sofr_swaps'],
+                insumos['tenors_sofr'], insumos['depo'], insumos['tenor_depo']]
+    if nombre == 'DISCTIIE':
+        return [insumos['t_mxn_usd_spot'], insumos['tasas_fwd_fx'], insumos['tenors_fwd_fx'],
+                insumos['tasas_xccy'], insumos['tenors_xccy'], insumos['tasas_ftiie']]
+    if nombre == 'TIIE28':
+        return [insumos['tasas_tiie28'], insumos['tenors_tiie28']]
+    if nombre == 'FTIIE':
+        return [insumos['tasas_ftiie'], insumos['tenors_ftiie'],
+                insumos.get('precios_fut', []), insumos.get('tenors_futuros', []),
+                insumos.get('fechas_banxico'), insumos.get('tasas_banxico')]
+    raise KeyError(f'Curva desconocida: {nombre}')
+
+
+def _generar(nombre, argumentos, curva_base):
+    """ Corre la función `gen*` de una curva. """
+
+    if nombre == 'SOFR':
+        return genSOFR(*argumentos)
+    if nombre == 'DISCTIIE':
+        return genDISCTIIE(*argumentos, curva_base)
+    if nombre == 'TIIE28':
+        return genTIIE28(*argumentos, curva_base)
+    tasas_ftiie, tenors_ftiie, *futuros = argumentos
+    return genFTIIE(tasas_ftiie, tenors_ftiie, curva_base, *futuros)
+
+
+def _fixingsIndice(fecha):
+    """ Fixings del índice de futuros FTIIE hasta `fecha`, para la llave. """
+
+    serie = indice('FUT_FTIIE').timeSeries()
+    return [(d.serialNumber(), v) for d, v in zip(serie.dates(), serie.values()) if d <= fecha]
+
+
+def llaveCurva(nombre, fecha, argumentos, llave_base=None):
+    """
+    Llave de caché de una curva.
+
+    Parameters
+    ----------
+    nombre : str
+        'SOFR', 'DISCTIIE', 'TIIE28' o 'FTIIE'.
+    fecha : ql.Date
+        Fecha de evaluación.
+    argumentos : list
+        Insumos de su función `gen*` (sin la curva base).
+    llave_base : str, optional
+        Llave de la curva base.
+
+    Returns
+    -------
+    str
+        Hash hexadecimal.
+    """
+
+    contenido = [version, nombre, fecha.serialNumber(), argumentos, llave_base]
+    if nombre == 'FTIIE' and argumentos[2] and argumentos[4] is None:
+        contenido.append(_fixingsIndice(fecha)) # Futuros con los fixings cargados en el índice
+    texto = json.dumps(contenido, default=str, separators=(',', ':'))
+    return hashlib.sha256(texto.encode()).hexdigest()[:32]
+
+
+class CacheCurvas:
+    """
+    Caché de curvas en memoria (LRU) y, opcionalmente, en disco.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Directorio del nivel en disco. Sin directorio solo se usa la memoria.
+    max_memoria : int
+        Número máximo de curvas en memoria.
+    """
+
+    def __init__(self, directorio=None, max_memoria=64):
+        self.directorio = directorio
+        self.max_memoria = max_memoria
+        self._memoria = OrderedDict() # {llave: curva}
+        self._candado = threading.Lock()
+        self.estadisticas = {'memoria': 0, 'disco': 0, 'construidas': 0}
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memoria)
+
+    def _ruta(self, llave):
+        return os.path.join(self.directorio, f'{llave}.npz')
+
+    def _recordar(self, llave, curva):
+        """ Guarda una curva en memoria y saca la menos usada si se rebasa el límite. """
+
+        with self._candado:
+            self._memoria[llave] = curva
+            self._memoria.move_to_end(llave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def obtener(self, llave):
+        """ Curva guardada con `llave` (memoria y después disco), o None. """
+
+        with self._candado:
+            curva = self._memoria.get(llave)
+            if curva is not None:
+                self._memoria.move_to_end(llave)
+                self.estadisticas['memoria'] += 1
+                return curva
+
+        if self.directorio is not None and os.path.exists(self._ruta(llave)):
+            curvas, _ = cargarCurvas(self._ruta(llave))
+            (curva,) = curvas.values()
+            self.estadisticas['disco'] += 1
+            self._recordar(llave, curva)
+            return curva
+        return None
+
+    def guardar(self, llave, nombre, curva):
+        """ Guarda una curva (ya congelada) en memoria y en disco. """
+
+        self._recordar(llave, curva)
+        if self.directorio is None:
+            return
+        # Se escribe a un temporal y se renombra, para no dejar archivos a medias
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        os.close(descriptor)
+        try:
+            guardarCurvas(temporal, {nombre: curva})
+            os.replace(temporal, self._ruta(llave))
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def genCurvas(self, insumos, fecha=None, nombres=None):
+        """
+        Curvas de una fecha, construyendo solo las que no están en la caché.
+
+        Parameters
+        ----------
+        insumos : dict
+            Insumos de mercado (ver `curvas.genCurvas`).
+        fecha : date or ql.Date, optional
+            Fecha de evaluación. Por defecto la fecha de evaluación actual.
+        nombres : list, optional
+            Curvas que se piden. Por defecto las cuatro. Las curvas base solo se
+            construyen (o cargan) si hace falta construir alguna de las pedidas.
+
+        Returns
+        -------
+        dict
+            {nombre: curva de nodos fija en `fecha`}.
+        """
+
+        nombres = list(bases) if nombres is None else list(nombres)
+        with fechaEvaluacion(fecha) as fecha_ql:
+            argumentos = {n: _argumentos(n, insumos) for n in bases}
+            llaves = {}
+            for nombre in bases: # En orden de construcción: la base va antes
+                base = bases[nombre]
+                llaves[nombre] = llaveCurva(nombre, fecha_ql, argumentos[nombre],
+                                            None if base is None else llaves[base])
+
+            resultado = {}
+
+            def curva(nombre):
+                if nombre in resultado:
+                    return resultado[nombre]
+                encontrada = self.obtener(llaves[nombre])
+                if encontrada is None:
+                    base = bases[nombre]
+                    ajustada = _generar(nombre, argumentos[nombre], None if base is None else curva(base))
+                    encontrada = congelarCurvas({nombre: ajustada})[nombre]
+                    self.estadisticas['construidas'] += 1
+                    self.guardar(llaves[nombre], nombre, encontrada)
+                resultado[nombre] = encontrada
+                return encontrada
+
+            return {nombre: curva(nombre) for nombre in nombres}
+
+    def limpiar(self, disco=False):
+        """ Vacía la memoria y, si `disco` es True, borra los archivos del directorio. """
+
+        with self._candado:
+            self._memoria.clear()
+        if disco and self.directorio is not None:
+            for archivo in os.listdir(self.directorio):
+                if archivo.endswith('.npz'):
+                    os.remove(os.path.join(self.directorio, archivo))
@@ -0,0 +1,123 @@
+"""
+Calendarios de pagos compartidos y tablas de días inhábiles para NumPy.
+
+- `calendarioPagos` regresa el `ql.Schedule` de un swap a partir de su fecha de
+  inicio, plazo, frecuencia y calendario. Los calendarios se guardan, de modo
+  que los swaps del mismo plazo que empiezan el mismo día (p. ej. todos los
+  spot de un libro) comparten un solo objeto.
+- `feriados` y `calendarioNumpy` traducen los calendarios de QuantLib (México y
+  Reserva Federal de EUA) a arreglos `datetime64` y `np.busdaycalendar`, para
+  generar con `np.busday_offset` las fechas de libros completos.
+
+Los helpers de `curvas.py` arman sus calendarios dentro de QuantLib, que no
+permite pasarles uno ya construido; este módulo lo usan los swaps de
+`swaps.py` y la valuación vectorizada de `valuacion.py`.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+
+# Calendarios por nombre de QuantLib; los que no están se agregan al usarlos
+_calendarios = {c.name(): c for c in (ql.Mexico(), ql.UnitedStates(5))}
+
+
+def _registrar(calendario):
+    """ Nombre con el que se guarda un calendario (se aceptan el objeto o su nombre). """
+
+    if isinstance(calendario, str):
+        if calendario not in _calendarios:
+            raise KeyError(f'Calendario desconocido: {calendario}')
+        return calendario
+    _calendarios.setdefault(calendario.name(), calendario)
+    return calendario.name()
+
+
+@functools.lru_cache(maxsize=100_000)
+def _calendarioPagos(inicio, longitud, unidad, frecuencia, calendario, ajuste, regla):
+    return ql.Schedule(
+        ql.Date(inicio), # Fecha de inicio
+        ql.Date(inicio) + ql.Period(longitud, unidad), # Fecha de término
+        ql.Period(frecuencia), # Frecuencia de los cupones
+        _calendarios[calendario],
+        ajuste, # Ajuste de fechas
+        ajuste, # Ajuste de la fecha de término
+        regla, # Generación de fechas
+        False) # No obliga a terminar al final de mes
+
+
+def calendarioPagos(inicio, tenor, frecuencia=ql.EveryFourthWeek, calendario=ql.Mexico(),
+                    ajuste=ql.Following, regla=ql.DateGeneration.Backward):
+    """
+    Calendario de pagos de un swap, guardado para reutilizarse.
+
+    Parameters
+    ----------
+    inicio : ql.Date
+        Fecha de inicio.
+    tenor : ql.Period
+        Plazo del swap (p. ej. `ql.Period(130*4, ql.Weeks)`).
+    frecuencia : int
+        Frecuencia de QuantLib (p. ej. `ql.EveryFourthWeek` o `ql.Annual`).
+    calendario : ql.Calendar or str
+        Calendario o su nombre.
+    ajuste : int
+        Convención de ajuste de días hábiles.
+    regla : int
+        Regla de generación de fechas (`ql.DateGeneration`).
+
+    Returns
+    -------
+    ql.Schedule
+        Calendario compartido; no se debe modificar.
+    """
+
+    return _calendarioPagos(inicio.serialNumber(), tenor.length(), tenor.units(), frecuencia,
+                            _registrar(calendario), ajuste, regla)
+
+
+@functools.lru_cache(maxsize=64)
+def _feriadosAnios(calendario, desde, hasta):
+    inicio, fin = ql.Date(1, 1, desde), ql.Date(31, 12, hasta)
+    return np.array([d.ISO() for d in _calendarios[calendario].holidayList(inicio, fin)],
+                    dtype='datetime64[D]')
+
+
+def feriados(calendario, desde, hasta):
+    """
+    Días inhábiles (sin fines de semana) de un calendario entre dos fechas.
+
+    La tabla se calcula por años completos y se guarda.
+
+    Parameters
+    ----------
+    calendario : ql.Calendar or str
+        Calendario o su nombre.
+    desde, hasta : date
+        Rango de fechas (ambas incluidas).
+
+    Returns
+    -------
+    np.ndarray
+        Fechas `datetime64[D]` ordenadas.
+    """
+
+    desde, hasta = pd.Timestamp(desde), pd.Timestamp(hasta)
+    tabla = _feriadosAnios(_registrar(calendario), desde.year, hasta.year)
+    return tabla[(tabla >= np.datetime64(desde.date())) & (tabla <= np.datetime64(hasta.date()))]
+
+
+def calendarioNumpy(calendario, desde, hasta):
+    """
+    `np.busdaycalendar` equivalente a un calendario de QuantLib entre dos fechas.
+
+    Sirve para `np.busday_offset` y `np.is_busday` sobre arreglos de fechas:
+
+    >>> cal = calendarioNumpy(ql.Mexico(), '2025-01-01', '2060-12-31')
+    >>> np.busday_offset(fechas, 0, roll='forward', busdaycal=cal)   # Following
+    """
+
+    return np.busdaycalendar(weekmask='1111100', holidays=feriados(calendario, desde, hasta))
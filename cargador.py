@@ -0,0 +1,351 @@
+"""
+Lectura por bloques de cotizaciones históricas en formato largo (CSV o Parquet).
+
+Cada renglón del archivo es una cotización:
+
+    fecha,curva,tipo,tenor,valor
+    2025-02-19,SOFR,FUTURO,H5,95.6825
+    2025-02-19,SOFR,DEPOSITO,1,4.33
+    2025-02-19,SOFR,SWAP,2,4.147
+    2025-02-19,DISCTIIE,FX,SPOT,20.44245
+    2025-02-19,DISCTIIE,FX,1W,216
+    2025-02-19,DISCTIIE,XCCY,26,0.0115
+    2025-02-19,TIIE28,SWAP,1,9.7638
+    2025-02-19,FTIIE,FUTURO,Feb2025,90.345
+    2025-02-19,FTIIE,SWAP,3,9.27
+
+Los valores van en las mismas unidades que los insumos de `curvas.py` (ver
+`tipos_archivo`). El archivo debe estar ordenado por fecha; dentro de una fecha
+el orden de los renglones no importa.
+
+`leerCSV` y `leerParquet` leen el archivo por bloques (`pd.read_csv` con
+`chunksize` y `pyarrow`, que es opcional) y regresan un generador de
+(fecha, insumos) en el formato de `curvas.genCurvas`. Solo se guarda en memoria
+la fecha que se está armando, así que años de historia pasan por el
+bootstrapping sin cargarse completos (ver `historicoPorLotes`).
+
+Cada fecha se valida contra una referencia de tenors por grupo: la de
+`plantilla` (p. ej. `insumos_ejemplo`) o, si no se da, la de la primera fecha.
+Los tenors de cada grupo se ordenan por vencimiento. Los grupos de tenor fijo
+(swaps, XCCY, FX, depósito) deben tener exactamente los mismos tenors que la
+referencia, en su orden; los futuros cambian de vencimiento, así que solo se
+revisa que haya el mismo número. Como los helpers de XCCY toman la tasa FTIIE
+de la misma posición, debe haber al menos tantas tasas FTIIE como tenors de
+XCCY.
+
+Los insumos no traen fixings de Banxico: los futuros FTIIE usan los que estén
+cargados en el índice (ver `fixings.AlmacenFixings` y el argumento
+`ruta_fixings` de `historico.genHistorico`).
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from curvas_vivas import clavesInsumos, grupos
+from historico import genHistorico
+
+
+columnas_archivo = ['fecha', 'curva', 'tipo', 'tenor', 'valor']
+
+# (curva, tipo) del archivo -> grupo de cotizaciones (ver `curvas_vivas.grupos`)
+tipos_archivo = {
+    ('SOFR', 'FUTURO'): 'SOFR_FUT', # Precio del futuro
+    ('SOFR', 'DEPOSITO'): 'SOFR_DEPO', # Tasa en %
+    ('SOFR', 'SWAP'): 'SOFR', # Tasa en %
+    ('DISCTIIE', 'FX'): 'FX', # Tenor 'SPOT': tipo de cambio; los demás, puntos forward
+    ('DISCTIIE', 'XCCY'): 'XCCY', # Basis en %
+    ('TIIE28', 'SWAP'): 'TIIE28', # Tasa en % (el primer tenor es el depósito)
+    ('FTIIE', 'FUTURO'): 'FTIIE_FUT', # Precio del futuro
+    ('FTIIE', 'SWAP'): 'FTIIE', # Tasa en %
+}
+
+# Grupos cuyos tenors son vencimientos que cambian con el tiempo
+grupos_futuros = ('SOFR_FUT', 'FTIIE_FUT')
+
+# Grupos sin los que no se pueden construir las curvas
+grupos_obligatorios = ('SOFR_DEPO', 'SOFR', 'FX', 'XCCY', 'TIIE28', 'FTIIE')
+
+
+def _tenor(valor):
+    """ Tenor del archivo: entero si es un número de periodos, texto si no (p. ej. '1W', 'H5', 'SPOT'). """
+
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+        return int(valor)
+    texto = str(valor).strip()
+    return int(texto) if texto.isdigit() else texto
+
+
+def _vencimiento(grupo, tenor):
+    """ Llave para ordenar los tenors de un grupo del más corto al más largo. """
+
+    if isinstance(tenor, int):
+        return tenor
+    if grupo == 'SOFR_FUT': # Código IMM, p. ej. 'H5'
+        return 12*int(tenor[1:]) + 'FGHJKMNQUVXZ'.index(tenor[0].upper())
+    if grupo == 'FTIIE_FUT': # Mes del futuro, p. ej. 'Feb2025'
+        return pd.to_datetime(tenor, format='%b%Y').toordinal()
+    periodo = ql.Period(tenor) # Tenors como '1D', '1W' o '3M'
+    return periodo.length()*{ql.Days: 1, ql.Weeks: 7, ql.Months: 30, ql.Years: 365}[periodo.units()]
+
+
+def tenorsPorGrupo(insumos):
+    """ {grupo: [tenors]} de unos insumos; el spot de FX no cuenta como tenor. """
+
+    tenors = {}
+    for grupo, tenor in clavesInsumos(insumos):
+        if (grupo, tenor) != ('FX', 'SPOT'):
+            tenors.setdefault(grupo, []).append(tenor)
+    return tenors
+
+
+def _normalizar(bloque):
+    """ Columnas del archivo con tipos uniformes y el grupo de cada cotización. """
+
+    faltantes = [c for c in columnas_archivo if c not in bloque.columns]
+    if faltantes:
+        raise ValueError(f'Faltan columnas en el archivo: {faltantes}')
+
+    bloque = bloque[columnas_archivo].copy()
+    bloque['fecha'] = pd.to_datetime(bloque['fecha']).dt.date
+    claves = list(zip(bloque['curva'].str.upper(), bloque['tipo'].str.upper()))
+    desconocidos = sorted(set(claves) - set(tipos_archivo))
+    if desconocidos:
+        raise ValueError(f'Tipos de instrumento desconocidos: {desconocidos}')
+    bloque['grupo'] = [tipos_archivo[c] for c in claves]
+    bloque['tenor'] = [_tenor(t) for t in bloque['tenor']]
+    bloque['valor'] = bloque['valor'].astype(float)
+    return bloque
+
+
+def _armarInsumos(fecha, filas, referencia):
+    """ Insumos de una fecha a partir de sus renglones; valida los tenors contra la referencia. """
+
+    cotizaciones = {}
+    for grupo, tenor, valor in zip(filas['grupo'], filas['tenor'], filas['valor']):
+        cotizaciones.setdefault(grupo, {})
+        if tenor in cotizaciones[grupo]:
+            raise ValueError(f'{fecha}: cotización repetida ({grupo}, {tenor})')
+        cotizaciones[grupo][tenor] = valor
+
+    faltantes = [g for g in grupos_obligatorios if g not in cotizaciones]
+    if faltantes:
+        raise ValueError(f'{fecha}: faltan los grupos {faltantes}')
+    spot = cotizaciones['FX'].pop('SPOT', None)
+    if spot is None:
+        raise ValueError(f'{fecha}: falta el tipo de cambio spot (DISCTIIE, FX, SPOT)')
+    if len(cotizaciones['SOFR_DEPO']) != 1:
+        raise ValueError(f'{fecha}: debe haber un solo depósito SOFR')
+
+    # Cada grupo se ordena por vencimiento (los helpers de futuros y XCCY dependen de la posición)
+    for grupo, valores in cotizaciones.items():
+        try:
+            orden = sorted(valores, key=lambda t: _vencimiento(grupo, t))
+        except (ValueError, RuntimeError) as error:
+            raise ValueError(f'{fecha}: tenor inválido en {grupo}: {error}') from error
+        cotizaciones[grupo] = {t: valores[t] for t in orden}
+
+    # Alineación de tenors por grupo contra la referencia
+    for grupo in set(cotizaciones) | set(referencia or {}):
+        if referencia is None:
+            break
+        tenors, esperados = list(cotizaciones.get(grupo, {})), referencia.get(grupo, [])
+        if grupo in grupos_futuros:
+            if len(tenors) != len(esperados):
+                raise ValueError(f'{fecha}: {grupo} tiene {len(tenors)} futuros y se esperaban {len(esperados)}')
+        elif sorted(map(str, tenors)) != sorted(map(str, esperados)):
+            raise ValueError(f'{fecha}: los tenors de {grupo} no coinciden con la referencia '
+                             f'({tenors} contra {esperados})')
+        else:
+            cotizaciones[grupo] = {t: cotizaciones[grupo][t] for t in esperados}
+
+    if len(cotizaciones['FTIIE']) < len(cotizaciones['XCCY']):
+        raise ValueError(f'{fecha}: hay menos tasas FTIIE que tenors de XCCY')
+
+    insumos = {}
+    for grupo, (llave_tasas, llave_tenors, _) in grupos.items():
+        valores = cotizaciones.get(grupo, {})
+        if grupo == 'SOFR_DEPO':
+            (insumos[llave_tenors], insumos[llave_tasas]), = valores.items()
+        else:
+            insumos[llave_tenors], insumos[llave_tasas] = list(valores), list(valores.values())
+    insumos['t_mxn_usd_spot'] = spot
+    return insumos
+
+
+def insumosPorFecha(bloques, plantilla=None, al_fallar='error'):
+    """
+    Convierte bloques de renglones en formato largo en insumos por fecha.
+
+    Parameters
+    ----------
+    bloques : iterable
+        DataFrames con las columnas de `columnas_archivo`, ordenados por fecha
+        (una fecha puede quedar repartida entre dos bloques).
+    plantilla : dict, optional
+        Insumos con los tenors de referencia (p. ej. `curvas.insumos_ejemplo`).
+        Por defecto la referencia es la primera fecha válida.
+    al_fallar : str
+        'error' detiene la lectura en la primera fecha inválida; 'omitir' la
+        salta con una advertencia.
+
+    Yields
+    ------
+    tuple
+        (fecha, insumos) en el formato de `curvas.genCurvas`.
+    """
+
+    if al_fallar not in ('error', 'omitir'):
+        raise ValueError(f"al_fallar debe ser 'error' u 'omitir', no {al_fallar!r}")
+
+    referencia = None if plantilla is None else tenorsPorGrupo(plantilla)
+    fecha_actual, partes = None, []
+
+    def armar():
+        nonlocal referencia
+        try:
+            insumos = _armarInsumos(fecha_actual, pd.concat(partes), referencia)
+        except ValueError as error:
+            if al_fallar == 'error':
+                raise
+            warnings.warn(f'Se omite la fecha {fecha_actual}: {error}')
+            return None
+        if referencia is None:
+            referencia = tenorsPorGrupo(insumos)
+        return insumos
+
+    for bloque in bloques:
+        bloque = _normalizar(bloque)
+        if bloque.empty:
+            continue
+        for fecha, filas in bloque.groupby('fecha', sort=False):
+            if fecha_actual is not None and fecha != fecha_actual:
+                if fecha < fecha_actual:
+                    raise ValueError(f'El archivo no está ordenado por fecha: {fecha} después de {fecha_actual}')
+                insumos = armar()
+                if insumos is not None:
+                    yield fecha_actual, insumos
+                partes = []
+            fecha_actual = fecha
+            partes.append(filas)
+
+    if partes:
+        insumos = armar()
+        if insumos is not None:
+            yield fecha_actual, insumos
+
+
+def leerCSV(ruta, tam_bloque=100_000, plantilla=None, al_fallar='error', **opciones):
+    """
+    Insumos por fecha de un CSV en formato largo, leído por bloques.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo CSV con las columnas de `columnas_archivo`.
+    tam_bloque : int
+        Renglones por bloque (`chunksize` de `pd.read_csv`).
+    plantilla, al_fallar
+        Ver `insumosPorFecha`.
+    **opciones
+        Se pasan a `pd.read_csv` (p. ej. `sep` o `compression`).
+
+    Yields
+    ------
+    tuple
+        (fecha, insumos).
+    """
+
+    tipos = {'curva': str, 'tipo': str, 'tenor': str, 'valor': float}
+    opciones.setdefault('float_precision', 'round_trip') # Mismos valores que se escribieron
+    with pd.read_csv(ruta, chunksize=tam_bloque, dtype=tipos, **opciones) as lector:
+        yield from insumosPorFecha(lector, plantilla, al_fallar)
+
+
+def leerParquet(ruta, tam_bloque=100_000, plantilla=None, al_fallar='error'):
+    """
+    Insumos por fecha de un archivo Parquet en formato largo, leído por bloques.
+
+    Requiere `pyarrow`, que no es dependencia obligatoria.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo Parquet con las columnas de `columnas_archivo`.
+    tam_bloque : int
+        Renglones por bloque.
+    plantilla, al_fallar
+        Ver `insumosPorFecha`.
+
+    Yields
+    ------
+    tuple
+        (fecha, insumos).
+    """
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError('Para leer archivos Parquet se necesita pyarrow (pip install pyarrow)') from error
+
+    archivo = pq.ParquetFile(ruta)
+    bloques = (lote.to_pandas() for lote in archivo.iter_batches(batch_size=tam_bloque, columns=columnas_archivo))
+    yield from insumosPorFecha(bloques, plantilla, al_fallar)
+
+
+def formatoLargo(insumos_por_fecha):
+    """
+    Cotizaciones de varias fechas en formato largo (el inverso de `insumosPorFecha`).
+
+    Parameters
+    ----------
+    insumos_por_fecha : dict
+        {fecha: insumos} en el formato de `curvas.genCurvas`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas de `columnas_archivo`, ordenadas por fecha.
+    """
+
+    archivo_por_grupo = {grupo: clave for clave, grupo in tipos_archivo.items()}
+    renglones = []
+    for fecha in sorted(insumos_por_fecha, key=lambda f: pd.Timestamp(f)):
+        for (grupo, tenor), valor in clavesInsumos(insumos_por_fecha[fecha]).items():
+            curva, tipo = archivo_por_grupo[grupo]
+            renglones.append((pd.Timestamp(fecha).date(), curva, tipo, tenor, valor))
+    return pd.DataFrame(renglones, columns=columnas_archivo)
+
+
+def historicoPorLotes(insumos, tam_lote=250, **opciones):
+    """
+    Construye las curvas de un flujo de insumos por lotes de fechas.
+
+    Parameters
+    ----------
+    insumos : iterable
+        (fecha, insumos), p. ej. el generador de `leerCSV`.
+    tam_lote : int
+        Fechas que se juntan para cada llamada a `historico.genHistorico`.
+    **opciones
+        Se pasan a `historico.genHistorico` (p. ej. `n_procesos`,
+        `omitir_errores`, `ruta_fixings` o `arranque_caliente`).
+
+    Yields
+    ------
+    pd.DataFrame
+        Nodos de las curvas de cada lote (ver `historico.genHistorico`).
+    """
+
+    lote = {}
+    for fecha, insumos_fecha in insumos:
+        lote[fecha] = insumos_fecha
+        if len(lote) == tam_lote:
+            yield genHistorico(lote, **opciones)
+            lote = {}
+    if lote:
+        yield genHistorico(lote, **opciones)
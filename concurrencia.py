@@ -0,0 +1,101 @@
+"""
+Construcción de curvas de distintas fechas desde varios hilos de un mismo proceso.
+
+QuantLib tiene una sola fecha de evaluación por proceso y las curvas de
+`curvas.py` (días de liquidación 0) se mueven con ella, así que dos hilos no
+pueden construir fechas distintas a la vez. Aquí cada construcción se hace
+dentro de `convenciones.fechaEvaluacion`, que fija la fecha y la protege con un
+candado, y al terminar las curvas se congelan sobre sus nodos
+(`persistencia.congelarCurvas`): quedan fijas en su fecha de referencia y ya no
+dependen de la fecha global, de modo que el hilo que las pidió las puede usar
+mientras otros construyen otras fechas.
+
+El trabajo de QuantLib de distintas fechas se hace uno a la vez (el candado y
+el GIL lo serializan); lo que se gana es que un mismo servicio atienda
+peticiones concurrentes de distintas fechas sin crear procesos. Para repartir
+muchas fechas entre núcleos sigue siendo mejor `historico.genHistorico`.
+
+>>> curvas = genCurvasFijas('2025-02-19', insumos)          # desde cualquier hilo
+>>> por_fecha = genCurvasHilos({fecha: insumos, ...}, n_hilos=4)
+"""
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from convenciones import fechaEvaluacion
+from curvas import genCurvas
+from persistencia import congelarCurvas
+
+
+def genCurvasFijas(fecha, insumos, curvas_previas=None):
+    """
+    Construye las cuatro curvas de una fecha y las fija en esa fecha.
+
+    Se puede llamar desde varios hilos a la vez: cada llamada toma el candado
+    de la fecha de evaluación mientras construye y ajusta las curvas.
+
+    Parameters
+    ----------
+    fecha : date or ql.Date
+        Fecha de evaluación.
+    insumos : dict
+        Insumos de mercado de la fecha (ver `curvas.genCurvas`).
+    curvas_previas : dict, optional
+        Curvas o factores de una fecha cercana que acotan el bootstrapping.
+
+    Returns
+    -------
+    dict
+        Curvas de nodos con llaves 'SOFR', 'DISCTIIE', 'TIIE28' y 'FTIIE', con
+        fecha de referencia `fecha`.
+    """
+
+    with fechaEvaluacion(fecha):
+        return congelarCurvas(genCurvas(insumos, curvas_previas=curvas_previas))
+
+
+def genCurvasHilos(insumos_por_fecha, fechas=None, n_hilos=None, omitir_errores=False):
+    """
+    Construye las curvas de varias fechas con un pool de hilos.
+
+    Cada hilo toma el candado de la fecha de evaluación (`genCurvasFijas`), así que
+    las fechas se construyen una a la vez; no es más rápido que un ciclo.
+
+    Parameters
+    ----------
+    insumos_por_fecha : dict
+        Insumos de mercado por fecha: {fecha: insumos}.
+    fechas : iterable, optional
+        Fechas a construir. Por defecto todas las de `insumos_por_fecha`.
+    n_hilos : int, optional
+        Número de hilos (ver `concurrent.futures.ThreadPoolExecutor`).
+    omitir_errores : bool
+        Si es True, las fechas cuyo bootstrapping falla se omiten con una
+        advertencia en lugar de detener el lote.
+
+    Returns
+    -------
+    dict
+        {fecha: curvas fijas} (ver `genCurvasFijas`).
+    """
+
+    insumos_por_fecha = {pd.Timestamp(f).date(): ins for f, ins in insumos_por_fecha.items()}
+    fechas = sorted(insumos_por_fecha) if fechas is None else [pd.Timestamp(f).date() for f in fechas]
+    faltantes = [f for f in fechas if f not in insumos_por_fecha]
+    if faltantes:
+        raise KeyError(f'No hay insumos para las fechas: {faltantes}')
+
+    with ThreadPoolExecutor(max_workers=n_hilos) as pool:
+        futuros = {f: pool.submit(genCurvasFijas, f, insumos_por_fecha[f]) for f in fechas}
+
+    resultado = {}
+    for fecha, futuro in futuros.items():
+        try:
+            resultado[fecha] = futuro.result()
+        except RuntimeError as error: # Errores de QuantLib (p. ej. el bootstrapping no converge)
+            if not omitir_errores:
+                raise
+            warnings.warn(f'Se omite la fecha {fecha}: {error}')
+    return resultado
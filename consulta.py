@@ -0,0 +1,246 @@
+"""
+Consultas vectorizadas sobre las curvas: factores de descuento, tasas cero y
+tasas forward para arreglos de fechas en una sola llamada.
+
+`CurvaVectorizada` toma los nodos de una curva ya ajustada y reproduce en NumPy
+la interpolación de QuantLib:
+
+- 'loglineal': lineal sobre el logaritmo del factor de descuento
+  (`PiecewiseLogLinearDiscount`, curva SOFR).
+- 'cubica': spline cúbico natural sobre el logaritmo del factor de descuento
+  (`PiecewiseNaturalLogCubicDiscount`, curvas Descuento MXN, TIIE28 y FTIIE).
+
+Después del último nodo se extrapola con forward instantáneo constante, igual
+que QuantLib. Todas las curvas usan conteo Actual/360.
+
+Las fechas se pueden dar como `np.datetime64`, `pd.DatetimeIndex` o lista de
+fechas; los números se interpretan como plazos en años (Actual/360) desde la
+fecha de referencia de la curva.
+
+`descuentoLote` evalúa a la vez muchas curvas con el mismo número de nodos
+(p. ej. la misma curva en cientos de fechas de un histórico), sin recorrerlas
+una por una.
+"""
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+
+def _splineNatural(x, y):
+    """ Segundas derivadas del spline cúbico natural que pasa por (x, y). """
+
+    n = len(x)
+    h = np.diff(x)
+    A = np.zeros((n, n))
+    r = np.zeros(n)
+    A[0, 0] = A[-1, -1] = 1.0 # Segunda derivada cero en los extremos
+    for i in range(1, n-1):
+        A[i, i-1] = h[i-1]
+        A[i, i] = 2*(h[i-1] + h[i])
+        A[i, i+1] = h[i]
+        r[i] = 6*((y[i+1] - y[i])/h[i] - (y[i] - y[i-1])/h[i-1])
+    return np.linalg.solve(A, r)
+
+
+class CurvaVectorizada:
+    """
+    Curva de descuento evaluada con NumPy a partir de sus nodos.
+
+    Parameters
+    ----------
+    referencia : date
+        Fecha de referencia de la curva (factor de descuento 1).
+    tiempos : array
+        Plazo de cada nodo en años (Actual/360), empezando en 0.
+    factores : array
+        Factor de descuento de cada nodo.
+    interpolacion : str
+        'loglineal' o 'cubica'.
+    """
+
+    def __init__(self, referencia, tiempos, factores, interpolacion='cubica'):
+
+        if interpolacion not in ('loglineal', 'cubica'):
+            raise ValueError(f"Interpolación desconocida: {interpolacion!r}")
+
+        self.referencia = np.datetime64(pd.Timestamp(referencia).date(), 'D')
+        self.tiempos = np.asarray(tiempos, dtype=float)
+        self.factores = np.asarray(factores, dtype=float)
+        self.interpolacion = interpolacion
+
+        self._log = np.log(self.factores)
+        self._h = np.diff(self.tiempos)
+        if interpolacion == 'cubica':
+            self._M = _splineNatural(self.tiempos, self._log)
+            M0, M1, h = self._M[:-1], self._M[1:], self._h
+            # Coeficientes de cada tramo: y + b dt + c dt^2 + d dt^3
+            self._b = np.diff(self._log)/h - h*(2*M0 + M1)/6
+            self._c = M0/2
+            self._d = (M1 - M0)/(6*h)
+            pendiente_final = self._b[-1] + 2*self._c[-1]*h[-1] + 3*self._d[-1]*h[-1]**2
+        else:
+            self._b = np.diff(self._log)/self._h
+            pendiente_final = self._b[-1]
+
+        # Forward instantáneo con el que se extrapola después del último nodo
+        self._fwd_final = -pendiente_final
+
+    @classmethod
+    def desdeQL(cls, curva, interpolacion=None):
+        """
+        Crea la curva vectorizada a partir de una curva de QuantLib (la ajusta si hace falta).
+
+        Parameters
+        ----------
+        curva : ql.YieldTermStructure
+            Curva de descuento interpolada (p. ej. la salida de `genFTIIE`).
+        interpolacion : str, optional
+            'loglineal' o 'cubica'. Por defecto se deduce del tipo de curva.
+        """
+
+        if curva.dayCounter().name() != ql.Actual360().name():
+            raise ValueError('Solo se admiten curvas con conteo Actual/360')
+
+        if interpolacion is None:
+            lineales = (ql.PiecewiseLogLinearDiscount, ql.DiscountCurve)
+            interpolacion = 'loglineal' if isinstance(curva, lineales) else 'cubica'
+
+        return cls(curva.referenceDate().to_date(), curva.times(), curva.data(), interpolacion)
+
+    @classmethod
+    def desdeNodos(cls, fechas, factores, interpolacion='cubica'):
+        """
+        Crea la curva vectorizada a partir de sus nodos (fecha, factor de descuento).
+
+        El primer nodo es la fecha de referencia, como en `curva.nodes()`.
+        """
+
+        fechas = pd.to_datetime(pd.Series(fechas)).to_numpy().astype('datetime64[D]')
+        tiempos = (fechas - fechas[0]).astype(float)/360
+        return cls(fechas[0], tiempos, factores, interpolacion)
+
+    def tiempo(self, fechas):
+        """ Plazo en años (Actual/360) desde la fecha de referencia hasta `fechas`. """
+
+        fechas = np.asarray(fechas)
+        if np.issubdtype(fechas.dtype, np.number):
+            return fechas.astype(float)
+        if not np.issubdtype(fechas.dtype, np.datetime64):
+            fechas = pd.to_datetime(fechas.ravel()).to_numpy().reshape(fechas.shape)
+        return (fechas.astype('datetime64[D]') - self.referencia).astype(float)/360
+
+    def descuento(self, fechas):
+        """ Factores de descuento en `fechas` (fechas o plazos en años). """
+
+        t = self.tiempo(fechas)
+        if np.any(t < 0):
+            raise ValueError('Hay fechas anteriores a la fecha de referencia de la curva')
+
+        # Tramo de cada punto; los puntos después del último nodo se extrapolan
+        i = np.clip(np.searchsorted(self.tiempos, t, side='right') - 1, 0, len(self._h) - 1)
+        dt = t - self.tiempos[i]
+        if self.interpolacion == 'cubica':
+            log = self._log[i] + dt*(self._b[i] + dt*(self._c[i] + dt*self._d[i]))
+        else:
+            log = self._log[i] + self._b[i]*dt
+
+        fuera = t > self.tiempos[-1]
+        log = np.where(fuera, self._log[-1] - self._fwd_final*(t - self.tiempos[-1]), log)
+        return np.exp(log)
+
+    def cero(self, fechas):
+        """ Tasas cero continuas (Actual/360) hasta `fechas`. """
+
+        t = np.maximum(self.tiempo(fechas), 0.0001) # Igual que QuantLib en t = 0
+        return -np.log(self.descuento(t))/t
+
+    def forward(self, inicio, fin):
+        """ Tasas forward simples (Actual/360) entre `inicio` y `fin`. """
+
+        t1, t2 = self.tiempo(inicio), self.tiempo(fin)
+        return (self.descuento(t1)/self.descuento(t2) - 1)/(t2 - t1)
+
+    def forward28(self, inicio):
+        """ Tasas forward a 28 días naturales desde `inicio`. """
+
+        t = self.tiempo(inicio)
+        return self.forward(t, t + 28/360)
+
+    def forwardON(self, inicio):
+        """ Tasas forward a un día natural (overnight) desde `inicio`. """
+
+        t = self.tiempo(inicio)
+        return self.forward(t, t + 1/360)
+
+
+def _splineNaturalLote(x, y):
+    """ Segundas derivadas de los splines cúbicos naturales de cada renglón de (x, y). """
+
+    m, n = x.shape
+    h = np.diff(x, axis=1)
+    A = np.zeros((m, n, n))
+    r = np.zeros((m, n))
+    A[:, 0, 0] = A[:, -1, -1] = 1.0 # Segunda derivada cero en los extremos
+    i = np.arange(1, n-1)
+    A[:, i, i-1] = h[:, :-1]
+    A[:, i, i] = 2*(h[:, :-1] + h[:, 1:])
+    A[:, i, i+1] = h[:, 1:]
+    pendientes = np.diff(y, axis=1)/h
+    r[:, 1:-1] = 6*(pendientes[:, 1:] - pendientes[:, :-1])
+    return np.linalg.solve(A, r[..., None])[..., 0]
+
+
+def descuentoLote(tiempos, factores, plazos, interpolacion='cubica'):
+    """
+    Factores de descuento de varias curvas a la vez, con la misma interpolación
+    que `CurvaVectorizada`.
+
+    Parameters
+    ----------
+    tiempos : array
+        Plazo de los nodos de cada curva en años (curvas x nodos), empezando en 0.
+    factores : array
+        Factor de descuento de los nodos (curvas x nodos).
+    plazos : array
+        Plazos en años en los que se evalúa: los mismos para todas las curvas
+        (puntos,) o uno por curva (curvas x puntos).
+    interpolacion : str
+        'loglineal' o 'cubica'.
+
+    Returns
+    -------
+    np.ndarray
+        Factores de descuento (curvas x puntos).
+    """
+
+    if interpolacion not in ('loglineal', 'cubica'):
+        raise ValueError(f"Interpolación desconocida: {interpolacion!r}")
+
+    x = np.asarray(tiempos, dtype=float)
+    y = np.log(np.asarray(factores, dtype=float))
+    t = np.broadcast_to(np.asarray(plazos, dtype=float), (len(x), np.shape(plazos)[-1]))
+    if np.any(t < 0):
+        raise ValueError('Hay plazos negativos')
+
+    # Tramo de cada punto en su curva; los puntos después del último nodo se extrapolan
+    h = np.diff(x, axis=1)
+    i = np.clip((x[:, None, :] <= t[:, :, None]).sum(axis=2) - 1, 0, h.shape[1] - 1)
+    tramo = lambda v: np.take_along_axis(v, i, axis=1)
+    dt = t - tramo(x[:, :-1])
+    b = np.diff(y, axis=1)/h
+    if interpolacion == 'cubica':
+        M = _splineNaturalLote(x, y)
+        M0, M1 = M[:, :-1], M[:, 1:]
+        b = b - h*(2*M0 + M1)/6
+        c, d = M0/2, (M1 - M0)/(6*h)
+        log = tramo(y[:, :-1]) + dt*(tramo(b) + dt*(tramo(c) + dt*tramo(d)))
+        pendiente_final = b[:, -1] + 2*c[:, -1]*h[:, -1] + 3*d[:, -1]*h[:, -1]**2
+    else:
+        log = tramo(y[:, :-1]) + tramo(b)*dt
+        pendiente_final = b[:, -1]
+
+    # Después del último nodo, forward instantáneo constante
+    fuera = t > x[:, -1:]
+    log = np.where(fuera, y[:, -1:] + pendiente_final[:, None]*(t - x[:, -1:]), log)
+    return np.exp(log)
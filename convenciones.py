@@ -0,0 +1,303 @@
+"""
+Registro de convenciones e índices compartidos por las curvas y los swaps.
+
+Los helpers de `curvas.py` y los swaps de `swaps.py` toman de aquí los días de
+liquidación y de pago, frecuencias, ajustes de fechas, calendarios, conteos de
+días e índices, en lugar de definirlos en cada llamada. Hay un solo objeto de
+índice por tipo de curva:
+
+- 'TIIE': `ql.IborIndex` de TIIE a 28 días (helpers y swaps de TIIE28).
+- 'SWP_FTIIE': `ql.OvernightIndex` de los swaps de TIIE de Fondeo.
+- 'FUT_FTIIE': `ql.OvernightIndex` de los futuros de TIIE de Fondeo (con los
+  fixings de Banxico).
+- 'XCCY_FTIIE': `ql.OvernightIndex` de la pata MXN de los XCCY basis.
+- 'SOFR': `ql.Sofr`.
+
+Cada índice compartido está ligado a un handle de proyección
+(`proyecciones[nombre]`) que se puede apuntar a una curva con `ligar`. Los
+helpers usan el índice como plantilla y lo clonan con la curva que se está
+ajustando, y cada swap usa un clon con su propia curva (`indiceProyeccion`),
+así que varios juegos de curvas pueden convivir. Como QuantLib guarda los
+fixings por nombre de índice, los clones comparten los fixings, que se cargan
+una sola vez (`cargarFixings`).
+
+La fecha de evaluación de QuantLib es global al proceso. `fechaEvaluacion` la
+fija mientras dura un bloque `with` y la protege con un candado, de modo que
+varios hilos pueden construir curvas de distintas fechas sin pisarse (ver
+`concurrencia.py`).
+"""
+
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+import QuantLib as ql
+
+
+calendario_mexico = ql.Mexico() # Calendario de México
+calendario_fed = ql.UnitedStates(5) # Calendario de la Reserva Federal de EUA
+actual360 = ql.Actual360() # Todas las curvas cuentan días Actual/360
+mxn = ql.MXNCurrency()
+
+# Convenciones por grupo de instrumentos (mismos grupos que `curvas_vivas.grupos`)
+convenciones = {
+    'TIIE28': {
+        'dias_liq': 1, # Días de liquidación
+        'dias_pago': 0, # Días que tarda en pagar después del corte de cupón
+        'frecuencia': ql.EveryFourthWeek, # Cada 4 semanas (28 días)
+        'ajuste': ql.Following, # Siempre se va al siguiente día hábil
+        'fin_de_mes': False, # No obliga a terminar al final de mes
+        'calendario': calendario_mexico,
+        'conteo': actual360,
+    },
+    'FTIIE': {
+        'dias_liq': 2,
+        'dias_pago': 2,
+        'frecuencia': ql.EveryFourthWeek,
+        'ajuste': ql.Following,
+        'fin_de_mes': False,
+        'calendario': calendario_mexico,
+        'conteo': actual360,
+    },
+    'FTIIE_FUT': {
+        'dias_liq': 1, # Los futuros liquidan en t+1
+        'calendario': calendario_mexico,
+        'conteo': actual360,
+    },
+    'FX': {
+        'dias_liq': 0,
+        'ajuste': ql.Following,
+        'fin_de_mes': False,
+        'calendario': calendario_mexico,
+        'base_es_colateral': True, # El USD es la moneda del colateral
+    },
+    'XCCY': {
+        'dias_liq': 2,
+        'dias_pago': 2,
+        'frecuencia': ql.EveryFourthWeek,
+        'ajuste': ql.Following,
+        'fin_de_mes': False,
+        'calendario': calendario_mexico,
+        'conteo': actual360,
+    },
+    'SOFR_FUT': {
+        'meses': 3, # Futuros trimestrales
+        'ajuste': ql.ModifiedFollowing,
+        'fin_de_mes': True,
+        'calendario': calendario_fed,
+        'conteo': actual360,
+    },
+    'SOFR': {
+        'dias_liq': 2,
+        'dias_pago': 2,
+        'frecuencia': ql.Annual,
+        'ajuste': ql.ModifiedFollowing,
+        'fin_de_mes': False,
+        'calendario': calendario_fed,
+        'conteo': actual360,
+    },
+}
+
+
+def _crearIndice(nombre, proyeccion):
+    """ Crea un índice compartido ligado al handle `proyeccion`. """
+
+    if nombre == 'TIIE':
+        conv = convenciones['TIIE28']
+        return ql.IborIndex(
+            'TIIE', ql.Period(13), conv['dias_liq'], mxn, conv['calendario'],
+            conv['ajuste'], conv['fin_de_mes'], conv['conteo'], proyeccion)
+    if nombre == 'SOFR':
+        return ql.Sofr(proyeccion)
+
+    grupo = {'SWP_FTIIE': 'FTIIE', 'FUT_FTIIE': 'FTIIE_FUT', 'XCCY_FTIIE': 'XCCY'}[nombre]
+    conv = convenciones[grupo]
+    return ql.OvernightIndex(nombre, conv['dias_liq'], mxn, conv['calendario'], conv['conteo'], proyeccion)
+
+
+nombres_indices = ('TIIE', 'SWP_FTIIE', 'FUT_FTIIE', 'XCCY_FTIIE', 'SOFR')
+
+proyecciones = {} # {nombre: ql.RelinkableYieldTermStructureHandle}
+_indices = {} # {nombre: índice compartido}
+_fixings = {} # {nombre: fixings cargados con `cargarFixings`}
+_versiones_fixings = {} # {nombre: número de cambios a los fixings del índice}
+
+
+def indice(nombre):
+    """
+    Índice compartido de un tipo de curva (se crea la primera vez).
+
+    Parameters
+    ----------
+    nombre : str
+        'TIIE', 'SWP_FTIIE', 'FUT_FTIIE', 'XCCY_FTIIE' o 'SOFR'.
+    """
+
+    if nombre not in _indices:
+        if nombre not in nombres_indices:
+            raise KeyError(f'Índice desconocido: {nombre}')
+        proyecciones[nombre] = ql.RelinkableYieldTermStructureHandle()
+        _indices[nombre] = _crearIndice(nombre, proyecciones[nombre])
+    return _indices[nombre]
+
+
+def ligar(nombre, curva):
+    """ Apunta el handle de proyección del índice compartido `nombre` a `curva`. """
+
+    indice(nombre)
+    proyecciones[nombre].linkTo(curva)
+
+
+def indiceProyeccion(nombre, curva):
+    """ Clon del índice compartido que proyecta con `curva` (comparte sus fixings). """
+
+    return indice(nombre).clone(ql.RelinkableYieldTermStructureHandle(curva))
+
+
+def cargarFixings(nombre, fechas_banxico, tasas_banxico):
+    """
+    Reemplaza los fixings de un índice compartido por las tasas de Banxico.
+
+    Si la misma serie ya se cargó no se vuelve a procesar, de modo que muchas
+    construcciones de curvas con los mismos insumos cargan los fixings una vez.
+
+    Parameters
+    ----------
+    nombre : str
+        Nombre del índice (p. ej. 'FUT_FTIIE').
+    fechas_banxico : list
+        Fechas en formato 'dd/mm/aaaa'.
+    tasas_banxico : list
+        Tasas en %.
+    """
+
+    serie = (tuple(fechas_banxico), tuple(tasas_banxico))
+    if _fixings.get(nombre) == serie:
+        return
+
+    indice_fixings = indice(nombre)
+    indice_fixings.clearFixings() # Quitamos todos los fixings que pueden haber
+    fechas_ql = [ql.Date.from_date(f) for f in pd.to_datetime(fechas_banxico, format='%d/%m/%Y')]
+    indice_fixings.addFixings(fechas_ql, [t/100 for t in tasas_banxico]) # Tasas en decimales
+    _fixings[nombre] = serie
+    _cambioFixings(nombre)
+
+
+def agregarFixing(nombre, fecha, tasa):
+    """
+    Agrega (o corrige) un solo fixing de un índice compartido sin recargar los demás.
+
+    QuantLib avisa a los instrumentos que observan el índice, así que los helpers
+    que usan ese fixing se actualizan sin volver a crearse. Si los fixings del
+    índice se cargaron con `cargarFixings`, la serie registrada se extiende con el
+    nuevo fixing para que volver a cargarla no borre el índice.
+
+    Parameters
+    ----------
+    nombre : str
+        Nombre del índice (p. ej. 'FUT_FTIIE').
+    fecha : date, str or ql.Date
+        Fecha del fixing; los textos en formato 'dd/mm/aaaa' (ver `fechaFixing`).
+    tasa : float
+        Tasa en %.
+
+    Returns
+    -------
+    bool
+        False si el índice ya tenía ese fixing con la misma tasa (no se hace nada).
+    """
+
+    fecha_ql = fechaFixing(fecha)
+    indice_fixings = indice(nombre)
+    serie = indice_fixings.timeSeries()
+    anterior = dict(zip(serie.dates(), serie.values())).get(fecha_ql)
+    if anterior == tasa/100:
+        return False
+    indice_fixings.addFixing(fecha_ql, tasa/100, True) # Sobrescribe si Banxico corrige el dato
+    _cambioFixings(nombre)
+
+    if nombre in _fixings:
+        texto = fecha_ql.to_date().strftime('%d/%m/%Y')
+        fechas, tasas = (list(v) for v in _fixings[nombre])
+        if texto in fechas:
+            tasas[fechas.index(texto)] = tasa
+        else:
+            fechas.append(texto)
+            tasas.append(tasa)
+        _fixings[nombre] = (tuple(fechas), tuple(tasas))
+    return True
+
+
+def olvidarFixings(nombre):
+    """ Indica que los fixings de un índice se cambiaron por fuera de `cargarFixings`. """
+    _fixings.pop(nombre, None)
+    _cambioFixings(nombre)
+
+
+def _cambioFixings(nombre):
+    _versiones_fixings[nombre] = _versiones_fixings.get(nombre, 0) + 1
+
+
+def versionFixings(nombre):
+    """
+    Número de cambios a los fixings de un índice compartido en este proceso.
+
+    Cambia con `cargarFixings`, `agregarFixing` y `olvidarFixings`, así que sirve
+    para saber si un resultado guardado se calculó con los fixings actuales.
+    """
+    return _versiones_fixings.get(nombre, 0)
+
+
+def fechaQL(fecha):
+    """ Convierte una fecha (`datetime.date`, `pd.Timestamp`, str o `ql.Date`) a `ql.Date`. """
+    if isinstance(fecha, ql.Date):
+        return fecha
+    return ql.Date.from_date(pd.Timestamp(fecha).date())
+
+
+def fechaFixing(fecha):
+    """
+    Como `fechaQL`, pero los textos se leen como 'dd/mm/aaaa', el formato de `fechas_banxico`.
+
+    >>> fechaFixing('05/02/2025')   # 5 de febrero, no 2 de mayo
+    Date(5,2,2025)
+    """
+    if isinstance(fecha, str):
+        return ql.Date.from_date(pd.to_datetime(fecha, format='%d/%m/%Y').date())
+    return fechaQL(fecha)
+
+
+# Candado de la fecha de evaluación global; reentrante para anidar `fechaEvaluacion`
+candado_fecha = threading.RLock()
+
+
+@contextmanager
+def fechaEvaluacion(fecha=None):
+    """
+    Fija la fecha de evaluación de QuantLib dentro de un bloque `with`.
+
+    Mientras dura el bloque ningún otro hilo puede cambiar la fecha con
+    `fechaEvaluacion`; al salir se regresa a la fecha anterior. Las curvas con
+    días de liquidación 0 (las de `curvas.py`) se mueven con la fecha de
+    evaluación, así que hay que ajustarlas y leerlas dentro del bloque (o
+    fijarlas con `persistencia.congelarCurvas`).
+
+    >>> with fechaEvaluacion('2025-02-19'):
+    ...     nodos = genCurvas(insumos)['FTIIE'].nodes()
+
+    Parameters
+    ----------
+    fecha : date or ql.Date, optional
+        Fecha de evaluación. Con None se conserva la actual (solo se toma el candado).
+    """
+
+    with candado_fecha:
+        ajustes = ql.Settings.instance()
+        anterior = ajustes.evaluationDate
+        if fecha is not None:
+            ajustes.evaluationDate = fechaQL(fecha)
+        try:
+            yield ajustes.evaluationDate
+        finally:
+            if ajustes.evaluationDate != anterior:
+                ajustes.evaluationDate = anterior
@@ -49,6 +49,10 @@ import numpy as np
 import pandas as pd
 import QuantLib as ql # versión 1.38 o superior
 
+from convenciones import (actual360, calendario_fed, calendario_mexico, # Convenciones e índices compartidos
+                          cargarFixings, convenciones, fechaQL, indice)
+from instrumentacion import instrumentado # Eventos opcionales de tiempos y errores (ver instrumentacion.py)
+
 # Definición de insumos
 # L es un mes de 28 días (mes lunar)
 
@@ -116,35 +120,42 @@ tasas_tiie28 = [
 # Se definirá una función que creará todos los "helpers" necesarios para crear la curva. Esta función recibirá, 3 insumos: `tasas`, `tenors` y `curva de descuento`. Los primeros dos insumos ya los tenemos y el tercero se definirá en la sección de Curva de Descuento Mexicana
 
 # %%
-def TIIE28Helpers(tasas, tenors, curva_descuento):
+def cotizacion(valor, clave=None, cotizaciones=None):
+    """ Crea la cotización de QuantLib de un instrumento.
+
+    Si se recibe el diccionario `cotizaciones`, la cotización se guarda en él con la
+    llave `clave` = (grupo, tenor) para poder actualizarla después (ver `curvas_vivas.py`).
+    """
+
+    quote = ql.SimpleQuote(valor) # Objeto para tasas
+    if cotizaciones is not None:
+        cotizaciones[clave] = quote
+    return ql.QuoteHandle(quote)
+
+
+@instrumentado('helpers')
+def TIIE28Helpers(tasas, tenors, curva_descuento, cotizaciones=None):
     
-    dias_liq = 1 # Dias de liquidación (1)
-    cont_dias = ql.Actual360() # Forma de conteo de días 
-    frecuencia = ql.EveryFourthWeek # Frecuencia de pagos
+    conv = convenciones['TIIE28'] # Convenciones compartidas (ver convenciones.py)
+    dias_liq = conv['dias_liq'] # Dias de liquidación (1)
+    cont_dias = conv['conteo'] # Forma de conteo de días 
+    frecuencia = conv['frecuencia'] # Frecuencia de pagos
     # Cada 4 semanas (28 dias)
-    ajuste_fec = ql.Following # Siempre se va al sig día 
-    moneda = ql.MXNCurrency() # moneda a usar
-    calendario = ql.Mexico() # Calendario de México
-    ult_dia_mes = False # Si obliga a terminar al final de mes
+    ajuste_fec = conv['ajuste'] # Siempre se va al sig día 
+    calendario = conv['calendario'] # Calendario de México
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
 
     
-    # Se define el objeto IborIndex que es el índice ``IBOR-like'' al que se quiere llegar
-    ibor_MXNTIIE = ql.IborIndex(
-        'TIIE', # Nombre del indice 
-        ql.Period(13), # Se divide el año en 13 periodos
-        dias_liq, # Días de liquidación 
-        moneda, # Moneda usada
-        calendario, 
-        ajuste_fec,
-        ult_dia_mes, 
-        cont_dias)
+    # El objeto IborIndex es el índice ``IBOR-like'' al que se quiere llegar
+    # Es el mismo para todas las curvas; cada helper lo liga a la curva que se ajusta
+    ibor_MXNTIIE = indice('TIIE')
 
     descuento = ql.RelinkableYieldTermStructureHandle() # Objeto para usar curvas
     descuento.linkTo(curva_descuento) # le agregamos la curva de descuento
 
 
     depositHelpers = [ql.DepositRateHelper( # Es una tasa de depósito
-        ql.QuoteHandle(ql.SimpleQuote(r/100)), # Objeto para tasas
+        cotizacion(r/100, ('TIIE28', t), cotizaciones), # Objeto para tasas
         ql.Period(t, ql.Months), # Periodo de la tasa
         dias_liq, # Días de liquidación
         calendario, # calendario usado
@@ -155,7 +166,7 @@ def TIIE28Helpers(tasas, tenors, curva_descuento):
 
     swapHelpers = [
         ql.SwapRateHelper( # Es una tasa par de Swap 
-            ql.QuoteHandle(ql.SimpleQuote(r/100)), # Objeto para tasas
+            cotizacion(r/100, ('TIIE28', t), cotizaciones), # Objeto para tasas
             ql.Period(t*4, ql.Weeks), # Periodo de la tasa
             calendario, # calendario usado
             frecuencia,  # frecuencia 
@@ -311,7 +322,8 @@ tasas_banxico = [
 
 # %%
 # Helpers para los Swaps de FTIIE
-def FTIIESwapHelpers(tasas, tenors, curva_descuento):
+@instrumentado('helpers')
+def FTIIESwapHelpers(tasas, tenors, curva_descuento, cotizaciones=None):
     """ Crea los helpers para los swaps FTIIE.
     
     Parameters
@@ -322,6 +334,8 @@ def FTIIESwapHelpers(tasas, tenors, curva_descuento):
         Tenors de los swaps FTIIE.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones con llave ('FTIIE', tenor).
     
     Returns
     -------
@@ -329,24 +343,19 @@ def FTIIESwapHelpers(tasas, tenors, curva_descuento):
         Lista de helpers para los swaps FTIIE.
     """
     
-    dias_liq = 2 # Días de liquidación (2)
-    cont_dias = ql.Actual360() # Forma de conteo de días 
-    frecuencia = ql.EveryFourthWeek # Frecuencia de pagos
+    conv = convenciones['FTIIE'] # Convenciones compartidas (ver convenciones.py)
+    dias_liq = conv['dias_liq'] # Días de liquidación (2)
+    frecuencia = conv['frecuencia'] # Frecuencia de pagos
     # Cada 4 semanas (28 días)
-    ajuste_fec = ql.Following # Siempre se va al siguiente día hábil
-    moneda = ql.MXNCurrency() # moneda usada
-    calendario = ql.Mexico() # Calendario de fechas
-    ult_dia_mes = False # Si obliga a terminar al final de mes
-    dias_pago = 2 # Días que tarda en pagar después del corte de cupón
+    ajuste_fec = conv['ajuste'] # Siempre se va al siguiente día hábil
+    calendario = conv['calendario'] # Calendario de fechas
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
+    dias_pago = conv['dias_pago'] # Días que tarda en pagar después del corte de cupón
 
     
-    # Se define el objeto OvernightIndex que es el índice ``Overnight'' al que se quiere llegar
+    # El objeto OvernightIndex es el índice ``Overnight'' al que se quiere llegar
     # Es Overnight porque las tasas se componen diariamente
-    index_MXNFTIIE = ql.OvernightIndex(
-        'SWP_FTIIE',
-        dias_liq, 
-        moneda, calendario,  
-        cont_dias)
+    index_MXNFTIIE = indice('SWP_FTIIE')
 
     descuento = ql.RelinkableYieldTermStructureHandle() # Objeto para usar curvas
     descuento.linkTo(curva_descuento) # le agregamos la curva de descuento
@@ -354,7 +363,7 @@ def FTIIESwapHelpers(tasas, tenors, curva_descuento):
     helpers = [ql.OISRateHelper( # Usamos un OIS Rate Helper porque usa una tasa diaria
         dias_liq,  # Días de liquidación
         ql.Period(t*4, ql.Weeks), # Period (en semanas)
-        ql.QuoteHandle(ql.SimpleQuote(r/100)),  # Tasa (entre 100)
+        cotizacion(r/100, ('FTIIE', t), cotizaciones),  # Tasa (entre 100)
         index_MXNFTIIE,  # Índice a encontrar
         descuento, # Curva de descuento
         ult_dia_mes,  # Si termina en último día de vez
@@ -369,7 +378,8 @@ def FTIIESwapHelpers(tasas, tenors, curva_descuento):
     return helpers
 
 # Helpers para los Futuros FTIIE
-def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico):
+@instrumentado('helpers')
+def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico, cotizaciones=None):
     """ Crea los helpers para los futuros FTIIE.
 
     Parameters
@@ -378,10 +388,13 @@ def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico):
         Tasas de los futuros FTIIE.
     tenors : list
         Tenors de los futuros FTIIE.
-    fechas_banxico : list
-        Fechas de Banxico para los futuros FTIIE.
-    tasas_banxico : list
+    fechas_banxico : list or None
+        Fechas de Banxico para los futuros FTIIE. Si es None, se usan los fixings
+        que ya tiene el índice "FUT_FTIIE" (p. ej. cargados con `fixings.py`).
+    tasas_banxico : list or None
         Tasas de Banxico para los futuros FTIIE.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones con llave ('FTIIE_FUT', tenor).
     
     Returns
     -------
@@ -390,26 +403,12 @@ def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico):
     """
 
 
-    dias_liq = 1 # Los futuros liquidan en t+1
-    moneda = ql.MXNCurrency() # Moneda usada
-    calendario = ql.Mexico() # Calendario de México
-    cont_dias = ql.Actual360() # Forma de conteo de días
-    
-    index_MXNFTIIE = ql.OvernightIndex( # Se vuelve a definir el Overnight Index
-        'FUT_FTIIE', # Le llamamos FUT para diferenciarlo
-        dias_liq, 
-        moneda, 
-        calendario,  
-        cont_dias)
+    index_MXNFTIIE = indice('FUT_FTIIE') # Overnight Index de los futuros (le llamamos FUT para diferenciarlo)
         
     # Se debe de rellenar el overnight index con las tasas hasta la fecha de evaluación
-    
-    index_MXNFTIIE.clearFixings() # Quitamos todos los fixings que pueden haber
-    fechas_banxico_ql = [ql.Date.from_date(pd.to_datetime(f,format = '%d/%m/%Y'))
-                         for f in fechas_banxico] # Se pasan las fechas a formato QuantLib
-    tasas_banxico = [t/100 for t in tasas_banxico]  # Se hacen tasas en decimales
-
-    index_MXNFTIIE.addFixings(fechas_banxico_ql, tasas_banxico) # Se agregan las tasas al índice "FUT_FTIIE"
+    # Los fixings se guardan por nombre de índice y solo se cargan si cambian
+    if fechas_banxico is not None:
+        cargarFixings('FUT_FTIIE', fechas_banxico, tasas_banxico)
 
     dic_meses = { # Diccionario de meses y sus números
         'Ene': 1,
@@ -432,7 +431,7 @@ def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico):
     # Para cada tasa, tenor y mes se crea un helper de futuro
     for r, t in zip(tasas, tenors):
 
-        tasa_ql = ql.QuoteHandle(ql.SimpleQuote(r)) # Objeto tasa de QuantLib
+        tasa_ql = cotizacion(r, ('FTIIE_FUT', t), cotizaciones) # Objeto tasa de QuantLib
         mes =  dic_meses[t[:3]] # Mes del futuro
         anio =  int(t[3:]) # año del futuro
          
@@ -453,8 +452,9 @@ def FTIIEFutureshelpers(tasas, tenors, fechas_banxico, tasas_banxico):
     return helpers
 
 
+@instrumentado('helpers')
 def FTIIEHelpers(tasas_fut, tenors_fut, tasas_swap, tenors_swap, 
-                 curva_descuento, fechas_banxico, tasas_banxico):
+                 curva_descuento, fechas_banxico, tasas_banxico, cotizaciones=None):
     """
     Crea los helpers para los futuros FTIIE y los swaps FTIIE.
     
@@ -471,10 +471,12 @@ def FTIIEHelpers(tasas_fut, tenors_fut, tasas_swap, tenors_swap,
         Tenors de los swaps FTIIE.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
-    fechas_banxico : list
-        Fechas de Banxico para los futuros FTIIE.
-    tasas_banxico : list
+    fechas_banxico : list or None
+        Fechas de Banxico para los futuros FTIIE (ver `FTIIEFutureshelpers`).
+    tasas_banxico : list or None
         Tasas de Banxico para los futuros FTIIE.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de futuros y swaps.
     
     Returns
     -------
@@ -483,10 +485,11 @@ def FTIIEHelpers(tasas_fut, tenors_fut, tasas_swap, tenors_swap,
     """
     
     # Helpers para futuros FTIIE
-    helpers_fut = FTIIEFutureshelpers(tasas_fut, tenors_fut, fechas_banxico, tasas_banxico)
+    helpers_fut = FTIIEFutureshelpers(tasas_fut, tenors_fut, fechas_banxico, tasas_banxico,
+                                      cotizaciones)
     
     # Helpers para swaps FTIIE
-    helpers_swap = FTIIESwapHelpers(tasas_swap, tenors_swap, curva_descuento)
+    helpers_swap = FTIIESwapHelpers(tasas_swap, tenors_swap, curva_descuento, cotizaciones)
     
     return helpers_fut + helpers_swap
 
@@ -620,7 +623,8 @@ tasas_xccy = [
 
 # %%
 # FX Swap Helper
-def FXSwapHelpers(tasas_fwd, tenors, t_mxn_usd_spot,  curva_descuento):
+@instrumentado('helpers')
+def FXSwapHelpers(tasas_fwd, tenors, t_mxn_usd_spot,  curva_descuento, cotizaciones=None):
 
     """ Crea los helpers para los fwds de tipo de cambio.
     
@@ -632,6 +636,9 @@ def FXSwapHelpers(tasas_fwd, tenors, t_mxn_usd_spot,  curva_descuento):
         Tenors de los fwds de tipo de cambio.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones con llave ('FX', tenor) y el spot
+        con llave ('FX', 'SPOT').
     
     Returns
     -------
@@ -639,20 +646,22 @@ def FXSwapHelpers(tasas_fwd, tenors, t_mxn_usd_spot,  curva_descuento):
         Lista de helpers para los fwds de tipo de cambio.
     """
     
-    dias_liq = 0 # Días de liquidación (0)
-    ajuste_fec = ql.Following # Siempre se va al siguiente día hábil
-    calendario = ql.Mexico() # Calendario de México
-    ult_dia_mes = False # Si obliga a terminar al final de mes
-    base_es_colateral = True # Si es colateralizado o no
+    conv = convenciones['FX'] # Convenciones compartidas (ver convenciones.py)
+    dias_liq = conv['dias_liq'] # Días de liquidación (0)
+    ajuste_fec = conv['ajuste'] # Siempre se va al siguiente día hábil
+    calendario = conv['calendario'] # Calendario de México
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
+    base_es_colateral = conv['base_es_colateral'] # Si es colateralizado o no
 
     descuento = ql.RelinkableYieldTermStructureHandle() # Objeto para usar curvas
     descuento.linkTo(curva_descuento) # le agregamos la curva de descuento
 
+    spot = cotizacion(t_mxn_usd_spot, ('FX', 'SPOT'), cotizaciones) # Spot del tipo de cambio (uno para todos)
 
     helpers = [
         ql.FxSwapRateHelper( # Es una tasa par de Swap Fx
-            ql.QuoteHandle(ql.SimpleQuote(r/10000)), # Objeto para tasas (entre 10000)
-            ql.QuoteHandle(ql.SimpleQuote(t_mxn_usd_spot)), # Spot del tipo de cambio
+            cotizacion(r/10000, ('FX', t), cotizaciones), # Objeto para tasas (entre 10000)
+            spot, # Spot del tipo de cambio
             ql.Period(t), # Periodo del swap (en días)
             dias_liq, # Días de liquidación (0)
             calendario, 
@@ -664,7 +673,8 @@ def FXSwapHelpers(tasas_fwd, tenors, t_mxn_usd_spot,  curva_descuento):
     
     return helpers
 
-def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral):
+@instrumentado('helpers')
+def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral, cotizaciones=None):
     """ Crea los helpers para los XCCY basis.
     
     Parameters
@@ -677,6 +687,9 @@ def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral):
         Tenors de los XCCY basis.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones (la tasa FTIIE de cada helper)
+        con llave ('XCCY', tenor).
     
     Returns
     -------
@@ -684,23 +697,19 @@ def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral):
         Lista de helpers para los XCCY basis.
     """
     
-    dias_liq = 2 # Días de liquidación (2)
-    calendario = ql.Mexico() # Calendario de México
-    ajuste_fec = ql.Following # Siempre se va al siguiente día hábil
-    ult_dia_mes = False # Si obliga a terminar al final de mes
-    dias_pago = 2 # Días que tarda en pagar después del corte de cupón
-    frecuencia = ql.EveryFourthWeek # Frecuencia de pagos cada 4 semanas (28 días)
+    conv = convenciones['XCCY'] # Convenciones compartidas (ver convenciones.py)
+    dias_liq = conv['dias_liq'] # Días de liquidación (2)
+    calendario = conv['calendario'] # Calendario de México
+    ajuste_fec = conv['ajuste'] # Siempre se va al siguiente día hábil
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
+    dias_pago = conv['dias_pago'] # Días que tarda en pagar después del corte de cupón
+    frecuencia = conv['frecuencia'] # Frecuencia de pagos cada 4 semanas (28 días)
     periodo_de_inicio = ql.Period('0D') # Periodo de inicio de los swaps (0)
 
 
 
 
-    indice_xccy = ql.OvernightIndex(
-        'XCCY_FTIIE', # Nombre del índice
-        dias_liq, # Días de liquidación
-        ql.MXNCurrency(), # Moneda usada
-        calendario, 
-        ql.Actual360()) # Forma de conteo de días
+    indice_xccy = indice('XCCY_FTIIE') # Índice de la pata MXN
     
 
 
@@ -713,7 +722,7 @@ def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral):
         ql.OISRateHelper( # Usamos un OIS Rate Helper porque usa una tasa diaria
             dias_liq,  # Días de liquidación
             ql.Period(t*4, ql.Weeks), # Periodo (en semanas)
-            ql.QuoteHandle(ql.SimpleQuote(rf/ 100)),  # Tasa (entre 100)
+            cotizacion(rf/ 100, ('XCCY', t), cotizaciones),  # Tasa (entre 100)
             indice_xccy,  # Índice a encontrar
             descuento, # Curva de descuento
             ult_dia_mes,  # Si termina en último día de vez
@@ -729,8 +738,9 @@ def XCCYBasisHelpers(basis_xccy, tasas_ftiie, tenors, curva_colateral):
     return helpers
 
 
+@instrumentado('helpers')
 def FXAndXCCYHelpers(tasas_fwd, tenors_fwd, t_mxn_usd_spot, basis_xccy, tasas_ftiie,
-                     tenors_xccy, curva_descuento):
+                     tenors_xccy, curva_descuento, cotizaciones=None):
     """ Crea los helpers para los fwds de tipo de cambio y los XCCY basis.
     
     Parameters
@@ -745,6 +755,8 @@ def FXAndXCCYHelpers(tasas_fwd, tenors_fwd, t_mxn_usd_spot, basis_xccy, tasas_ft
         Tenors de los XCCY basis.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de fwds y XCCY basis.
     
     Returns
     -------
@@ -753,11 +765,12 @@ def FXAndXCCYHelpers(tasas_fwd, tenors_fwd, t_mxn_usd_spot, basis_xccy, tasas_ft
     """
     
     # Helpers para fwds de tipo de cambio
-    helpers_fwd = FXSwapHelpers(tasas_fwd, tenors_fwd, t_mxn_usd_spot, curva_descuento)
+    helpers_fwd = FXSwapHelpers(tasas_fwd, tenors_fwd, t_mxn_usd_spot, curva_descuento,
+                                cotizaciones)
     
     # Helpers para XCCY basis
     helpers_xccy = XCCYBasisHelpers(basis_xccy, tasas_ftiie,
-                                    tenors_xccy, curva_descuento)
+                                    tenors_xccy, curva_descuento, cotizaciones)
     
     return helpers_fwd + helpers_xccy
 
@@ -868,16 +881,19 @@ sofr_swaps = [
 
 # %%
 # Helpers de Futuros IMM de SOFR
-def futureIMMHelpers(sofr_futures, tenors_fut_sofr):
+@instrumentado('helpers')
+def futureIMMHelpers(sofr_futures, tenors_fut_sofr, cotizaciones=None, fecha=None):
 
-    calendario = ql.UnitedStates(5) # Federal Reserve calendario
-    fec_eval = ql.Settings.instance().evaluationDate # Fecha de evaluación
+    conv = convenciones['SOFR_FUT'] # Convenciones compartidas (ver convenciones.py)
+    calendario = conv['calendario'] # Federal Reserve calendario
+    # Fecha de evaluación: la que se da o la global de QuantLib
+    fec_eval = ql.Settings.instance().evaluationDate if fecha is None else fechaQL(fecha)
     dt_settlement = calendario.advance(fec_eval, ql.Period('2D')) # Fecha de liquidación (2 días)
 
-    meses = 3 # numero de meses de los futuros IMM
-    conteo_dias = ql.Actual360() # Forma de conteo de días
-    ajuste_fec = ql.ModifiedFollowing # Ajuste de fechas (Si es fin de mes, se va al anterior día hábil)
-    ult_dia_mes = True # Si obliga a terminar al final de mes
+    meses = conv['meses'] # numero de meses de los futuros IMM
+    conteo_dias = conv['conteo'] # Forma de conteo de días
+    ajuste_fec = conv['ajuste'] # Ajuste de fechas (Si es fin de mes, se va al anterior día hábil)
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
 
     # Calcular las siguientes fechas de vencimiento de los futuros IMM
     n_fut = len(tenors_fut_sofr)
@@ -885,13 +901,15 @@ def futureIMMHelpers(sofr_futures, tenors_fut_sofr):
     imm = dt_settlement
     # Se crea un diccionario para almacenar las fechas de vencimiento y sus tasas
     futures = {}
+    tenors = {}
     for i in range(n_fut):
         imm = ql.IMM.nextDate(imm)
         futures[imm] = sofr_futures[i]
+        tenors[imm] = tenors_fut_sofr[i]
 
     
     futuresHelpers = [ql.FuturesRateHelper(
-        ql.QuoteHandle(ql.SimpleQuote(futures[d])), 
+        cotizacion(futures[d], ('SOFR_FUT', tenors[d]), cotizaciones), 
         d, # Fecha de vencimiento del futuro 
         meses, # Número de meses del futuro
         calendario, # Calendario de USA
@@ -903,7 +921,8 @@ def futureIMMHelpers(sofr_futures, tenors_fut_sofr):
     return futuresHelpers
 
 # Helpers para swaps SOFR
-def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo):
+@instrumentado('helpers')
+def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo, cotizaciones=None):
     """
     Crea los helpers para las tasas SOFR.
 
@@ -917,6 +936,9 @@ def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo):
         Tasa de depósito SOFR.
     tenor_depo : int
         Tenor del depósito SOFR (en días).
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones con llave ('SOFR', tenor) y la
+        del depósito con llave ('SOFR_DEPO', tenor_depo).
 
     Returns
     -------
@@ -924,20 +946,21 @@ def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo):
         Lista de helpers para las tasas SOFR.
     """
 
-    dias_liq = 2 # Días de liquidación (2)
-    calendario = ql.UnitedStates(5) # Calendario de USA
-    cont_dias = ql.Actual360() # Forma de conteo de días
-    frecuencia = ql.Annual # Frecuencia de pagos
-    ajuste_fec = ql.ModifiedFollowing # Siempre se va al siguiente día hábil cuando no es fin de mes
-    ult_dia_mes = False # Si obliga a terminar al final de mes
-    dias_pago = 2 # Días que tarda en pagar después del corte de cupón
+    conv = convenciones['SOFR'] # Convenciones compartidas (ver convenciones.py)
+    dias_liq = conv['dias_liq'] # Días de liquidación (2)
+    calendario = conv['calendario'] # Calendario de USA
+    cont_dias = conv['conteo'] # Forma de conteo de días
+    frecuencia = conv['frecuencia'] # Frecuencia de pagos
+    ajuste_fec = conv['ajuste'] # Siempre se va al siguiente día hábil cuando no es fin de mes
+    ult_dia_mes = conv['fin_de_mes'] # Si obliga a terminar al final de mes
+    dias_pago = conv['dias_pago'] # Días que tarda en pagar después del corte de cupón
 
-    indice = ql.Sofr()
+    indice_sofr = indice('SOFR')
     descuento = ql.RelinkableYieldTermStructureHandle() # Objeto para usar curvas
     descuento.linkTo(ql.FlatForward(0, calendario, ql.QuoteHandle(ql.SimpleQuote(0.0)), cont_dias)) # Curva de descuento plana inicializada a 0
 
     depositHelpers = [ql.DepositRateHelper( # Es una tasa de depósito
-        ql.QuoteHandle(ql.SimpleQuote(depo/100)), # Objeto para tasas (entre 100)
+        cotizacion(depo/100, ('SOFR_DEPO', tenor_depo), cotizaciones), # Objeto para tasas (entre 100)
         ql.Period(tenor_depo, ql.Days), # Periodo de la tasa (en días)
         dias_liq, # Días de liquidación     
         calendario, # Calendario de USA
@@ -949,8 +972,8 @@ def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo):
     swapHelpers = [ql.OISRateHelper( # Es una tasa par de Swap
         dias_liq, # Días de liquidación (2)
         ql.Period(t, ql.Years), # Periodo de la tasa (en años)
-        ql.QuoteHandle(ql.SimpleQuote(r/100)), # Objeto para tasas
-        indice, # Índice SOFR
+        cotizacion(r/100, ('SOFR', t), cotizaciones), # Objeto para tasas
+        indice_sofr, # Índice SOFR
         descuento, # Curva de descuento
         ult_dia_mes, # Si termina en último día de vez
         dias_pago, # Días de pago después del corte
@@ -973,10 +996,123 @@ def SOFRHelpers(tasas_sofr, tenors_sofr, depo, tenor_depo):
 # Se comenzará con la curva de SOFR
 
 # %%
+# Perfiles de construcción: interpolación de cada curva, precisión del solver del bootstrapping
+# y número máximo de evaluaciones del solver por nodo. 'oficial' es la configuración de cierre
+# (la de siempre, con los valores por defecto de QuantLib); 'escenarios' cambia precisión por
+# velocidad para corridas de miles de curvas. Ver benchmarks/perfiles.py para su costo y error.
+
+# Curvas por tramos de QuantLib por interpolación (las que admiten persistencia.py y consulta.py)
+curvas_por_tramos = {
+    'loglineal': ql.PiecewiseLogLinearDiscount,
+    'cubica': ql.PiecewiseNaturalLogCubicDiscount,
+}
+
+# Interpolación de cada curva en el perfil oficial
+interpolaciones_oficiales = {'SOFR': 'loglineal', 'DISCTIIE': 'cubica', 'TIIE28': 'cubica', 'FTIIE': 'cubica'}
+
+perfiles = {
+    'oficial': {
+        'interpolacion': interpolaciones_oficiales,
+        'precision': None, # Precisión por defecto de la curva (1e-12)
+        'max_evaluaciones': 100, # Valor por defecto de QuantLib
+    },
+    'escenarios': {
+        'interpolacion': 'loglineal', # Sin spline global: cada nodo se ajusta una sola vez
+        'precision': 1e-8,
+        'max_evaluaciones': 50,
+    },
+}
+
+
+def perfilBootstrap(perfil=None):
+    """
+    Configuración completa de un perfil de construcción.
+
+    Parameters
+    ----------
+    perfil : str or dict, optional
+        Nombre de un perfil de `perfiles` o diccionario con alguna de las llaves
+        'interpolacion' ('loglineal', 'cubica' o {curva: interpolación}),
+        'precision' y 'max_evaluaciones'; lo que falte se toma del perfil
+        oficial. Por defecto el perfil oficial.
+
+    Returns
+    -------
+    dict
+        Perfil con 'interpolacion' como {curva: interpolación}, 'precision' y
+        'max_evaluaciones'.
+    """
+
+    if perfil is None:
+        perfil = 'oficial'
+    if isinstance(perfil, str):
+        if perfil not in perfiles:
+            raise KeyError(f'Perfil desconocido: {perfil!r}. Perfiles: {list(perfiles)}')
+        perfil = perfiles[perfil]
+
+    configuracion = {**perfiles['oficial'], **perfil}
+    interpolacion = configuracion['interpolacion']
+    if isinstance(interpolacion, str):
+        interpolacion = dict.fromkeys(interpolaciones_oficiales, interpolacion)
+    interpolacion = {**interpolaciones_oficiales, **interpolacion}
+    desconocidas = set(interpolacion.values()) - set(curvas_por_tramos)
+    if desconocidas:
+        raise ValueError(f'Interpolaciones desconocidas: {desconocidas}. Se admiten: {list(curvas_por_tramos)}')
+    configuracion['interpolacion'] = interpolacion
+    return configuracion
+
+
+def curvaPorTramos(nombre, perfil=None):
+    """ Clase de curva por tramos de QuantLib de la curva `nombre` en un perfil. """
+
+    return curvas_por_tramos[perfilBootstrap(perfil)['interpolacion'][nombre]]
+
+
+# `ql.IterativeBootstrap` solo admite una cota mínima y una máxima para todos los nodos, así que
+# con la curva previa se toma el intervalo que cubre todos sus factores (p. ej. [0.06, 1.05] a
+# 30 años). No es más estrecho que las cotas que QuantLib da a cada nodo a partir del anterior
+# (para los nodos cortos es más amplio); solo evita buscar fuera del rango de la curva previa.
+
+def cotasBootstrap(curva_previa=None, margen=0.05, perfil=None):
+    """
+    Crea el bootstrap iterativo de una curva, acotado con una curva previa.
+
+    Parameters
+    ----------
+    curva_previa : ql.YieldTermStructure or list, optional
+        Curva ya ajustada de una fecha cercana o sus factores de descuento. Como las
+        curvas se mueven con la fecha de evaluación, conviene dar los factores si la
+        fecha ya cambió. Sin ella se usan las cotas de QuantLib.
+    margen : float
+        Holgura relativa alrededor de los factores de descuento de la curva previa.
+    perfil : str or dict, optional
+        Perfil con la precisión y las evaluaciones máximas del solver (ver `perfilBootstrap`).
+
+    Returns
+    -------
+    ql.IterativeBootstrap
+        Bootstrap con las mismas cotas mínima y máxima para los factores de
+        descuento de todos los nodos.
+    """
+
+    configuracion = perfilBootstrap(perfil)
+    minimo = maximo = None # Cotas de QuantLib
+    if curva_previa is not None:
+        if hasattr(curva_previa, 'nodes'):
+            factores = [fd for _, fd in curva_previa.nodes()]
+        else:
+            factores = list(curva_previa)
+        minimo, maximo = min(factores)*(1 - margen), max(factores)*(1 + margen)
+
+    # Intentos, factores de ampliación y dontThrow con los valores por defecto de QuantLib
+    return ql.IterativeBootstrap(configuracion['precision'], minimo, maximo, 1, 2.0, 2.0, False, 10,
+                                 configuracion['max_evaluaciones'])
 
 
 # %%
-def genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_depo):
+@instrumentado('curva')
+def genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_depo,
+            cotizaciones=None, curva_previa=None, fecha=None, perfil=None):
     """
     Crea la curva de descuento SOFR.
 
@@ -994,6 +1130,15 @@ def genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_
         Tasa de depósito SOFR.
     tenor_depo : int
         Tenor del depósito SOFR (en días).
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de los helpers (ver `cotizacion`).
+    curva_previa : ql.YieldTermStructure, optional
+        Curva ya ajustada de una fecha cercana; acota el bootstrapping (ver `cotasBootstrap`).
+    fecha : ql.Date, optional
+        Fecha con la que se eligen los vencimientos IMM de los futuros. Por defecto
+        la fecha de evaluación global.
+    perfil : str or dict, optional
+        Perfil de construcción: interpolación y parámetros del solver (ver `perfilBootstrap`).
 
     Returns
     -------
@@ -1002,26 +1147,33 @@ def genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_
     """
 
     # Definición de los helpers de tasas SOFR
-    imm_helpers = futureIMMHelpers(sofr_futures, tenors_fut_sofr) # Helpers de futuros IMM de SOFR
-    swap_helpers = SOFRHelpers(sofr_swaps, tenors_sofr, depo, tenor_depo) # Helpers de tasas SOFR
+    imm_helpers = futureIMMHelpers(sofr_futures, tenors_fut_sofr, cotizaciones, fecha) # Helpers de futuros IMM de SOFR
+    swap_helpers = SOFRHelpers(sofr_swaps, tenors_sofr, depo, tenor_depo, cotizaciones) # Helpers de tasas SOFR
     
     # Definición de la curva de descuento de SOFR
-    crvSOFR = ql.PiecewiseLogLinearDiscount(
+    crvSOFR = curvaPorTramos('SOFR', perfil)( # Log-lineal en el perfil oficial
         0, # Fecha de evaluación (hoy)
-        ql.UnitedStates(5), # Calendario de USA
+        calendario_fed, # Calendario de USA
         imm_helpers + swap_helpers, # Helpers de tasas SOFR
-        ql.Actual360()) # Forma de conteo de días
+        actual360, # Forma de conteo de días
+        cotasBootstrap(curva_previa, perfil=perfil)) # Cotas y parámetros del solver
     crvSOFR.enableExtrapolation() # Habilita la extrapolación de la curva
 
     return crvSOFR
 
-ql.Settings.instance().evaluationDate = ql.Date(19,2,2025)
-# Definición de la curva de descuento de SOFR
-crvSOFR = genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_depo)
 
+# Fecha del ejemplo
+fecha_ejemplo = ql.Date(19,2,2025)
 
-df_nodos = pd.DataFrame(crvSOFR.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
-df_nodos
+# El ejemplo solo se ejecuta al correr el archivo (python curvas.py) o el notebook,
+# de modo que importar las funciones no construye curvas ni cambia la fecha de evaluación
+if __name__ == '__main__':
+    ql.Settings.instance().evaluationDate = fecha_ejemplo
+    # Definición de la curva de descuento de SOFR
+    crvSOFR = genSOFR(sofr_futures, tenors_fut_sofr, sofr_swaps, tenors_sofr, depo, tenor_depo)
+
+    df_nodos = pd.DataFrame(crvSOFR.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
+    print(df_nodos)
 
 # %% [markdown]
 # ### Curva de descuento mexicana
@@ -1031,8 +1183,9 @@ df_nodos
 # 
 
 # %%
+@instrumentado('curva')
 def genDISCTIIE(t_mxn_usd_spot, tasas_fwd_fx, tenors_fwd_fx, tasas_xccy, tenors_xccy,
-                tasas_ftiie,  curva_descuento):
+                tasas_ftiie,  curva_descuento, cotizaciones=None, curva_previa=None, perfil=None):
     """
     Crea la curva de descuento TIIE.
 
@@ -1054,6 +1207,12 @@ def genDISCTIIE(t_mxn_usd_spot, tasas_fwd_fx, tenors_fwd_fx, tasas_xccy, tenors_
         Tenors TIIE 28 días.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de los helpers (ver `cotizacion`).
+    curva_previa : ql.YieldTermStructure, optional
+        Curva ya ajustada de una fecha cercana; acota el bootstrapping (ver `cotasBootstrap`).
+    perfil : str or dict, optional
+        Perfil de construcción: interpolación y parámetros del solver (ver `perfilBootstrap`).
 
     Returns
     -------
@@ -1070,31 +1229,34 @@ def genDISCTIIE(t_mxn_usd_spot, tasas_fwd_fx, tenors_fwd_fx, tasas_xccy, tenors_
         tasas_xccy, 
         tasas_ftiie,
         tenors_xccy, 
-        curva_descuento)
+        curva_descuento,
+        cotizaciones)
 
     # Definición de la curva de descuento TIIE
-    crvTIIE = ql.PiecewiseNaturalLogCubicDiscount( # Curva de descuento TIIE 
+    crvTIIE = curvaPorTramos('DISCTIIE', perfil)( # Curva de descuento TIIE 
         0, # Fecha de evaluación (hoy)
-        ql.Mexico(), # Calendario de México
+        calendario_mexico, # Calendario de México
         helpers_disc, # Helpers para TIIE y fwds/XCCY basis
-        ql.Actual360()) # Forma de conteo de días
+        actual360, # Forma de conteo de días
+        cotasBootstrap(curva_previa, perfil=perfil)) # Cotas y parámetros del solver
     
     crvTIIE.enableExtrapolation() # Habilita la extrapolación de la curva
 
     return crvTIIE
 
 
-crvDISCTIIE = genDISCTIIE(
-    t_mxn_usd_spot,
-    tasas_fwd_fx,
-    tenors_fwd_fx,
-    tasas_xccy,
-    tenors_xccy,
-    tasas_ftiie,
-    crvSOFR)
+if __name__ == '__main__':
+    crvDISCTIIE = genDISCTIIE(
+        t_mxn_usd_spot,
+        tasas_fwd_fx,
+        tenors_fwd_fx,
+        tasas_xccy,
+        tenors_xccy,
+        tasas_ftiie,
+        crvSOFR)
 
-df_nodos = pd.DataFrame(crvDISCTIIE.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
-df_nodos
+    df_nodos = pd.DataFrame(crvDISCTIIE.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
+    print(df_nodos)
 
 # %% [markdown]
 # ### Curvas de TIIE28 y FTIIE
@@ -1104,7 +1266,9 @@ df_nodos
 # %%
 # Se definen la función que genera la curva de tasas TIIE 28 días y la curva de tasas FTIIE
 
-def genTIIE28(tasas_tiie28, tenors_tiie28, curva_descuento):
+@instrumentado('curva')
+def genTIIE28(tasas_tiie28, tenors_tiie28, curva_descuento, cotizaciones=None,
+              curva_previa=None, perfil=None):
     """
     Crea la curva de tasas TIIE 28 días.
 
@@ -1116,6 +1280,12 @@ def genTIIE28(tasas_tiie28, tenors_tiie28, curva_descuento):
         Tenors FTIIE.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de los helpers (ver `cotizacion`).
+    curva_previa : ql.YieldTermStructure, optional
+        Curva ya ajustada de una fecha cercana; acota el bootstrapping (ver `cotasBootstrap`).
+    perfil : str or dict, optional
+        Perfil de construcción: interpolación y parámetros del solver (ver `perfilBootstrap`).
 
     Returns
     -------
@@ -1124,24 +1294,29 @@ def genTIIE28(tasas_tiie28, tenors_tiie28, curva_descuento):
     """
 
     # Definición de los helpers para TIIE 28 días
-    helpers_tiiie = TIIE28Helpers(tasas_tiie28, tenors_tiie28, curva_descuento)
+    helpers_tiiie = TIIE28Helpers(tasas_tiie28, tenors_tiie28, curva_descuento, cotizaciones)
 
     # Definición de la curva de tasas TIIE 28 días
-    crvTIIE28 = ql.PiecewiseNaturalLogCubicDiscount(
+    crvTIIE28 = curvaPorTramos('TIIE28', perfil)(
         0, # Fecha de evaluación (hoy)
-        ql.Mexico(), # Calendario de México
+        calendario_mexico, # Calendario de México
         helpers_tiiie, # Helpers para TIIE 28 días
-        ql.Actual360()) # Forma de conteo de días
+        actual360, # Forma de conteo de días
+        cotasBootstrap(curva_previa, perfil=perfil)) # Cotas y parámetros del solver
     
     crvTIIE28.enableExtrapolation() # Habilita la extrapolación de la curva
 
     return crvTIIE28
 
 
+@instrumentado('curva')
 def genFTIIE(tasas_ftiie, tenors_ftiie, curva_descuento,
              tasas_fut = [], tenors_fut = [],
-             fechas_banxico = [],  # Fechas de Banxico para los futuros FTIIE
-             tasas_banxico = []): # Tasas de Banxico para los futuros FTII
+             fechas_banxico = None,  # Fechas de Banxico para los futuros FTIIE
+             tasas_banxico = None, # Tasas de Banxico para los futuros FTII
+             cotizaciones = None,
+             curva_previa = None, # Curva del día anterior para acotar el bootstrapping
+             perfil = None): # Perfil de construcción (interpolación y solver)
     """
     Crea la curva de tasas FTIIE.
 
@@ -1157,10 +1332,17 @@ def genFTIIE(tasas_ftiie, tenors_ftiie, curva_descuento,
         Tenors FTIIE.
     curva_descuento : ql.YieldTermStructureHandle
         Curva de descuento a usar.
-    fechas_banxico : list
-        Fechas de Banxico para los futuros FTIIE.
-    tasas_banxico : list
+    fechas_banxico : list or None
+        Fechas de Banxico para los futuros FTIIE. Con None se usan los fixings
+        ya cargados en el índice (ver `fixings.py`).
+    tasas_banxico : list or None
         Tasas de Banxico para los futuros FTIIE.
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de los helpers (ver `cotizacion`).
+    curva_previa : ql.YieldTermStructure, optional
+        Curva ya ajustada de una fecha cercana; acota el bootstrapping (ver `cotasBootstrap`).
+    perfil : str or dict, optional
+        Perfil de construcción: interpolación y parámetros del solver (ver `perfilBootstrap`).
 
     Returns
     -------
@@ -1169,19 +1351,21 @@ def genFTIIE(tasas_ftiie, tenors_ftiie, curva_descuento,
     """
     # Cuando no hay futuros, se usan solo los swaps FTIIE
     if len(tasas_fut) == 0 or len(tenors_fut) == 0:
-        helpers_ftiie = FTIIESwapHelpers(tasas_ftiie, tenors_ftiie, curva_descuento) # Si no hay futuros, solo se usan los swaps FTIIE
+        helpers_ftiie = FTIIESwapHelpers(tasas_ftiie, tenors_ftiie, curva_descuento, cotizaciones) # Si no hay futuros, solo se usan los swaps FTIIE
     else:
         # Definición de los helpers para FTIIE
         helpers_ftiie = FTIIEHelpers(tasas_fut, tenors_fut,
                                     tasas_ftiie, tenors_ftiie,
-                                    curva_descuento, fechas_banxico, tasas_banxico)
+                                    curva_descuento, fechas_banxico, tasas_banxico,
+                                    cotizaciones)
 
     # Definición de la curva de tasas FTIIE
-    crvFTIIE = ql.PiecewiseNaturalLogCubicDiscount(
+    crvFTIIE = curvaPorTramos('FTIIE', perfil)(
         0, # Fecha de evaluación (hoy)
-        ql.Mexico(), # Calendario de México
+        calendario_mexico, # Calendario de México
         helpers_ftiie, # Helpers para FTIIE
-        ql.Actual360()) # Forma de conteo de días
+        actual360, # Forma de conteo de días
+        cotasBootstrap(curva_previa, perfil=perfil)) # Cotas y parámetros del solver
     
     crvFTIIE.enableExtrapolation() # Habilita la extrapolación de la curva
 
@@ -1189,18 +1373,117 @@ def genFTIIE(tasas_ftiie, tenors_ftiie, curva_descuento,
 
 
 # Ahora creamos las curvas de tasas TIIE 28 días y FTIIE
-crvTIIE28 = genTIIE28(tasas_tiie28, tenors_tiie28, crvDISCTIIE) # Curva de tasas TIIE 28 días
-df_nodos = pd.DataFrame(crvTIIE28.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
-df_nodos
+if __name__ == '__main__':
+    crvTIIE28 = genTIIE28(tasas_tiie28, tenors_tiie28, crvDISCTIIE) # Curva de tasas TIIE 28 días
+    df_nodos = pd.DataFrame(crvTIIE28.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
+    print(df_nodos)
 
 # %%
 # Ahora lo hacemos para FTIIE
-crvFTIIE = genFTIIE(tasas_ftiie, tenors_ftiie, crvDISCTIIE,
-                    precios_fut, tenors_futuros,
-                    fechas_banxico, tasas_banxico) # Curva de tasas FTIIE
-# DataFrame con los nodos de la curva de descuento de FTIIE
-df_nodos = pd.DataFrame(crvFTIIE.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
-df_nodos
+if __name__ == '__main__':
+    crvFTIIE = genFTIIE(tasas_ftiie, tenors_ftiie, crvDISCTIIE,
+                        precios_fut, tenors_futuros,
+                        fechas_banxico, tasas_banxico) # Curva de tasas FTIIE
+    # DataFrame con los nodos de la curva de descuento de FTIIE
+    df_nodos = pd.DataFrame(crvFTIIE.nodes()).rename(columns={0: 'Fecha', 1: 'Factor de Descuento'}) # DataFrame con los nodos de la curva de descuento de SOFR
+    print(df_nodos)
+
+# %% [markdown]
+# ### Cadena completa de curvas
+# Para construir las cuatro curvas de un día basta con reunir todos los insumos en un diccionario y seguir el mismo orden: SOFR → Descuento MXN → TIIE28 y FTIIE. La función `genCurvas` hace exactamente eso y es la que se usa para construir curvas de varios días (ver `historico.py`).
+
+# %%
+def genCurvas(insumos, cotizaciones=None, curvas_previas=None, perfil=None):
+    """
+    Crea las curvas SOFR, Descuento MXN, TIIE28 y FTIIE para la fecha de evaluación actual.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado del día. Las llaves son los nombres de los argumentos
+        de `genSOFR`, `genDISCTIIE`, `genTIIE28` y `genFTIIE` (ver `insumos_ejemplo`).
+        Las llaves de futuros FTIIE (`precios_fut`, `tenors_futuros`, `fechas_banxico`
+        y `tasas_banxico`) son opcionales; sin `fechas_banxico` los futuros usan los
+        fixings ya cargados en el índice (ver `fixings.py`).
+    cotizaciones : dict, optional
+        Si se da, se guardan las cotizaciones de todos los helpers (ver `cotizacion`).
+    curvas_previas : dict, optional
+        Curvas de una fecha cercana (o sus factores de descuento) con las mismas
+        llaves que el resultado; acotan el bootstrapping (ver `cotasBootstrap`).
+    perfil : str or dict, optional
+        Perfil de construcción: interpolación y parámetros del solver (ver `perfilBootstrap`).
+
+    Returns
+    -------
+    dict
+        Curvas con llaves 'SOFR', 'DISCTIIE', 'TIIE28' y 'FTIIE'.
+    """
+
+    previas = curvas_previas or {}
+
+    crvSOFR = genSOFR(
+        insumos['sofr_futures'],
+        insumos['tenors_fut_sofr'],
+        insumos['sofr_swaps'],
+        insumos['tenors_sofr'],
+        insumos['depo'],
+        insumos['tenor_depo'],
+        cotizaciones,
+        previas.get('SOFR'),
+        perfil=perfil)
+
+    crvDISCTIIE = genDISCTIIE(
+        insumos['t_mxn_usd_spot'],
+        insumos['tasas_fwd_fx'],
+        insumos['tenors_fwd_fx'],
+        insumos['tasas_xccy'],
+        insumos['tenors_xccy'],
+        insumos['tasas_ftiie'],
+        crvSOFR,
+        cotizaciones,
+        previas.get('DISCTIIE'),
+        perfil)
+
+    crvTIIE28 = genTIIE28(insumos['tasas_tiie28'], insumos['tenors_tiie28'], crvDISCTIIE,
+                          cotizaciones, previas.get('TIIE28'), perfil)
+
+    crvFTIIE = genFTIIE(
+        insumos['tasas_ftiie'],
+        insumos['tenors_ftiie'],
+        crvDISCTIIE,
+        insumos.get('precios_fut', []),
+        insumos.get('tenors_futuros', []),
+        insumos.get('fechas_banxico'),
+        insumos.get('tasas_banxico'),
+        cotizaciones,
+        previas.get('FTIIE'),
+        perfil)
+
+    return {'SOFR': crvSOFR, 'DISCTIIE': crvDISCTIIE, 'TIIE28': crvTIIE28, 'FTIIE': crvFTIIE}
+
+
+# Insumos del 19 de febrero de 2025 en el formato que recibe genCurvas
+insumos_ejemplo = {
+    'sofr_futures': sofr_futures,
+    'tenors_fut_sofr': tenors_fut_sofr,
+    'sofr_swaps': sofr_swaps,
+    'tenors_sofr': tenors_sofr,
+    'depo': depo,
+    'tenor_depo': tenor_depo,
+    't_mxn_usd_spot': t_mxn_usd_spot,
+    'tasas_fwd_fx': tasas_fwd_fx,
+    'tenors_fwd_fx': tenors_fwd_fx,
+    'tasas_xccy': tasas_xccy,
+    'tenors_xccy': tenors_xccy,
+    'tasas_tiie28': tasas_tiie28,
+    'tenors_tiie28': tenors_tiie28,
+    'tasas_ftiie': tasas_ftiie,
+    'tenors_ftiie': tenors_ftiie,
+    'precios_fut': precios_fut,
+    'tenors_futuros': tenors_futuros,
+    'fechas_banxico': fechas_banxico,
+    'tasas_banxico': tasas_banxico
+}
 
 
 # %% [markdown]
@@ -0,0 +1,341 @@
+"""
+Curvas "vivas": las cuatro curvas del día construidas sobre cotizaciones que se
+pueden actualizar.
+
+Cada helper de `curvas.py` lee su tasa de un `ql.SimpleQuote`. Aquí se guardan
+esos objetos, de modo que cuando se mueve una tasa par basta con cambiar el
+valor de su cotización: QuantLib marca como desactualizadas únicamente las
+curvas que dependen de ella y las vuelve a ajustar (una sola pasada del
+bootstrapping) la próxima vez que se consultan.
+
+Cada instrumento se identifica con una llave (grupo, tenor), por ejemplo
+('FTIIE', 130) para el swap de FTIIE a 130 periodos de 28 días.
+
+Las mismas curvas sirven para varias fechas (`moverA`): se cambia la fecha de
+evaluación y las cotizaciones, y QuantLib usa los factores de descuento de la
+última curva ajustada como punto inicial del bootstrapping de cada nodo, lo que
+ahorra iteraciones cuando las curvas se mueven poco de un día a otro.
+
+Como las curvas se mueven con la fecha de evaluación global, `CurvasVivas` la
+deja fija al construirse y en `moverA` (no la regresa como
+`convenciones.fechaEvaluacion`), pero la cambia con el candado
+`convenciones.candado_fecha`, así que no pisa un bloque `fechaEvaluacion` de
+otro hilo.
+
+Un fixing nuevo de Banxico (`agregarFixing`) se agrega solo al índice de los
+futuros FTIIE; QuantLib avisa al futuro del mes del fixing y únicamente la
+curva FTIIE se vuelve a ajustar.
+"""
+
+import QuantLib as ql
+
+from convenciones import agregarFixing, candado_fecha, cargarFixings, fechaFixing, fechaQL
+from curvas import genCurvas
+
+
+# Para cada grupo: llaves de `insumos` con las tasas y los tenors, y el factor
+# con el que se pasa la cotización de mercado a la que usa el helper
+grupos = {
+    'SOFR_FUT': ('sofr_futures', 'tenors_fut_sofr', 1),
+    'SOFR_DEPO': ('depo', 'tenor_depo', 1/100),
+    'SOFR': ('sofr_swaps', 'tenors_sofr', 1/100),
+    'FX': ('tasas_fwd_fx', 'tenors_fwd_fx', 1/10000),
+    'XCCY': ('tasas_xccy', 'tenors_xccy', 1/100),
+    'TIIE28': ('tasas_tiie28', 'tenors_tiie28', 1/100),
+    'FTIIE_FUT': ('precios_fut', 'tenors_futuros', 1),
+    'FTIIE': ('tasas_ftiie', 'tenors_ftiie', 1/100),
+}
+
+# Curva que se ajusta directamente con cada grupo
+curva_por_grupo = {
+    'SOFR_FUT': 'SOFR',
+    'SOFR_DEPO': 'SOFR',
+    'SOFR': 'SOFR',
+    'FX': 'DISCTIIE',
+    'XCCY': 'DISCTIIE',
+    'TIIE28': 'TIIE28',
+    'FTIIE_FUT': 'FTIIE',
+    'FTIIE': 'FTIIE',
+}
+
+# Meses de los tenors de los futuros FTIIE ('Feb2025')
+meses_futuros = ('Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic')
+
+# Curvas que se usan para construir cada curva
+dependencias = {
+    'SOFR': [],
+    'DISCTIIE': ['SOFR'],
+    'TIIE28': ['DISCTIIE'],
+    'FTIIE': ['DISCTIIE'],
+}
+
+
+def clavesInsumos(insumos):
+    """
+    Regresa las cotizaciones de mercado de `insumos` por llave (grupo, tenor).
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado en el formato de `curvas.genCurvas`.
+
+    Returns
+    -------
+    dict
+        {(grupo, tenor): valor} en el orden de construcción de las curvas.
+    """
+
+    valores = {}
+    for grupo, (llave_tasas, llave_tenors, _) in grupos.items():
+        tasas = insumos.get(llave_tasas, [])
+        tenors = insumos.get(llave_tenors, [])
+        if grupo == 'SOFR_DEPO': # El depósito es un solo valor
+            tasas, tenors = [tasas], [tenors]
+        if grupo == 'FX':
+            valores[('FX', 'SPOT')] = insumos['t_mxn_usd_spot']
+        for r, t in zip(tasas, tenors):
+            valores[(grupo, t)] = r
+    return valores
+
+
+def insumosDeValores(insumos, valores):
+    """
+    Regresa una copia de `insumos` con las cotizaciones de `valores`.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado base (ver `curvas.genCurvas`).
+    valores : dict
+        {(grupo, tenor): valor} con las cotizaciones a reemplazar.
+
+    Returns
+    -------
+    dict
+        Insumos con los valores actualizados.
+    """
+
+    nuevos = dict(insumos)
+    for (grupo, tenor), valor in valores.items():
+        if grupo not in grupos:
+            raise KeyError(f'Grupo desconocido: {grupo}')
+        llave_tasas, llave_tenors, _ = grupos[grupo]
+        if (grupo, tenor) == ('FX', 'SPOT'):
+            nuevos['t_mxn_usd_spot'] = valor
+        elif grupo == 'SOFR_DEPO':
+            nuevos['depo'] = valor
+        else:
+            tasas = list(nuevos[llave_tasas])
+            tasas[list(nuevos[llave_tenors]).index(tenor)] = valor
+            nuevos[llave_tasas] = tasas
+    return nuevos
+
+
+class CurvasVivas:
+    """
+    Curvas SOFR, Descuento MXN, TIIE28 y FTIIE con cotizaciones actualizables.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado en el formato de `curvas.genCurvas`.
+    fecha : date or ql.Date, optional
+        Fecha de evaluación. Por defecto se usa la fecha de evaluación actual.
+    curvas_previas : dict, optional
+        Curvas de una fecha cercana o sus factores de descuento, para acotar el
+        bootstrapping (ver `curvas.genCurvas`).
+
+    Examples
+    --------
+    >>> vivas = CurvasVivas(insumos_ejemplo)
+    >>> vivas.actualizar('FTIIE', 130, 8.90)   # Swap FTIIE 130L a 8.90%
+    >>> vivas['FTIIE'].nodes()                 # Solo se reajusta la curva FTIIE
+    """
+
+    def __init__(self, insumos, fecha=None, curvas_previas=None):
+
+        with candado_fecha:
+            if fecha is not None:
+                ql.Settings.instance().evaluationDate = fechaQL(fecha)
+
+            self.insumos_base = insumos
+            self.cotizaciones = {} # {(grupo, tenor): ql.SimpleQuote}
+            self.curvas = genCurvas(insumos, self.cotizaciones, curvas_previas)
+        self.valores = clavesInsumos(insumos) # Cotizaciones de mercado actuales
+
+        # Los helpers de XCCY usan como cotización la tasa FTIIE de la misma
+        # posición y el basis como spread fijo. Un cambio en el basis equivale a
+        # mover la cotización del helper, pues el spread es aditivo en la pata
+        # flotante y ambas patas tienen el mismo calendario y conteo de días.
+        self._basis_inicial = {t: b for t, b in zip(insumos['tenors_xccy'], insumos['tasas_xccy'])}
+        self._xccy_por_ftiie = {('FTIIE', t_f): t_x for t_f, t_x
+                                in zip(insumos['tenors_ftiie'], insumos['tenors_xccy'])}
+        self._ftiie_por_xccy = {t_x: ('FTIIE', t_f) for (_, t_f), t_x in self._xccy_por_ftiie.items()}
+
+    def __getitem__(self, nombre):
+        return self.curvas[nombre]
+
+    def claves(self):
+        """ Llaves (grupo, tenor) de todas las cotizaciones, en orden de construcción. """
+        return list(self.valores)
+
+    def clavesCurva(self, nombre):
+        """ Llaves de las cotizaciones de las que depende una curva, incluidas las de sus curvas base. """
+
+        curvas_base = {nombre}
+        pendientes = [nombre]
+        while pendientes:
+            for base in dependencias[pendientes.pop()]:
+                curvas_base.add(base)
+                pendientes.append(base)
+
+        claves = []
+        for clave in self.valores:
+            grupo = clave[0]
+            if curva_por_grupo[grupo] in curvas_base:
+                claves.append(clave)
+            elif clave in self._xccy_por_ftiie and 'DISCTIIE' in curvas_base:
+                claves.append(clave) # Tasas FTIIE que entran a los helpers de XCCY
+        return claves
+
+    def valor(self, grupo, tenor):
+        """ Cotización de mercado actual de un instrumento. """
+        return self.valores[(grupo, tenor)]
+
+    def actualizar(self, grupo, tenor, valor):
+        """
+        Cambia la cotización de mercado de un instrumento.
+
+        Las curvas afectadas se vuelven a ajustar hasta que se consultan.
+
+        Parameters
+        ----------
+        grupo : str
+            Grupo del instrumento (ver `grupos`).
+        tenor : int or str
+            Tenor del instrumento, como aparece en los insumos.
+        valor : float
+            Nueva cotización, en las mismas unidades que los insumos.
+        """
+
+        clave = (grupo, tenor)
+        if clave not in self.valores:
+            raise KeyError(f'No existe la cotización {clave}')
+        self.valores[clave] = valor
+
+        if grupo == 'XCCY':
+            self._actualizarXCCY(tenor)
+            return
+
+        factor = 1 if clave == ('FX', 'SPOT') else grupos[grupo][2]
+        self.cotizaciones[clave].setValue(valor*factor)
+
+        if clave in self._xccy_por_ftiie: # La tasa FTIIE también entra al helper de XCCY
+            self._actualizarXCCY(self._xccy_por_ftiie[clave])
+
+    def actualizarVarios(self, cambios):
+        """
+        Cambia varias cotizaciones a la vez.
+
+        Parameters
+        ----------
+        cambios : dict
+            {(grupo, tenor): valor}.
+        """
+
+        for (grupo, tenor), valor in cambios.items():
+            self.actualizar(grupo, tenor, valor)
+
+    def _actualizarXCCY(self, tenor):
+        """ Recalcula la cotización del helper de XCCY de un tenor. """
+
+        tasa_ftiie = self.valores[self._ftiie_por_xccy[tenor]]
+        basis = self.valores[('XCCY', tenor)]
+        self.cotizaciones[('XCCY', tenor)].setValue(
+            (tasa_ftiie + basis - self._basis_inicial[tenor])/100)
+
+    def compatible(self, insumos):
+        """ Indica si `insumos` tiene los mismos instrumentos, de modo que se puede usar `moverA`. """
+
+        return (list(clavesInsumos(insumos)) == self.claves()
+                and list(insumos['tenors_xccy']) == list(self.insumos_base['tenors_xccy'])
+                and list(insumos['tenors_ftiie']) == list(self.insumos_base['tenors_ftiie']))
+
+    def moverA(self, fecha, insumos):
+        """
+        Mueve las curvas a otra fecha con sus insumos, sin volver a crear los helpers.
+
+        El siguiente bootstrapping parte de los nodos de la última curva ajustada.
+
+        Parameters
+        ----------
+        fecha : date or ql.Date
+            Nueva fecha de evaluación.
+        insumos : dict
+            Insumos de la fecha, con los mismos instrumentos (ver `compatible`).
+        """
+
+        if not self.compatible(insumos):
+            raise ValueError('Los insumos no tienen los mismos instrumentos que las curvas')
+
+        with candado_fecha:
+            ql.Settings.instance().evaluationDate = fechaQL(fecha)
+            if insumos.get('fechas_banxico') is not None:
+                cargarFixings('FUT_FTIIE', insumos['fechas_banxico'], insumos['tasas_banxico'])
+
+            self.insumos_base = insumos
+            self.actualizarVarios({clave: valor for clave, valor in clavesInsumos(insumos).items()
+                                   if valor != self.valores[clave]})
+
+    def agregarFixing(self, fecha, tasa):
+        """
+        Agrega un fixing de la TIIE de Fondeo publicado por Banxico durante el día.
+
+        Solo se agrega ese fixing al índice de los futuros (`convenciones.agregarFixing`),
+        sin recargar los demás ni volver a crear los helpers: QuantLib avisa al futuro
+        del mes del fixing, cuya parte ya devengada cambia, y solo la curva FTIIE queda
+        por reajustar. Como la curva FTIIE es un spline cúbico global, el reajuste
+        recorre todos sus nodos, pero parte de los factores de descuento actuales.
+
+        Parameters
+        ----------
+        fecha : date, str or ql.Date
+            Fecha del fixing ('dd/mm/aaaa' si es texto); no puede ser posterior a
+            la fecha de evaluación.
+        tasa : float
+            Tasa en %.
+
+        Returns
+        -------
+        list
+            Tenors de los futuros afectados (los del mes del fixing).
+        """
+
+        fecha_ql = fechaFixing(fecha)
+        if fecha_ql > ql.Settings.instance().evaluationDate:
+            raise ValueError(f'El fixing del {fecha_ql.ISO()} es posterior a la fecha de evaluación')
+        if not agregarFixing('FUT_FTIIE', fecha_ql, tasa):
+            return []
+
+        # Los insumos guardan la serie de Banxico para `insumos()` y para `moverA`
+        if self.insumos_base.get('fechas_banxico') is not None:
+            texto = fecha_ql.to_date().strftime('%d/%m/%Y')
+            fechas = list(self.insumos_base['fechas_banxico'])
+            tasas = list(self.insumos_base['tasas_banxico'])
+            if texto in fechas:
+                tasas[fechas.index(texto)] = tasa
+            else:
+                fechas.append(texto)
+                tasas.append(tasa)
+            self.insumos_base = {**self.insumos_base, 'fechas_banxico': fechas, 'tasas_banxico': tasas}
+
+        mes = f'{meses_futuros[fecha_ql.month() - 1]}{fecha_ql.year()}'
+        return [t for t in self.insumos_base.get('tenors_futuros', []) if t == mes]
+
+    def insumos(self):
+        """ Insumos de mercado con las cotizaciones actuales (ver `curvas.genCurvas`). """
+        return insumosDeValores(self.insumos_base, self.valores)
+
+    def nodos(self, nombre):
+        """ Nodos (fecha, factor de descuento) de una curva; la ajusta si hace falta. """
+        return list(self.curvas[nombre].nodes())
@@ -0,0 +1,199 @@
+"""
+Curvas de muchos escenarios de mercado (VaR histórico o Monte Carlo).
+
+Cada escenario es un vector con todas las cotizaciones de entrada, en el orden
+de `curvas_vivas.clavesInsumos`. Para cada uno se ajusta la cadena
+SOFR -> Descuento MXN -> TIIE28/FTIIE y se evalúan los factores de descuento de
+las cuatro curvas en una malla de plazos. El resultado es un arreglo de forma
+(escenarios x curvas x plazos).
+
+Los escenarios se reparten en bloques entre procesos. Cada proceso construye
+las curvas una sola vez (`CurvasVivas`) y para cada escenario solo cambia las
+cotizaciones, así que el bootstrapping parte de las curvas del escenario
+anterior. Los escenarios de entrada y los factores de salida viven en memoria
+compartida (`multiprocessing.shared_memory`), de modo que no se serializan
+entre procesos.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from consulta import CurvaVectorizada
+from convenciones import fechaEvaluacion, fechaQL
+from curvas_vivas import CurvasVivas, clavesInsumos
+
+
+nombres_curvas = ('SOFR', 'DISCTIIE', 'TIIE28', 'FTIIE') # Orden del segundo eje del resultado
+
+malla_mensual = np.arange(1, 361)*30/360 # 30 años en pasos de 30 días (años Actual/360)
+
+
+def matrizEscenarios(insumos, choques):
+    """
+    Escenarios a partir de choques sobre los insumos base.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado base (ver `curvas.genCurvas`).
+    choques : pd.DataFrame
+        Un renglón por escenario y columnas (grupo, tenor) con el cambio de cada
+        cotización en las unidades de los insumos. Las cotizaciones que no
+        aparecen no se mueven.
+
+    Returns
+    -------
+    np.ndarray
+        Cotizaciones de cada escenario (escenarios x cotizaciones).
+    """
+
+    base = clavesInsumos(insumos)
+    desconocidas = [c for c in choques.columns if c not in base]
+    if desconocidas:
+        raise KeyError(f'Cotizaciones desconocidas: {desconocidas}')
+
+    escenarios = np.tile(np.array(list(base.values()), dtype=float), (len(choques), 1))
+    posicion = {clave: i for i, clave in enumerate(base)}
+    columnas = [posicion[c] for c in choques.columns]
+    escenarios[:, columnas] += choques.to_numpy(dtype=float)
+    return escenarios
+
+
+# Estado de cada proceso: curvas vivas, llaves, malla y memoria compartida
+_estado = {}
+
+
+def _iniciarProceso(fecha, insumos, malla, entrada, salida):
+    """ Construye las curvas y se conecta a la memoria compartida, una vez por proceso. """
+
+    ql.Settings.instance().evaluationDate = fechaQL(fecha)
+    vivas = CurvasVivas(insumos)
+
+    (nombre_entrada, forma_entrada), (nombre_salida, forma_salida) = entrada, salida
+    mem_entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    mem_salida = shared_memory.SharedMemory(name=nombre_salida)
+    _estado.update(
+        vivas=vivas, claves=vivas.claves(), malla=malla,
+        memorias=(mem_entrada, mem_salida), # Se guardan para que no se cierren
+        escenarios=np.ndarray(forma_entrada, dtype=float, buffer=mem_entrada.buf),
+        factores=np.ndarray(forma_salida, dtype=float, buffer=mem_salida.buf))
+
+
+def _cerrarProceso():
+    """ Suelta la memoria compartida del proceso actual. """
+
+    _estado.pop('escenarios', None)
+    _estado.pop('factores', None)
+    for memoria in _estado.pop('memorias', ()):
+        memoria.close()
+    _estado.clear()
+
+
+def _iniciarTrabajador(*argumentos):
+    """ `_iniciarProceso` para los procesos del pool, que sueltan la memoria compartida al terminar. """
+
+    _iniciarProceso(*argumentos)
+    # Los procesos de `multiprocessing` terminan con `os._exit`, que no corre los
+    # `atexit`; sus finalizadores con prioridad sí se corren al salir
+    util.Finalize(None, _cerrarProceso, exitpriority=0)
+
+
+def _bloque(inicio, fin):
+    """ Ajusta los escenarios [inicio, fin) y escribe sus factores de descuento. Regresa los que fallaron. """
+
+    vivas, claves, malla = _estado['vivas'], _estado['claves'], _estado['malla']
+    escenarios, factores = _estado['escenarios'], _estado['factores']
+    fallidos = []
+    for s in range(inicio, fin):
+        vivas.actualizarVarios(dict(zip(claves, escenarios[s].tolist())))
+        try:
+            for j, nombre in enumerate(nombres_curvas):
+                factores[s, j] = CurvaVectorizada.desdeQL(vivas[nombre]).descuento(malla)
+        except RuntimeError: # El bootstrapping no convergió
+            factores[s] = np.nan
+            fallidos.append(s)
+    return fallidos
+
+
+def genEscenarios(insumos, escenarios, fecha=None, malla=None, n_procesos=None, tam_bloque=None):
+    """
+    Factores de descuento de las cuatro curvas en cada escenario.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado base (ver `curvas.genCurvas`); definen los instrumentos.
+    escenarios : np.ndarray or pd.DataFrame
+        Cotizaciones de cada escenario (escenarios x cotizaciones) en el orden de
+        `clavesInsumos(insumos)`, o un DataFrame con esas llaves como columnas
+        (ver `matrizEscenarios`).
+    fecha : date, optional
+        Fecha de evaluación. Por defecto la fecha de evaluación actual.
+    malla : array, optional
+        Plazos en años (Actual/360) o fechas en los que se evalúan las curvas.
+        Por defecto `malla_mensual`.
+    n_procesos : int, optional
+        Número de procesos. Por defecto el número de núcleos. Con 1 se calcula
+        en el proceso actual.
+    tam_bloque : int, optional
+        Escenarios por bloque. Por defecto unos cuatro bloques por proceso.
+
+    Returns
+    -------
+    np.ndarray
+        Factores de descuento (escenarios x curvas x plazos), con las curvas en el
+        orden de `nombres_curvas`. Los escenarios que no convergen quedan en NaN.
+    """
+
+    fecha = ql.Settings.instance().evaluationDate.to_date() if fecha is None else pd.Timestamp(fecha).date()
+    malla = malla_mensual if malla is None else malla
+
+    claves = list(clavesInsumos(insumos))
+    if isinstance(escenarios, pd.DataFrame):
+        escenarios = escenarios[claves].to_numpy(dtype=float)
+    escenarios = np.ascontiguousarray(escenarios, dtype=float)
+    if escenarios.ndim != 2 or escenarios.shape[1] != len(claves):
+        raise ValueError(f'Los escenarios deben tener forma (n, {len(claves)})')
+
+    n = len(escenarios)
+    forma_salida = (n, len(nombres_curvas), len(malla))
+    mem_entrada = shared_memory.SharedMemory(create=True, size=max(escenarios.nbytes, 1))
+    mem_salida = shared_memory.SharedMemory(create=True, size=max(8*int(np.prod(forma_salida)), 1))
+    try:
+        np.ndarray(escenarios.shape, dtype=float, buffer=mem_entrada.buf)[:] = escenarios
+        argumentos = (fecha, insumos, malla, (mem_entrada.name, escenarios.shape),
+                      (mem_salida.name, forma_salida))
+
+        n_procesos = n_procesos or os.cpu_count() or 1
+        if n_procesos == 1 or n <= 1:
+            with fechaEvaluacion(): # Se regresa a la fecha de evaluación actual al terminar
+                _iniciarProceso(*argumentos)
+                try:
+                    fallidos = _bloque(0, n)
+                finally:
+                    _cerrarProceso()
+        else:
+            tam_bloque = tam_bloque or max(1, -(-n // (4*n_procesos)))
+            inicios = range(0, n, tam_bloque)
+            pool = ProcessPoolExecutor(max_workers=min(n_procesos, len(inicios)),
+                                       initializer=_iniciarTrabajador, initargs=argumentos)
+            with pool:
+                resultados = pool.map(_bloque, inicios, [min(i + tam_bloque, n) for i in inicios])
+                fallidos = [s for bloque in resultados for s in bloque]
+
+        factores = np.ndarray(forma_salida, dtype=float, buffer=mem_salida.buf).copy()
+    finally:
+        mem_entrada.close()
+        mem_entrada.unlink()
+        mem_salida.close()
+        mem_salida.unlink()
+
+    if fallidos:
+        warnings.warn(f'{len(fallidos)} escenarios no convergieron y quedan en NaN')
+    return factores
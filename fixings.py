@@ -0,0 +1,207 @@
+"""
+Almacén en disco de las tasas diarias de fondeo publicadas por Banxico
+(fixings de la TIIE de Fondeo) que usan los futuros FTIIE.
+
+Los fixings se guardan en un archivo binario de solo agregar, con un registro
+de tamaño fijo por día (fecha como días desde 1970-01-01 y tasa en %). El
+archivo se lee con `np.memmap`, así que leer un rango de fechas es una
+búsqueda binaria sobre la columna de fechas sin cargar todo el histórico.
+
+QuantLib guarda los fixings de forma global por nombre de índice, de modo que
+basta con cargarlos una vez en el índice "FUT_FTIIE" (`cargarEnIndice`); después
+las curvas se construyen sin `fechas_banxico` y todas comparten esos fixings:
+
+>>> almacen = AlmacenFixings('fixings_ftiie.bin')
+>>> almacen.importar(fechas_banxico, tasas_banxico)   # Formato dd/mm/aaaa y %
+>>> almacen.cargarEnIndice()
+>>> genFTIIE(tasas_ftiie, tenors_ftiie, crvDISCTIIE, precios_fut, tenors_futuros)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from convenciones import indice, olvidarFixings, versionFixings
+
+
+# Un registro por día: fecha (días desde 1970-01-01) y tasa en %
+registro = np.dtype([('fecha', '<i4'), ('tasa', '<f8')])
+
+indice_futuros = 'FUT_FTIIE' # Nombre del índice de `curvas.FTIIEFutureshelpers`
+
+
+def _dias(fechas):
+    """ Días desde 1970-01-01 de un arreglo de fechas. """
+    return pd.to_datetime(pd.Series(fechas)).to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+class AlmacenFixings:
+    """
+    Fixings diarios de la TIIE de Fondeo guardados en un archivo binario.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo del almacén. Se crea vacío si no existe.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        if not os.path.exists(ruta):
+            open(ruta, 'wb').close()
+        self._cargados = None # Última fecha cargada al índice de QuantLib
+        self._version = None # `convenciones.versionFixings` después de la última carga
+
+    def __len__(self):
+        return os.path.getsize(self.ruta) // registro.itemsize
+
+    def _registros(self):
+        """ Registros del archivo (memoria mapeada, solo lectura). """
+
+        if len(self) == 0:
+            return np.empty(0, dtype=registro)
+        return np.memmap(self.ruta, dtype=registro, mode='r', shape=(len(self),))
+
+    def ultimaFecha(self):
+        """ Última fecha guardada, o None si el almacén está vacío. """
+
+        registros = self._registros()
+        if len(registros) == 0:
+            return None
+        return np.datetime64(int(registros['fecha'][-1]), 'D').astype(object)
+
+    def leer(self, desde=None, hasta=None):
+        """
+        Fixings entre dos fechas (ambas incluidas).
+
+        Parameters
+        ----------
+        desde, hasta : date, optional
+            Límites del rango. Por defecto todo el histórico.
+
+        Returns
+        -------
+        pd.Series
+            Tasas en % indexadas por fecha.
+        """
+
+        registros = self._registros()
+        fechas = registros['fecha']
+        i = 0 if desde is None else np.searchsorted(fechas, _dias([desde])[0], side='left')
+        j = len(fechas) if hasta is None else np.searchsorted(fechas, _dias([hasta])[0], side='right')
+
+        tramo = np.array(registros[i:j]) # Copia, para no dejar el archivo abierto
+        return pd.Series(tramo['tasa'], index=pd.DatetimeIndex(tramo['fecha'].astype('datetime64[D]'), name='Fecha'),
+                         name='Tasa')
+
+    def agregar(self, fechas, tasas):
+        """
+        Agrega fixings al final del almacén.
+
+        Parameters
+        ----------
+        fechas : list
+            Fechas nuevas, en orden y posteriores a la última guardada.
+        tasas : list
+            Tasas en %.
+        """
+
+        dias = _dias(fechas)
+        tasas = np.asarray(tasas, dtype=float)
+        if len(dias) != len(tasas):
+            raise ValueError('Las fechas y las tasas deben tener la misma longitud')
+        if len(dias) == 0:
+            return
+
+        registros = self._registros()
+        anterior = registros['fecha'][-1] if len(registros) else np.iinfo(np.int32).min
+        if np.any(np.diff(dias) <= 0) or dias[0] <= anterior:
+            raise ValueError('Las fechas deben ser crecientes y posteriores a la última fecha guardada')
+
+        nuevos = np.empty(len(dias), dtype=registro)
+        nuevos['fecha'] = dias
+        nuevos['tasa'] = tasas
+        with open(self.ruta, 'ab') as archivo:
+            archivo.write(nuevos.tobytes())
+
+    def importar(self, fechas_banxico, tasas_banxico):
+        """
+        Agrega fixings en el formato de los insumos (fechas 'dd/mm/aaaa' y tasas en %).
+
+        Solo se agregan las fechas posteriores a la última guardada, de modo que se
+        puede importar varias veces la misma serie de Banxico.
+        """
+
+        fechas = pd.to_datetime(pd.Series(fechas_banxico), format='%d/%m/%Y')
+        orden = np.argsort(fechas.to_numpy(), kind='stable')
+        fechas = fechas.iloc[orden]
+        tasas = np.asarray(tasas_banxico, dtype=float)[orden]
+
+        ultima = self.ultimaFecha()
+        if ultima is not None:
+            nuevas = (fechas > pd.Timestamp(ultima)).to_numpy()
+            fechas, tasas = fechas[nuevas], tasas[nuevas]
+        self.agregar(fechas, tasas)
+
+    def cargarEnIndice(self, hasta=None, nombre=indice_futuros):
+        """
+        Carga los fixings al índice de QuantLib que usan los futuros FTIIE.
+
+        Solo se agregan los fixings que no se han cargado antes, así que llamarlo
+        de nuevo después de `agregar` es una actualización incremental. Los
+        fixings quedan en el `IndexManager` de QuantLib, compartidos por todas las
+        curvas del proceso.
+
+        Parameters
+        ----------
+        hasta : date, optional
+            Última fecha a cargar. Conviene usar la fecha de evaluación cuando se
+            construyen curvas de fechas pasadas, pues QuantLib usa el fixing de la
+            propia fecha de evaluación si existe.
+        nombre : str
+            Nombre del índice.
+        """
+
+        desde = None if self._cargados is None else self._cargados + pd.Timedelta(days=1)
+        fixings = self.leer(desde, hasta)
+        if len(fixings) == 0:
+            return
+
+        olvidarFixings(nombre)
+        indice(nombre).addFixings([ql.Date(int(d.day), int(d.month), int(d.year)) for d in fixings.index],
+                          list(fixings.to_numpy()/100), True)
+        self._cargados = fixings.index[-1]
+        self._version = versionFixings(nombre)
+
+    def cargarAntesDe(self, fecha, nombre=indice_futuros):
+        """
+        Deja en el índice solo los fixings anteriores a `fecha` (la fecha de evaluación).
+
+        Banxico publica el fixing de un día hasta el día hábil siguiente, así que al
+        construir curvas de una fecha pasada no debe estar en el índice el de la
+        propia fecha, que QuantLib usaría en lugar de proyectarlo. Si las fechas
+        avanzan la carga es incremental; si retroceden, o si los fixings del índice
+        cambiaron por otro camino (p. ej. insumos con `fechas_banxico`), se limpia el
+        índice y se vuelve a cargar.
+
+        Parameters
+        ----------
+        fecha : date
+            Fecha de evaluación.
+        nombre : str
+            Nombre del índice.
+        """
+
+        hasta = pd.Timestamp(fecha) - pd.Timedelta(days=1)
+        if self._cargados is not None and (self._cargados > hasta or versionFixings(nombre) != self._version):
+            self.limpiarIndice(nombre)
+        self.cargarEnIndice(hasta, nombre)
+
+    def limpiarIndice(self, nombre=indice_futuros):
+        """ Quita del índice de QuantLib todos los fixings. """
+
+        olvidarFixings(nombre)
+        indice(nombre).clearFixings()
+        self._cargados = None
@@ -0,0 +1,225 @@
+"""
+Flujo de cotizaciones en tiempo real que se convierten en fotografías de curvas.
+
+`FlujoCurvas` recibe actualizaciones de cotizaciones (ticks) de una fuente
+asíncrona, las junta durante una ventana de tiempo (si un instrumento cambia
+varias veces solo cuenta el último valor), las aplica a un `CurvasVivas` y
+vuelve a ajustar únicamente las curvas afectadas. Cada lote produce una
+`Fotografia` inmutable y numerada que se manda a los suscriptores.
+
+Un tick es un diccionario con 'grupo', 'tenor' y 'valor' en las unidades de
+los insumos (ver `curvas_vivas.grupos`), por ejemplo:
+
+    {'grupo': 'FTIIE', 'tenor': 130, 'valor': 8.90}
+    {'grupo': 'FX', 'tenor': 'SPOT', 'valor': 20.51}
+
+`fuenteArchivo` reproduce ticks guardados en un archivo de líneas JSON, para
+probar el flujo sin conexión:
+
+>>> flujo = FlujoCurvas(insumos_ejemplo, fecha_ejemplo, ventana=0.05)
+>>> flujo.suscribir(lambda foto: print(foto.version, sorted(foto.actualizadas)))
+>>> asyncio.run(flujo.correr(fuenteArchivo('ticks.jsonl')))
+
+El trabajo de QuantLib (construir y ajustar curvas) se hace en un solo hilo
+aparte, de modo que el ciclo de eventos sigue recibiendo ticks mientras se
+ajustan las curvas; esos ticks forman el siguiente lote.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+import warnings
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import numpy as np
+
+from consulta import CurvaVectorizada
+from curvas_vivas import CurvasVivas
+
+
+# Fotografía inmutable del juego de curvas:
+# - version: número consecutivo de la fotografía.
+# - fecha: fecha de evaluación (ISO).
+# - creada: momento de creación (segundos, `time.time()`).
+# - curvas: {curva: consulta.CurvaVectorizada} de solo lectura.
+# - nodos: {curva: ((fecha ISO, factor de descuento), ...)}.
+# - valores: {(grupo, tenor): cotización} usadas.
+# - actualizadas: curvas que se volvieron a ajustar en este lote.
+Fotografia = namedtuple('Fotografia', ['version', 'fecha', 'creada', 'curvas', 'nodos', 'valores', 'actualizadas'])
+
+
+def _congelar(curva):
+    """ Marca como de solo lectura los arreglos de una `CurvaVectorizada`. """
+
+    for valor in vars(curva).values():
+        if isinstance(valor, np.ndarray):
+            valor.setflags(write=False)
+    return curva
+
+
+async def fuenteArchivo(ruta, velocidad=None):
+    """
+    Reproduce ticks guardados en un archivo de líneas JSON.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo con un tick por línea. Además de 'grupo', 'tenor' y 'valor', cada
+        línea puede tener 't' (segundos desde el inicio de la grabación).
+    velocidad : float, optional
+        Si se da, se respetan los tiempos 't' divididos entre `velocidad`
+        (1 = tiempo real). Por defecto los ticks se mandan lo más rápido posible.
+    """
+
+    inicio = time.monotonic()
+    with open(ruta) as archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            tick = json.loads(linea)
+            if velocidad and 't' in tick:
+                espera = inicio + tick['t']/velocidad - time.monotonic()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            else:
+                await asyncio.sleep(0) # Deja correr a las demás tareas
+            yield tick
+
+
+class FlujoCurvas:
+    """
+    Curvas que se actualizan con ticks y se publican como fotografías.
+
+    Parameters
+    ----------
+    insumos : dict
+        Insumos de mercado iniciales (ver `curvas.genCurvas`).
+    fecha : ql.Date, optional
+        Fecha de evaluación. Por defecto la fecha de evaluación actual.
+    ventana : float
+        Segundos que se esperan después del primer tick de un lote para juntar
+        los que llegan en ráfaga.
+    """
+
+    def __init__(self, insumos, fecha=None, ventana=0.05):
+        self.ventana = ventana
+        self._quantlib = ThreadPoolExecutor(max_workers=1) # Todo QuantLib corre en este hilo
+        self._insumos, self._fecha = insumos, fecha
+        self.vivas = None
+        self.ultima = None # Última fotografía publicada
+        self._suscriptores = []
+        self._pendientes = {} # {(grupo, tenor): valor} del lote en formación
+        self._hay_pendientes = None
+
+    def suscribir(self, suscriptor):
+        """ Agrega una función (normal o `async`) que recibe cada `Fotografia`. """
+        self._suscriptores.append(suscriptor)
+
+    def _fotografia(self, actualizadas):
+        """ Congela los nodos de las curvas; reutiliza las que no cambiaron. """
+
+        anterior = self.ultima
+        curvas, nodos = {}, {}
+        for nombre in self.vivas.curvas:
+            if anterior is not None and nombre not in actualizadas:
+                curvas[nombre], nodos[nombre] = anterior.curvas[nombre], anterior.nodos[nombre]
+                continue
+            curva = self.vivas[nombre]
+            nodos[nombre] = tuple((d.ISO(), fd) for d, fd in self.vivas.nodos(nombre))
+            curvas[nombre] = _congelar(CurvaVectorizada.desdeQL(curva))
+
+        return Fotografia(
+            version=0 if anterior is None else anterior.version + 1,
+            fecha=self.vivas['DISCTIIE'].referenceDate().ISO(),
+            creada=time.time(),
+            curvas=MappingProxyType(curvas),
+            nodos=MappingProxyType(nodos),
+            valores=MappingProxyType(dict(self.vivas.valores)),
+            actualizadas=frozenset(actualizadas))
+
+    def _iniciar(self):
+        self.vivas = CurvasVivas(self._insumos, self._fecha)
+        return self._fotografia(set(self.vivas.curvas))
+
+    def _aplicar(self, cambios):
+        """ Aplica un lote de cambios y regresa la nueva fotografía (o None si no converge). """
+
+        vivas = self.vivas
+        cambios = {clave: valor for clave, valor in cambios.items() if vivas.valores[clave] != valor}
+        if not cambios:
+            return None
+        afectadas = {nombre for nombre in vivas.curvas
+                     if any(clave in cambios for clave in vivas.clavesCurva(nombre))}
+
+        anteriores = {clave: vivas.valores[clave] for clave in cambios}
+        vivas.actualizarVarios(cambios)
+        try:
+            return self._fotografia(afectadas)
+        except RuntimeError as error: # El bootstrapping no convergió: se regresa al estado anterior
+            vivas.actualizarVarios(anteriores)
+            warnings.warn(f'Se descarta un lote de {len(cambios)} cotizaciones: {error}')
+            return None
+
+    async def _publicar(self, fotografia):
+        self.ultima = fotografia
+        for suscriptor in list(self._suscriptores):
+            resultado = suscriptor(fotografia)
+            if inspect.isawaitable(resultado):
+                await resultado
+
+    async def _leer(self, fuente):
+        """ Guarda los ticks de la fuente como cambios pendientes. """
+
+        async for tick in fuente:
+            clave = (tick['grupo'], tick['tenor'])
+            if clave not in self.vivas.valores:
+                warnings.warn(f'Se ignora un tick de una cotización desconocida: {clave}')
+                continue
+            self._pendientes[clave] = tick['valor'] # Gana el último valor del lote
+            self._hay_pendientes.set()
+
+    async def correr(self, fuente):
+        """
+        Consume la fuente hasta que se termina y publica una fotografía por lote.
+
+        Antes del primer tick se publica la fotografía inicial (versión 0).
+
+        Parameters
+        ----------
+        fuente : async iterable
+            Ticks (ver la descripción del módulo), p. ej. `fuenteArchivo(ruta)`.
+        """
+
+        loop = asyncio.get_running_loop()
+        self._hay_pendientes = asyncio.Event()
+        if self.vivas is None:
+            await self._publicar(await loop.run_in_executor(self._quantlib, self._iniciar))
+
+        lector = asyncio.create_task(self._leer(fuente))
+        try:
+            while True:
+                espera_tick = asyncio.create_task(self._hay_pendientes.wait())
+                hechos, _ = await asyncio.wait({espera_tick, lector}, return_when=asyncio.FIRST_COMPLETED)
+                if espera_tick not in hechos:
+                    espera_tick.cancel()
+                    if not self._pendientes:
+                        break
+                elif not lector.done():
+                    await asyncio.sleep(self.ventana) # Se juntan los ticks de la ráfaga
+
+                lote, self._pendientes = self._pendientes, {}
+                self._hay_pendientes.clear()
+                fotografia = await loop.run_in_executor(self._quantlib, self._aplicar, lote)
+                if fotografia is not None:
+                    await self._publicar(fotografia)
+        finally:
+            if not lector.done():
+                lector.cancel()
+        lector.result() # Propaga los errores de la fuente
+
+    def cerrar(self):
+        """ Libera el hilo de QuantLib. """
+        self._quantlib.shutdown()
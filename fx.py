@@ -0,0 +1,155 @@
+"""
+Tipo de cambio forward MXN/USD, rendimientos implícitos y basis para arreglos
+de fechas en una sola llamada.
+
+Las curvas Descuento MXN y SOFR se ajustan con los forwards de tipo de cambio
+(`curvas.FXSwapHelpers`), así que reproducen sus puntos forward:
+
+    F(T) = S P_usd(t0, T) / P_mxn(t0, T)
+
+con S el spot (MXN por USD), t0 la fecha spot (días de liquidación de
+`convenciones['FX']`) y P(t0, T) = P(T)/P(t0) los factores de descuento entre
+la fecha spot y T. `ForwardsFX` evalúa ambas curvas con
+`consulta.CurvaVectorizada`, de modo que miles de fechas cuestan una operación
+de NumPy en lugar de un ciclo sobre `ql.Date`.
+
+A partir de F se obtienen:
+
+- los puntos forward (F - S) en las unidades de `tasas_fwd_fx`;
+- los rendimientos simples Actual/360 entre t0 y T implícitos en MXN y USD;
+- el basis implícito: el rendimiento MXN implícito en el forward menos el de
+  una curva de proyección MXN (p. ej. FTIIE), en puntos base;
+- el valor presente en MXN de forwards de compra de USD.
+
+>>> fwd = ForwardsFX.desdeCurvas(crv, insumos['t_mxn_usd_spot'])
+>>> fwd.forward(fechas)                    # arreglo de tipos de cambio forward
+>>> fwd.basis(fechas, crv['FTIIE'])        # basis implícito en pb
+"""
+
+import numpy as np
+import QuantLib as ql
+
+from consulta import CurvaVectorizada
+from convenciones import convenciones
+
+
+def _vectorizada(curva):
+    """ Curva vectorizada a partir de una curva de QuantLib o de una `CurvaVectorizada`. """
+
+    return curva if isinstance(curva, CurvaVectorizada) else CurvaVectorizada.desdeQL(curva)
+
+
+class ForwardsFX:
+    """
+    Tipo de cambio forward MXN/USD sobre las curvas Descuento MXN y SOFR.
+
+    Parameters
+    ----------
+    spot : float
+        Tipo de cambio spot (MXN por USD), como `t_mxn_usd_spot`.
+    curva_mxn : ql.YieldTermStructure or CurvaVectorizada
+        Curva de descuento MXN (`genDISCTIIE`).
+    curva_usd : ql.YieldTermStructure or CurvaVectorizada
+        Curva de descuento USD (`genSOFR`).
+    """
+
+    def __init__(self, spot, curva_mxn, curva_usd):
+        self.spot = spot
+        self.mxn = _vectorizada(curva_mxn)
+        self.usd = _vectorizada(curva_usd)
+        if self.mxn.referencia != self.usd.referencia:
+            raise ValueError('Las curvas MXN y USD deben tener la misma fecha de referencia')
+
+        # Fecha spot: días de liquidación de los forwards desde la fecha de referencia
+        conv = convenciones['FX']
+        referencia = ql.Date.from_date(self.mxn.referencia.astype(object))
+        spot_ql = conv['calendario'].advance(referencia, conv['dias_liq'], ql.Days, conv['ajuste'])
+        self.fecha_spot = np.datetime64(spot_ql.to_date(), 'D')
+        self._t0 = self.mxn.tiempo(self.fecha_spot)
+        self._p0_mxn = self.mxn.descuento(self._t0)
+        self._p0_usd = self.usd.descuento(self._t0)
+
+    @classmethod
+    def desdeCurvas(cls, curvas, spot):
+        """ Forwards a partir de las curvas de `curvas.genCurvas` (llaves 'DISCTIIE' y 'SOFR'). """
+
+        return cls(spot, curvas['DISCTIIE'], curvas['SOFR'])
+
+    def _descuentos(self, fechas):
+        """ Plazo desde la fecha spot y factores de descuento MXN y USD desde la fecha spot. """
+
+        t = self.mxn.tiempo(fechas)
+        return (t - self._t0, self.mxn.descuento(t)/self._p0_mxn, self.usd.descuento(t)/self._p0_usd)
+
+    def forward(self, fechas):
+        """ Tipo de cambio forward (MXN por USD) en `fechas` (fechas o plazos en años). """
+
+        _, p_mxn, p_usd = self._descuentos(fechas)
+        return self.spot*p_usd/p_mxn
+
+    def puntos(self, fechas):
+        """ Puntos forward (F - S) en las unidades de `tasas_fwd_fx` (diezmilésimos de peso). """
+
+        return (self.forward(fechas) - self.spot)*10000
+
+    def rendimientoMXN(self, fechas):
+        """ Rendimiento simple Actual/360 en MXN implícito entre la fecha spot y `fechas`. """
+
+        tau, p_mxn, _ = self._descuentos(fechas)
+        return (1/p_mxn - 1)/tau
+
+    def rendimientoUSD(self, fechas):
+        """ Rendimiento simple Actual/360 en USD entre la fecha spot y `fechas`. """
+
+        tau, _, p_usd = self._descuentos(fechas)
+        return (1/p_usd - 1)/tau
+
+    def basis(self, fechas, curva_proyeccion):
+        """
+        Basis implícito en los forwards contra una curva de proyección MXN.
+
+        Parameters
+        ----------
+        fechas : array_like
+            Fechas (o plazos en años) posteriores a la fecha spot.
+        curva_proyeccion : ql.YieldTermStructure or CurvaVectorizada
+            Curva MXN de proyección (p. ej. FTIIE o TIIE28) con la misma fecha de referencia.
+
+        Returns
+        -------
+        np.ndarray
+            Rendimiento MXN implícito en los forwards menos el de la curva de
+            proyección, ambos simples Actual/360 desde la fecha spot, en puntos base.
+        """
+
+        proyeccion = _vectorizada(curva_proyeccion)
+        if proyeccion.referencia != self.mxn.referencia:
+            raise ValueError('La curva de proyección debe tener la misma fecha de referencia que la curva MXN')
+        t = self.mxn.tiempo(fechas)
+        tau = t - self._t0
+        p_proyeccion = proyeccion.descuento(t)/proyeccion.descuento(self._t0)
+        return (self.rendimientoMXN(t) - (1/p_proyeccion - 1)/tau)*10000
+
+    def valorForwards(self, fechas, nocionales_usd, precios_pactados):
+        """
+        Valor presente en MXN de forwards de compra de USD.
+
+        Parameters
+        ----------
+        fechas : array_like
+            Fechas de liquidación de cada forward.
+        nocionales_usd : array_like
+            Nocional en USD (negativo para ventas de USD).
+        precios_pactados : array_like
+            Tipo de cambio pactado (MXN por USD).
+
+        Returns
+        -------
+        np.ndarray
+            N (F(T) - K) P_mxn(T), descontado a la fecha de referencia con la
+            curva Descuento MXN.
+        """
+
+        t = self.mxn.tiempo(fechas)
+        return (np.asarray(nocionales_usd, dtype=float)*(self.forward(t) - np.asarray(precios_pactados, dtype=float))
+                * self.mxn.descuento(t))
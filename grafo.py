@@ -0,0 +1,217 @@
+"""
+Grafo de dependencias de las curvas y su planificador.
+
+`curvas.genCurvas` construye las curvas en un orden fijo: SOFR, después el
+Descuento MXN (que descuenta con SOFR) y al final TIIE28 y FTIIE (que descuentan
+con el Descuento MXN). `GrafoCurvas` guarda esas relaciones como un grafo
+dirigido acíclico: cada nodo es una curva con la función que la construye, las
+llaves de `insumos` que lee y sus curvas base. Con el grafo:
+
+- las curvas se construyen en orden topológico, cada una después de sus bases;
+- al cambiar los insumos solo se vuelven a construir las curvas cuyas llaves
+  cambiaron y las que dependen de ellas (un cambio en TIIE28 no toca las demás;
+  uno en SOFR reconstruye las cuatro);
+- una curva nueva (p. ej. TIIE91 o UDI) se agrega con `agregar` sin cambiar el
+  resto del proceso.
+
+Cada construcción se hace dentro de `convenciones.fechaEvaluacion` y las curvas
+terminadas se congelan sobre sus nodos (`persistencia.congelarCurvas`), así que
+quedan fijas en su fecha aunque después cambie la fecha de evaluación.
+
+Las curvas se ajustan una a la vez en el hilo que llama: los objetos de QuantLib
+no son seguros entre hilos (los índices y sus fixings son compartidos, ver
+`convenciones.py`) y las curvas se mueven con la fecha de evaluación global, así
+que TIIE28 y FTIIE no se pueden ajustar en paralelo. El ahorro es no reconstruir
+las curvas que no cambiaron.
+
+>>> grafo = GrafoCurvas()
+>>> curvas = grafo.construir(insumos, fecha)              # las cuatro curvas
+>>> grafo.construir(insumos_con_otra_tiie28, fecha)        # solo TIIE28
+>>> grafo.ultimas
+['TIIE28']
+>>> grafo.agregar('TIIE91', genTIIE91, ['tasas_tiie91', 'tenors_tiie91'], ['DISCTIIE'])
+"""
+
+import hashlib
+import json
+from collections import namedtuple
+
+from convenciones import fechaEvaluacion
+from curvas import genDISCTIIE, genFTIIE, genSOFR, genTIIE28
+from persistencia import congelarCurvas
+
+
+# Nodo del grafo:
+# - nombre: nombre de la curva.
+# - funcion: construye la curva, `funcion(insumos, *curvas_base)`.
+# - llaves: llaves de `insumos` que lee la función.
+# - bases: curvas que recibe la función, en orden.
+NodoCurva = namedtuple('NodoCurva', ['nombre', 'funcion', 'llaves', 'bases'])
+
+
+def _SOFR(insumos):
+    return genSOFR(insumos['sofr_futures'], insumos['tenors_fut_sofr'], insumos['sofr_swaps'],
+                   insumos['tenors_sofr'], insumos['depo'], insumos['tenor_depo'])
+
+
+def _DISCTIIE(insumos, crvSOFR):
+    return genDISCTIIE(insumos['t_mxn_usd_spot'], insumos['tasas_fwd_fx'], insumos['tenors_fwd_fx'],
+                       insumos['tasas_xccy'], insumos['tenors_xccy'], insumos['tasas_ftiie'], crvSOFR)
+
+
+def _TIIE28(insumos, crvDISCTIIE):
+    return genTIIE28(insumos['tasas_tiie28'], insumos['tenors_tiie28'], crvDISCTIIE)
+
+
+def _FTIIE(insumos, crvDISCTIIE):
+    return genFTIIE(insumos['tasas_ftiie'], insumos['tenors_ftiie'], crvDISCTIIE,
+                    insumos.get('precios_fut', []), insumos.get('tenors_futuros', []),
+                    insumos.get('fechas_banxico'), insumos.get('tasas_banxico'))
+
+
+# Cadena de `curvas.genCurvas`
+nodos_estandar = (
+    NodoCurva('SOFR', _SOFR, ('sofr_futures', 'tenors_fut_sofr', 'sofr_swaps', 'tenors_sofr',
+                              'depo', 'tenor_depo'), ()),
+    NodoCurva('DISCTIIE', _DISCTIIE, ('t_mxn_usd_spot', 'tasas_fwd_fx', 'tenors_fwd_fx',
+                                      'tasas_xccy', 'tenors_xccy', 'tasas_ftiie'), ('SOFR',)),
+    NodoCurva('TIIE28', _TIIE28, ('tasas_tiie28', 'tenors_tiie28'), ('DISCTIIE',)),
+    NodoCurva('FTIIE', _FTIIE, ('tasas_ftiie', 'tenors_ftiie', 'precios_fut', 'tenors_futuros',
+                                'fechas_banxico', 'tasas_banxico'), ('DISCTIIE',)),
+)
+
+
+def _huella(insumos, llaves):
+    """ Hash de los valores de `insumos` en `llaves` (las faltantes cuentan como None). """
+
+    texto = json.dumps([insumos.get(llave) for llave in llaves], default=str, separators=(',', ':'))
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def _ajustar(nodo, insumos, curvas_base):
+    """ Construye la curva de un nodo y hace su bootstrapping. """
+
+    curva = nodo.funcion(insumos, *curvas_base)
+    curva.nodes() # Las curvas de QuantLib se ajustan hasta que se consultan
+    return congelarCurvas({nodo.nombre: curva})[nodo.nombre]
+
+
+class GrafoCurvas:
+    """
+    Grafo de curvas con reconstrucción incremental.
+
+    Parameters
+    ----------
+    nodos : iterable, optional
+        Nodos (`NodoCurva`) en un orden en el que cada curva aparece después de
+        sus bases. Por defecto la cadena de `curvas.genCurvas`.
+    """
+
+    def __init__(self, nodos=nodos_estandar):
+        self.nodos = {} # {nombre: NodoCurva}, en orden topológico
+        self.curvas = {} # Última curva construida de cada nodo
+        self.ultimas = [] # Curvas que se construyeron en la última llamada a `construir`
+        self._huellas = {} # {nombre: huella de los insumos con los que se construyó}
+        self._fecha = None
+        for nodo in nodos:
+            self.agregar(*nodo)
+
+    def __getitem__(self, nombre):
+        return self.curvas[nombre]
+
+    def agregar(self, nombre, funcion, llaves, bases=()):
+        """
+        Agrega una curva al grafo.
+
+        Parameters
+        ----------
+        nombre : str
+            Nombre de la curva.
+        funcion : callable
+            `funcion(insumos, *curvas_base)` regresa la curva de QuantLib (sin ajustar).
+        llaves : sequence
+            Llaves de `insumos` que lee `funcion`; un cambio en cualquiera de ellas
+            vuelve a construir la curva y las que dependen de ella.
+        bases : sequence
+            Curvas ya agregadas que recibe `funcion`, en orden.
+        """
+
+        if nombre in self.nodos:
+            raise ValueError(f'La curva {nombre} ya está en el grafo')
+        faltantes = [base for base in bases if base not in self.nodos]
+        if faltantes:
+            raise KeyError(f'Las curvas base de {nombre} no están en el grafo: {faltantes}')
+        # Como las bases deben existir antes, el grafo no puede tener ciclos
+        self.nodos[nombre] = NodoCurva(nombre, funcion, tuple(llaves), tuple(bases))
+
+    def dependientes(self, nombres):
+        """ Curvas en `nombres` y todas las que dependen de ellas, en orden topológico. """
+
+        afectadas = set(nombres)
+        for nodo in self.nodos.values():
+            if afectadas.intersection(nodo.bases):
+                afectadas.add(nodo.nombre)
+        return [nombre for nombre in self.nodos if nombre in afectadas]
+
+    def invalidar(self, *nombres):
+        """
+        Marca curvas (y sus dependientes) para construirse en la siguiente llamada.
+
+        Sirve para cambios que no están en los insumos, como los fixings cargados
+        en los índices (p. ej. `invalidar('FTIIE')` tras cargar fixings de Banxico).
+        """
+
+        for nombre in self.dependientes(nombres):
+            self._huellas.pop(nombre, None)
+
+    def pendientes(self, insumos, fecha=None):
+        """ Curvas que `construir` volvería a construir con estos insumos. """
+
+        with fechaEvaluacion(fecha) as fecha_ql:
+            if fecha_ql != self._fecha:
+                return list(self.nodos)
+        cambiadas = [nombre for nombre, nodo in self.nodos.items()
+                     if self._huellas.get(nombre) != _huella(insumos, nodo.llaves)]
+        return self.dependientes(cambiadas)
+
+    def construir(self, insumos, fecha=None):
+        """
+        Construye las curvas que cambiaron desde la última llamada.
+
+        Las curvas se construyen en orden topológico. Si una curva falla se
+        propaga el error; las curvas que no se construyeron se intentan en la
+        siguiente llamada.
+
+        Parameters
+        ----------
+        insumos : dict
+            Insumos de mercado (ver `curvas.genCurvas`).
+        fecha : date or ql.Date, optional
+            Fecha de evaluación. Por defecto la actual. Si cambia, se construyen
+            todas las curvas.
+
+        Returns
+        -------
+        dict
+            {nombre: curva de nodos fija en la fecha} de todas las curvas del grafo.
+        """
+
+        with fechaEvaluacion(fecha) as fecha_ql:
+            if fecha_ql != self._fecha:
+                self._huellas.clear()
+                self._fecha = fecha_ql
+            huellas = {nombre: _huella(insumos, nodo.llaves) for nombre, nodo in self.nodos.items()}
+            por_construir = self.dependientes([nombre for nombre in self.nodos
+                                               if self._huellas.get(nombre) != huellas[nombre]])
+            for nombre in por_construir:
+                self._huellas.pop(nombre, None)
+
+            self.ultimas = []
+            for nombre in por_construir: # `dependientes` las da en orden topológico
+                nodo = self.nodos[nombre]
+                curvas_base = [self.curvas[base] for base in nodo.bases]
+                self.curvas[nombre] = _ajustar(nodo, insumos, curvas_base)
+                self._huellas[nombre] = huellas[nombre]
+                self.ultimas.append(nombre)
+
+        return dict(self.curvas)
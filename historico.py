@@ -0,0 +1,199 @@
+"""
+Construcción de curvas para un rango de fechas.
+
+Cada fecha se construye en un proceso independiente con su propia fecha de
+evaluación de QuantLib, de modo que el trabajo se reparte entre todos los
+núcleos disponibles. El resultado es una sola tabla con los nodos de las
+curvas SOFR, Descuento MXN, TIIE28 y FTIIE de todas las fechas.
+
+Con `arranque_caliente=True` cada proceso guarda los factores de descuento de la
+última fecha que construyó y con ellos da al solver de la siguiente fecha de su
+bloque una cota mínima y una máxima (`curvas.cotasBootstrap`). Son las mismas
+para todos los nodos, así que no estrechan la búsqueda respecto a las cotas de
+QuantLib; en `benchmarks/bootstrap.py` ('arranque', mismas funciones de este
+módulo) el arranque caliente tardó entre 8% y 17% menos que el frío, con los
+mismos nodos (diferencias de 4e-12).
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import QuantLib as ql
+
+from curvas import genCurvas
+from fixings import AlmacenFixings
+
+
+columnas_historico = ['Fecha Valuación', 'Curva', 'Fecha', 'Factor de Descuento']
+
+
+def nodosFecha(fecha, insumos):
+    """
+    Construye las cuatro curvas de una fecha y regresa sus nodos.
+
+    Parameters
+    ----------
+    fecha : datetime.date
+        Fecha de evaluación.
+    insumos : dict
+        Insumos de mercado de la fecha (ver `curvas.genCurvas`).
+
+    Returns
+    -------
+    list
+        Renglones (fecha de valuación, curva, fecha del nodo, factor de descuento).
+    """
+
+    # Cada proceso tiene su propia fecha de evaluación global
+    ql.Settings.instance().evaluationDate = ql.Date.from_date(fecha)
+    curvas = genCurvas(insumos)
+
+    # Los nodos se leen mientras la fecha de evaluación sigue fija,
+    # pues las curvas se mueven con ella
+    return [(fecha, nombre, d.to_date(), fd)
+            for nombre, curva in curvas.items()
+            for d, fd in curva.nodes()]
+
+
+# Curvas de la última fecha construida en el proceso (arranque caliente)
+_estado = {}
+
+
+def nodosFechaCaliente(fecha, insumos):
+    """
+    Igual que `nodosFecha`, pero acota el bootstrapping con la última fecha
+    construida en el proceso.
+
+    El solver de cada curva busca los factores de descuento entre la cota
+    mínima y la máxima de los factores de la fecha anterior, con un margen
+    (`curvas.cotasBootstrap`). Si con esas cotas no converge, la fecha se vuelve
+    a construir sin ellas.
+    """
+
+    # Cada proceso tiene su propia fecha de evaluación global
+    ql.Settings.instance().evaluationDate = ql.Date.from_date(fecha)
+    previas = _estado.get('factores')
+    try:
+        curvas = genCurvas(insumos, curvas_previas=previas)
+        resultado = {nombre: curva.nodes() for nombre, curva in curvas.items()}
+    except RuntimeError:
+        if previas is None:
+            raise
+        curvas = genCurvas(insumos) # Sin cotas
+        resultado = {nombre: curva.nodes() for nombre, curva in curvas.items()}
+
+    _estado['factores'] = {nombre: [fd for _, fd in n] for nombre, n in resultado.items()}
+    return [(fecha, nombre, d.to_date(), fd)
+            for nombre, n in resultado.items()
+            for d, fd in n]
+
+
+# Almacén de fixings del proceso (ver `_abrirFixings`)
+_almacen = {}
+
+
+def _abrirFixings(ruta_fixings):
+    """ Abre en cada proceso el almacén de fixings de Banxico de los futuros FTIIE. """
+
+    _almacen.clear()
+    if ruta_fixings is not None:
+        _almacen['fixings'] = AlmacenFixings(ruta_fixings)
+
+
+def _fixingsAntesDe(fecha):
+    """ Deja en el índice de los futuros solo los fixings del almacén anteriores a `fecha`. """
+
+    if 'fixings' in _almacen:
+        _almacen['fixings'].cargarAntesDe(fecha)
+
+
+def _nodosFechaSeguro(args):
+    """ Versión de `nodosFecha` para el pool que no detiene el lote si una fecha falla. """
+
+    fecha, insumos, omitir_errores, arranque_caliente = args
+    try:
+        _fixingsAntesDe(fecha) # El fixing de la propia fecha se publica hasta el día siguiente
+        if arranque_caliente:
+            return nodosFechaCaliente(fecha, insumos)
+        return nodosFecha(fecha, insumos)
+    except RuntimeError as error: # Errores de QuantLib (p. ej. el bootstrapping no converge)
+        if not omitir_errores:
+            raise
+        return str(error)
+
+
+def genHistorico(insumos_por_fecha, fechas=None, n_procesos=None, tam_bloque=None,
+                 omitir_errores=False, ruta_fixings=None, arranque_caliente=False):
+    """
+    Construye las curvas SOFR, Descuento MXN, TIIE28 y FTIIE para varias fechas.
+
+    Parameters
+    ----------
+    insumos_por_fecha : dict
+        Insumos de mercado por fecha: {fecha: insumos}, con los insumos en el
+        formato de `curvas.genCurvas`.
+    fechas : iterable, optional
+        Fechas a construir (p. ej. un `pd.date_range`). Por defecto todas las
+        fechas de `insumos_por_fecha`.
+    n_procesos : int, optional
+        Número de procesos. Por defecto el número de núcleos. Con 1 se
+        construye todo en el proceso actual.
+    tam_bloque : int, optional
+        Fechas que se mandan juntas a cada proceso. Por defecto se reparten
+        unos cuatro bloques por proceso.
+    omitir_errores : bool
+        Si es True, las fechas cuyo bootstrapping falla se omiten con una
+        advertencia en lugar de detener el lote.
+    ruta_fixings : str, optional
+        Almacén de fixings de Banxico (ver `fixings.AlmacenFixings`) que usan los
+        insumos que no traen `fechas_banxico`. Cada fecha ve solo los fixings
+        anteriores a ella (ver `AlmacenFixings.cargarAntesDe`); la carga es
+        incremental mientras las fechas de un proceso avanzan.
+    arranque_caliente : bool
+        Si es True, el bootstrapping de cada fecha se acota con el rango de los
+        factores de descuento de la fecha anterior del mismo proceso (ver
+        `nodosFechaCaliente`).
+
+    Returns
+    -------
+    pd.DataFrame
+        Nodos de todas las curvas con columnas 'Fecha Valuación', 'Curva',
+        'Fecha' y 'Factor de Descuento'.
+    """
+
+    # Se normalizan las fechas para que coincidan con las llaves de los insumos
+    insumos_por_fecha = {pd.Timestamp(f).date(): ins for f, ins in insumos_por_fecha.items()}
+    if fechas is None:
+        fechas = sorted(insumos_por_fecha)
+    else:
+        fechas = [pd.Timestamp(f).date() for f in fechas]
+        faltantes = [f for f in fechas if f not in insumos_por_fecha]
+        if faltantes:
+            raise KeyError(f'No hay insumos para las fechas: {faltantes}')
+
+    n_procesos = n_procesos or os.cpu_count() or 1
+    tareas = [(f, insumos_por_fecha[f], omitir_errores, arranque_caliente) for f in fechas]
+
+    if n_procesos == 1 or len(tareas) <= 1:
+        _estado.clear()
+        _abrirFixings(ruta_fixings)
+        resultados = map(_nodosFechaSeguro, tareas)
+    else:
+        # Bloques grandes reducen la comunicación entre procesos; se dejan
+        # varios por proceso para balancear fechas que tardan más
+        tam_bloque = tam_bloque or max(1, len(tareas) // (4*n_procesos))
+        pool = ProcessPoolExecutor(max_workers=min(n_procesos, len(tareas)),
+                                   initializer=_abrirFixings, initargs=(ruta_fixings,))
+        with pool:
+            resultados = list(pool.map(_nodosFechaSeguro, tareas, chunksize=tam_bloque))
+
+    renglones = []
+    for fecha, resultado in zip(fechas, resultados):
+        if isinstance(resultado, str):
+            warnings.warn(f'Se omite la fecha {fecha}: {resultado}')
+            continue
+        renglones.extend(resultado)
+
+    return pd.DataFrame(renglones, columns=columnas_historico)
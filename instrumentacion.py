@@ -0,0 +1,229 @@
+"""
+Instrumentación opcional de la construcción de curvas.
+
+Las funciones `gen*` y las fábricas de helpers de `curvas.py` están decoradas
+con `instrumentado`. Mientras no haya sumideros registrados el decorador solo
+llama a la función; con algún sumidero activo cada llamada genera un evento
+(un diccionario) que se manda a todos los sumideros:
+
+- Fábricas de helpers ('evento': 'helpers'): tiempo y número de helpers.
+- Curvas ('evento': 'curva'): tiempo de creación, tiempo de bootstrapping
+  (se fuerza con `nodes()`), número de helpers y de nodos, y para cada helper
+  la diferencia entre la cotización implícita en la curva (`impliedQuote()`) y
+  la cotización de entrada.
+
+Un sumidero es cualquier función que recibe un evento; aquí se incluyen uno
+para `logging`, uno para archivos de líneas JSON y uno que los junta en memoria:
+
+>>> colector = ColectorEventos()
+>>> with instrumentar(colector):
+...     curvas = genCurvas(insumos_ejemplo)
+>>> colector.tabla()
+
+Los sumideros de `agregarSumidero` son de todo el proceso y reciben los eventos
+de todos los hilos (p. ej. de `concurrencia.genCurvasHilos`). Los de
+`instrumentar` son del hilo que abre el bloque `with` y solo reciben los eventos
+de las curvas que construye ese hilo.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import QuantLib as ql
+
+
+sumideros = [] # Sumideros activos en todo el proceso
+
+_local = threading.local() # Sumideros de `instrumentar` y curvas en construcción del hilo actual
+
+
+def agregarSumidero(sumidero):
+    """ Activa un sumidero de eventos para todos los hilos del proceso. """
+    sumideros.append(sumidero)
+
+
+def quitarSumidero(sumidero):
+    """ Desactiva un sumidero de eventos de `agregarSumidero`. """
+    sumideros.remove(sumidero)
+
+
+def _sumiderosHilo():
+    if not hasattr(_local, 'sumideros'):
+        _local.sumideros = []
+    return _local.sumideros
+
+
+@contextmanager
+def instrumentar(*nuevos):
+    """ Activa sumideros solo dentro de un bloque `with` y solo para el hilo actual. """
+
+    propios = _sumiderosHilo()
+    propios.extend(nuevos)
+    try:
+        yield nuevos[0] if len(nuevos) == 1 else nuevos
+    finally:
+        for sumidero in nuevos:
+            propios.remove(sumidero)
+
+
+def emitir(evento):
+    """ Manda un evento a los sumideros del proceso y a los del hilo actual. """
+
+    for sumidero in sumideros + _sumiderosHilo():
+        sumidero(evento)
+
+
+def _pila():
+    if not hasattr(_local, 'pila'):
+        _local.pila = [] # [[helpers de la curva en construcción, profundidad de fábricas]]
+    return _local.pila
+
+
+def _erroresHelpers(helpers):
+    """ Cotización de entrada contra cotización implícita de cada helper de una curva ajustada. """
+
+    errores = []
+    for helper in helpers:
+        cotizacion = helper.quote().value()
+        implicita = helper.impliedQuote()
+        errores.append({
+            'pilar': helper.pillarDate().ISO(),
+            'cotizacion': cotizacion,
+            'implicita': implicita,
+            'error': implicita - cotizacion,
+        })
+    return errores
+
+
+def instrumentado(tipo):
+    """
+    Decorador para las funciones de `curvas.py`.
+
+    Parameters
+    ----------
+    tipo : str
+        'helpers' para las fábricas de helpers (regresan una lista de helpers) o
+        'curva' para las funciones `gen*` (regresan una curva por tramos).
+    """
+
+    if tipo not in ('helpers', 'curva'):
+        raise ValueError(f'Tipo desconocido: {tipo!r}')
+
+    def decorador(funcion):
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not sumideros and not getattr(_local, 'sumideros', None):
+                return funcion(*args, **kwargs)
+
+            evento = {'evento': tipo, 'funcion': funcion.__name__,
+                      'fecha_evaluacion': ql.Settings.instance().evaluationDate.ISO()}
+            pila = _pila()
+
+            if tipo == 'helpers':
+                # Las fábricas pueden llamar a otras fábricas; solo los helpers de la
+                # más externa se asignan a la curva en construcción
+                if pila:
+                    pila[-1][1] += 1
+                t0 = time.perf_counter()
+                try:
+                    helpers = funcion(*args, **kwargs)
+                finally:
+                    if pila:
+                        pila[-1][1] -= 1
+                evento.update(segundos=time.perf_counter() - t0, helpers=len(helpers))
+                if pila and pila[-1][1] == 0:
+                    pila[-1][0].extend(helpers)
+                emitir(evento)
+                return helpers
+
+            pila.append([[], 0])
+            t0 = time.perf_counter()
+            try:
+                curva = funcion(*args, **kwargs)
+            finally:
+                helpers = pila.pop()[0]
+            evento.update(segundos=time.perf_counter() - t0, helpers=len(helpers))
+
+            t0 = time.perf_counter()
+            try:
+                nodos = curva.nodes() # Se fuerza el bootstrapping para medirlo
+            except RuntimeError as error:
+                evento.update(segundos_bootstrap=time.perf_counter() - t0, fallo=str(error))
+                emitir(evento)
+                raise
+            evento['segundos_bootstrap'] = time.perf_counter() - t0
+            evento['nodos'] = len(nodos)
+
+            errores = _erroresHelpers(helpers)
+            evento['error_maximo'] = max((abs(e['error']) for e in errores), default=0.0)
+            evento['errores'] = errores
+            emitir(evento)
+            return curva
+
+        return envoltura
+
+    return decorador
+
+
+class ColectorEventos:
+    """ Sumidero que guarda los eventos en memoria. """
+
+    def __init__(self):
+        self.eventos = []
+
+    def __call__(self, evento):
+        self.eventos.append(evento)
+
+    def tabla(self):
+        """ Eventos como DataFrame, sin el detalle de errores por helper. """
+        return pd.DataFrame([{k: v for k, v in e.items() if k != 'errores'} for e in self.eventos])
+
+    def errores(self):
+        """ Errores de repreciación por helper de todas las curvas. """
+        return pd.DataFrame([{'funcion': e['funcion'], **error}
+                             for e in self.eventos for error in e.get('errores', [])])
+
+
+class SumideroJSON:
+    """
+    Sumidero que escribe cada evento como una línea JSON.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo de salida; los eventos se agregan al final.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def __call__(self, evento):
+        with open(self.ruta, 'a') as archivo:
+            archivo.write(json.dumps(evento) + '\n')
+
+
+class SumideroLogger:
+    """
+    Sumidero que manda cada evento a un logger de `logging`.
+
+    Parameters
+    ----------
+    nombre : str
+        Nombre del logger.
+    nivel : int
+        Nivel de los mensajes.
+    """
+
+    def __init__(self, nombre='curvas', nivel=logging.INFO):
+        self.logger = logging.getLogger(nombre)
+        self.nivel = nivel
+
+    def __call__(self, evento):
+        resumen = {k: v for k, v in evento.items() if k != 'errores'}
+        self.logger.log(self.nivel, '%s %s', evento['funcion'], json.dumps(resumen))
@@ -0,0 +1,140 @@
+"""
+Jacobiano de los nodos de cada curva respecto a las cotizaciones de entrada.
+
+Para cada curva ('SOFR', 'DISCTIIE', 'TIIE28', 'FTIIE') se calcula el cambio en
+el factor de descuento de cada nodo al mover un punto base cada cotización de
+la que depende, incluidas las de sus curvas base (p. ej. la curva FTIIE
+depende también de las cotizaciones SOFR, FX y XCCY a través de la curva de
+descuento). Con el Jacobiano guardado, el riesgo por cotización de muchas
+operaciones es una multiplicación de matrices:
+
+    riesgo (operaciones x cotizaciones) = sensibilidad a nodos (operaciones x nodos) @ J
+
+El Jacobiano de una curva solo se recalcula cuando cambia alguna de sus
+cotizaciones, la fecha de evaluación o, si la curva usa futuros FTIIE, los
+fixings del índice de los futuros (`convenciones.versionFixings`).
+"""
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from convenciones import versionFixings
+from riesgo import tamanoBump
+
+
+class JacobianoCurvas:
+    """
+    Jacobianos guardados de las curvas de un `CurvasVivas`.
+
+    Parameters
+    ----------
+    vivas : curvas_vivas.CurvasVivas
+        Curvas con cotizaciones actualizables.
+    bumps_grupo : dict, optional
+        Movimiento por grupo; por defecto `riesgo.bumps`.
+    """
+
+    def __init__(self, vivas, bumps_grupo=None):
+        self.vivas = vivas
+        self.bumps_grupo = bumps_grupo
+        self._guardados = {} # {curva: (huella, pd.DataFrame)}
+
+    def _huella(self, nombre):
+        """ Identifica el estado de las cotizaciones de las que depende una curva. """
+
+        claves = self.vivas.clavesCurva(nombre)
+        # Los futuros FTIIE dependen además de los fixings ya publicados
+        fixings = versionFixings('FUT_FTIIE') if any(c[0] == 'FTIIE_FUT' for c in claves) else None
+        return (ql.Settings.instance().evaluationDate.serialNumber(), fixings,
+                tuple((clave, self.vivas.valores[clave]) for clave in claves))
+
+    def vigente(self, nombre):
+        """ Indica si el Jacobiano guardado de una curva sigue siendo válido. """
+
+        return nombre in self._guardados and self._guardados[nombre][0] == self._huella(nombre)
+
+    def jacobianos(self, nombres=None):
+        """
+        Regresa los Jacobianos de varias curvas, calculando solo los que no están vigentes.
+
+        Las curvas desactualizadas se calculan juntas: cada cotización se mueve una
+        sola vez y se leen los nodos de todas las curvas que dependen de ella.
+
+        Parameters
+        ----------
+        nombres : list, optional
+            Curvas a calcular. Por defecto las cuatro.
+
+        Returns
+        -------
+        dict
+            {curva: pd.DataFrame} con los nodos en los renglones y las cotizaciones
+            (grupo, tenor) en las columnas. Cada entrada es el cambio en el factor de
+            descuento del nodo al mover la cotización (ver `riesgo.bumps`).
+        """
+
+        nombres = list(self.vivas.curvas) if nombres is None else list(nombres)
+        pendientes = [n for n in nombres if not self.vigente(n)]
+
+        if pendientes:
+            vivas = self.vivas
+            claves_curva = {n: vivas.clavesCurva(n) for n in pendientes}
+            base = {n: np.array([fd for _, fd in vivas.nodos(n)]) for n in pendientes}
+            columnas = {n: [] for n in pendientes}
+
+            # Se mueve una vez cada cotización que afecta a alguna curva pendiente
+            claves = [c for c in vivas.claves() if any(c in claves_curva[n] for n in pendientes)]
+            for clave in claves:
+                original = vivas.valores[clave]
+                vivas.actualizar(*clave, original + tamanoBump(clave, self.bumps_grupo))
+                for n in pendientes:
+                    if clave in claves_curva[n]:
+                        columnas[n].append(np.array([fd for _, fd in vivas.nodos(n)]) - base[n])
+                vivas.actualizar(*clave, original)
+
+            for n in pendientes:
+                fechas = [d.to_date() for d, _ in vivas.nodos(n)]
+                jac = pd.DataFrame(
+                    np.column_stack(columnas[n]),
+                    index=pd.Index(fechas, name='Fecha'),
+                    columns=pd.MultiIndex.from_tuples(claves_curva[n], names=['Grupo', 'Tenor']))
+                self._guardados[n] = (self._huella(n), jac)
+
+        return {n: self._guardados[n][1] for n in nombres}
+
+    def jacobiano(self, nombre):
+        """ Jacobiano de una curva (ver `jacobianos`). """
+        return self.jacobianos([nombre])[nombre]
+
+    def mapearRiesgo(self, sensibilidades_nodos):
+        """
+        Convierte sensibilidades a los nodos de las curvas en riesgo por cotización.
+
+        Parameters
+        ----------
+        sensibilidades_nodos : dict
+            {curva: matriz (operaciones x nodos)} con la derivada del valor de cada
+            operación respecto al factor de descuento de cada nodo de la curva.
+
+        Returns
+        -------
+        pd.DataFrame
+            Cambio en el valor de cada operación (renglones) al mover cada
+            cotización (columnas).
+        """
+
+        jacobianos = self.jacobianos(list(sensibilidades_nodos))
+
+        # Mismo orden de cotizaciones que el de las curvas
+        claves = [c for c in self.vivas.claves() if any(c in j.columns for j in jacobianos.values())]
+        posicion = {clave: i for i, clave in enumerate(claves)}
+
+        riesgo = None
+        for nombre, sens in sensibilidades_nodos.items():
+            parcial = np.atleast_2d(np.asarray(sens, dtype=float)) @ jacobianos[nombre].to_numpy()
+            if riesgo is None:
+                riesgo = np.zeros((parcial.shape[0], len(claves)))
+            riesgo[:, [posicion[c] for c in jacobianos[nombre].columns]] += parcial
+
+        return pd.DataFrame(riesgo, columns=pd.MultiIndex.from_tuples(claves, names=['Grupo', 'Tenor']))
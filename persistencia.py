@@ -0,0 +1,232 @@
+"""
+Fotografías binarias de un juego de curvas ya ajustadas.
+
+Se guardan los nodos (fecha, factor de descuento) de cada curva junto con su
+interpolación, conteo de días, calendario y las cotizaciones con las que se
+construyeron. Al cargarlas se crean curvas de QuantLib interpoladas sobre esos
+nodos (`ql.DiscountCurve` o `ql.NaturalLogCubicDiscountCurve`), listas para
+valuar sin volver a correr el bootstrapping SOFR -> Descuento MXN -> TIIE28/FTIIE.
+
+El archivo es un `.npz` de NumPy: dos arreglos por curva ('<curva>_fechas' con
+el número de serie de QuantLib de cada nodo y '<curva>_factores') y un arreglo
+'metadatos' con un JSON.
+
+A diferencia de las curvas de `curvas.py`, las curvas cargadas tienen fecha de
+referencia fija (la del primer nodo) y no se mueven con la fecha de evaluación.
+
+`congelarCurvas` hace lo mismo en memoria: copia las curvas sobre sus nodos
+con fecha de referencia fija. `nodosGuardados` junta los nodos de muchas fotografías (p. ej. una por día) en
+la misma tabla que regresa `historico.genHistorico`.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from curvas_vivas import clavesInsumos
+
+
+version = 1
+
+# Calendarios que usan las curvas, por nombre de QuantLib
+calendarios = {c.name(): c for c in (ql.Mexico(), ql.UnitedStates(5))}
+
+# Conteos de días que usan las curvas, por nombre de QuantLib
+conteos = {c.name(): c for c in (ql.Actual360(),)}
+
+
+def _interpolacion(curva):
+    """ Interpolación de una curva: 'loglineal' o 'cubica' (ver `consulta.py`). """
+
+    lineales = (ql.PiecewiseLogLinearDiscount, ql.DiscountCurve)
+    return 'loglineal' if isinstance(curva, lineales) else 'cubica'
+
+
+def curvaDeNodos(fechas, factores, interpolacion='cubica', conteo=ql.Actual360(),
+                 calendario=ql.Mexico(), extrapolacion=True):
+    """
+    Curva de QuantLib interpolada sobre nodos, con fecha de referencia fija (la primera).
+
+    Parameters
+    ----------
+    fechas : list
+        Fechas de los nodos (`ql.Date`); la primera es la fecha de referencia.
+    factores : list
+        Factor de descuento de cada nodo.
+    interpolacion : str
+        'loglineal' (`ql.DiscountCurve`) o 'cubica' (`ql.NaturalLogCubicDiscountCurve`).
+    conteo : ql.DayCounter
+        Conteo de días.
+    calendario : ql.Calendar
+        Calendario.
+    extrapolacion : bool
+        Si se habilita la extrapolación.
+    """
+
+    if interpolacion == 'loglineal':
+        curva = ql.DiscountCurve(fechas, factores, conteo, calendario)
+    else:
+        curva = ql.NaturalLogCubicDiscountCurve(fechas, factores, conteo, calendario)
+    if extrapolacion:
+        curva.enableExtrapolation()
+    return curva
+
+
+def congelarCurvas(curvas):
+    """
+    Copias de las curvas sobre sus nodos, fijas en su fecha de referencia actual.
+
+    Las curvas de `curvas.py` se mueven con la fecha de evaluación global y se
+    vuelven a ajustar cuando cambia; las copias no dependen de ella, de modo que
+    se pueden usar desde otros hilos o después de cambiar la fecha (ver
+    `concurrencia.py`). Las curvas se ajustan si hace falta.
+
+    Parameters
+    ----------
+    curvas : dict
+        {nombre: curva de QuantLib} (ver `curvas.genCurvas`).
+
+    Returns
+    -------
+    dict
+        {nombre: curva de nodos} con la misma interpolación, conteo y calendario.
+    """
+
+    congeladas = {}
+    for nombre, curva in curvas.items():
+        nodos = curva.nodes()
+        congeladas[nombre] = curvaDeNodos(
+            [d for d, _ in nodos], [fd for _, fd in nodos], _interpolacion(curva),
+            curva.dayCounter(), curva.calendar(), curva.allowsExtrapolation())
+    return congeladas
+
+
+def guardarCurvas(ruta, curvas, insumos=None):
+    """
+    Guarda los nodos y la descripción de un juego de curvas.
+
+    Cada curva guarda su fecha de referencia; todas deben tener la misma, que se
+    guarda como 'fecha_evaluacion' y es la 'Fecha Valuación' de `nodosGuardados`.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo de salida (p. ej. 'curvas_20250219.npz').
+    curvas : dict
+        {nombre: curva de QuantLib} (ver `curvas.genCurvas`). Las curvas se
+        ajustan si hace falta.
+    insumos : dict, optional
+        Insumos de mercado con los que se construyeron; se guardan sus
+        cotizaciones por llave (grupo, tenor).
+    """
+
+    arreglos = {}
+    descripcion = {}
+    referencias = set()
+    for nombre, curva in curvas.items():
+        nodos = curva.nodes()
+        referencia = curva.referenceDate().ISO()
+        referencias.add(referencia)
+        arreglos[f'{nombre}_fechas'] = np.array([d.serialNumber() for d, _ in nodos], dtype=np.int32)
+        arreglos[f'{nombre}_factores'] = np.array([fd for _, fd in nodos], dtype=float)
+        descripcion[nombre] = {
+            'interpolacion': _interpolacion(curva),
+            'conteo': curva.dayCounter().name(),
+            'calendario': curva.calendar().name(),
+            'extrapolacion': curva.allowsExtrapolation(),
+            'referencia': referencia,
+        }
+    if len(referencias) > 1:
+        raise ValueError(f'Las curvas de una fotografía deben tener la misma fecha de referencia: {sorted(referencias)}')
+
+    metadatos = {
+        'version': version,
+        # Fecha de referencia de las curvas (no la fecha de evaluación global, que
+        # puede haber cambiado después de ajustarlas, p. ej. con `congelarCurvas`)
+        'fecha_evaluacion': referencias.pop() if referencias else None,
+        'curvas': descripcion,
+        'cotizaciones': [] if insumos is None else
+                        [[grupo, tenor, valor] for (grupo, tenor), valor in clavesInsumos(insumos).items()],
+    }
+    arreglos['metadatos'] = np.frombuffer(json.dumps(metadatos).encode(), dtype=np.uint8)
+
+    with open(ruta, 'wb') as archivo: # Con archivo abierto no se agrega la extensión .npz
+        np.savez(archivo, **arreglos)
+
+
+def cargarCurvas(ruta):
+    """
+    Carga un juego de curvas guardado con `guardarCurvas`.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo de la fotografía.
+
+    Returns
+    -------
+    tuple
+        ({nombre: curva de QuantLib}, metadatos). En los metadatos, 'cotizaciones'
+        es {(grupo, tenor): valor}.
+    """
+
+    with np.load(ruta, allow_pickle=False) as datos:
+        metadatos = json.loads(datos['metadatos'].tobytes().decode())
+        if metadatos['version'] != version:
+            raise ValueError(f"Versión de fotografía no soportada: {metadatos['version']}")
+
+        curvas = {}
+        for nombre, desc in metadatos['curvas'].items():
+            curvas[nombre] = curvaDeNodos(
+                [ql.Date(int(s)) for s in datos[f'{nombre}_fechas']],
+                list(datos[f'{nombre}_factores']),
+                desc['interpolacion'],
+                conteos[desc['conteo']],
+                calendarios[desc['calendario']],
+                desc['extrapolacion'])
+
+    metadatos['cotizaciones'] = {(grupo, tenor): valor for grupo, tenor, valor in metadatos['cotizaciones']}
+    return curvas, metadatos
+
+
+def nodosGuardados(rutas):
+    """
+    Tabla de nodos de varias fotografías, en el formato de `historico.genHistorico`.
+
+    Lee los arreglos directamente, sin crear curvas de QuantLib, de modo que sirve
+    para cargar años de fotografías diarias (p. ej. para `basis.basisHistorico`).
+
+    Parameters
+    ----------
+    rutas : iterable
+        Archivos guardados con `guardarCurvas`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas 'Fecha Valuación', 'Curva', 'Fecha' y 'Factor de Descuento'.
+    """
+
+    origen = np.datetime64('1899-12-30') # Día 0 de los números de serie de QuantLib
+    tablas = []
+    for ruta in rutas:
+        with np.load(ruta, allow_pickle=False) as datos:
+            metadatos = json.loads(datos['metadatos'].tobytes().decode())
+            if metadatos['version'] != version:
+                raise ValueError(f"Versión de fotografía no soportada: {metadatos['version']}")
+            for nombre, desc in metadatos['curvas'].items():
+                # Las fotografías anteriores solo guardaban la fecha de evaluación global
+                fecha = pd.Timestamp(desc.get('referencia', metadatos['fecha_evaluacion'])).date()
+                fechas = origen + datos[f'{nombre}_fechas'].astype('timedelta64[D]')
+                tablas.append(pd.DataFrame({
+                    'Fecha Valuación': fecha,
+                    'Curva': nombre,
+                    'Fecha': pd.to_datetime(fechas).date,
+                    'Factor de Descuento': datos[f'{nombre}_factores'],
+                }))
+
+    if not tablas:
+        return pd.DataFrame(columns=['Fecha Valuación', 'Curva', 'Fecha', 'Factor de Descuento'])
+    return pd.concat(tablas, ignore_index=True)
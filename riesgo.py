@@ -0,0 +1,126 @@
+"""
+Riesgo por nodo (DV01 por cotización) de un libro de swaps de TIIE28 y FTIIE.
+
+Cada cotización de entrada (tasas par TIIE28, futuros y swaps FTIIE, puntos
+forward y spot MXN/USD, basis XCCY, depósito, futuros y swaps SOFR) se mueve
+un punto base y se revalúa el libro. El movimiento se propaga por toda la
+cadena SOFR → Descuento MXN → TIIE28/FTIIE, porque las curvas están ligadas
+entre sí y a sus cotizaciones (ver `curvas_vivas.py`): solo se vuelven a
+ajustar las curvas que dependen de la cotización movida.
+
+Las cotizaciones se reparten entre procesos; cada proceso construye las curvas
+y el libro una sola vez y después solo mueve cotizaciones.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from curvas_vivas import CurvasVivas, clavesInsumos
+from swaps import crearLibro, fechaQL, idsLibro, valuarLibro
+
+
+# Movimiento de cada grupo de cotizaciones, en las unidades de los insumos.
+# Para los futuros se baja el precio, que equivale a subir la tasa un punto base.
+bumps = {
+    'SOFR_FUT': -0.01,
+    'SOFR_DEPO': 0.01,
+    'SOFR': 0.01,
+    'FX': 1, # Puntos forward (1 pip)
+    'XCCY': 0.01,
+    'TIIE28': 0.01,
+    'FTIIE_FUT': -0.01,
+    'FTIIE': 0.01,
+}
+bump_spot = 0.01 # MXN por USD
+
+
+def tamanoBump(clave, bumps_grupo=None):
+    """ Movimiento que se aplica a la cotización `clave` = (grupo, tenor). """
+
+    if clave == ('FX', 'SPOT'):
+        return bump_spot
+    return (bumps_grupo or bumps)[clave[0]]
+
+
+# Estado de cada proceso: curvas vivas, swaps y valuación base
+_estado = {}
+
+
+def _iniciarProceso(fecha, insumos, libro):
+    """ Construye las curvas y el libro una vez por proceso. """
+
+    ql.Settings.instance().evaluationDate = fechaQL(fecha)
+    vivas = CurvasVivas(insumos)
+    swaps = crearLibro(libro, vivas.curvas)
+    _estado.update(vivas=vivas, swaps=swaps, base=valuarLibro(swaps))
+
+
+def _sensibilidades(claves_bumps):
+    """ Cambio en el valor del libro al mover cada cotización de `claves_bumps`. """
+
+    vivas, swaps, base = _estado['vivas'], _estado['swaps'], _estado['base']
+    filas = []
+    for clave, bump in claves_bumps:
+        original = vivas.valor(*clave)
+        vivas.actualizar(*clave, original + bump)
+        filas.append(valuarLibro(swaps) - base)
+        # Al regresar la cotización, las curvas se reajustan hasta el siguiente bump
+        vivas.actualizar(*clave, original)
+    return filas
+
+
+def sensibilidades(libro, insumos, fecha=None, claves=None, bumps_grupo=None, n_procesos=None):
+    """
+    Calcula la matriz de sensibilidades del libro a cada cotización de entrada.
+
+    Parameters
+    ----------
+    libro : list
+        Operaciones (ver `swaps.py`).
+    insumos : dict
+        Insumos de mercado (ver `curvas.genCurvas`).
+    fecha : date, optional
+        Fecha de evaluación. Por defecto la fecha de evaluación actual.
+    claves : list, optional
+        Cotizaciones (grupo, tenor) a mover. Por defecto todas.
+    bumps_grupo : dict, optional
+        Movimiento por grupo; por defecto `bumps`.
+    n_procesos : int, optional
+        Número de procesos. Por defecto el número de núcleos. Con 1 se calcula
+        en el proceso actual.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cambio en el valor presente (MXN) de cada operación (columnas) al mover
+        cada cotización (renglones).
+    """
+
+    fecha_eval = ql.Settings.instance().evaluationDate
+    fecha = fecha_eval.to_date() if fecha is None else pd.Timestamp(fecha).date()
+
+    claves = list(clavesInsumos(insumos)) if claves is None else list(claves)
+    tareas = [(clave, tamanoBump(clave, bumps_grupo)) for clave in claves]
+
+    n_procesos = n_procesos or os.cpu_count() or 1
+    if n_procesos == 1:
+        _iniciarProceso(fecha, insumos, libro)
+        filas = _sensibilidades(tareas)
+        _estado.clear()
+        ql.Settings.instance().evaluationDate = fecha_eval
+    else:
+        # Unos dos bloques por proceso para balancear la carga
+        bloques = [list(b) for b in np.array_split(np.arange(len(tareas)), 2*n_procesos) if len(b)]
+        pool = ProcessPoolExecutor(max_workers=n_procesos, initializer=_iniciarProceso,
+                                   initargs=(fecha, insumos, libro))
+        with pool:
+            resultados = pool.map(_sensibilidades, [[tareas[i] for i in b] for b in bloques])
+            filas = [fila for bloque in resultados for fila in bloque]
+        ql.Settings.instance().evaluationDate = fecha_eval
+
+    indice = pd.MultiIndex.from_tuples(claves, names=['Grupo', 'Tenor'])
+    return pd.DataFrame(np.array(filas), index=indice, columns=idsLibro(libro))
@@ -0,0 +1,178 @@
+"""
+Swaps de TIIE28 y de TIIE de Fondeo valuados con las curvas de `curvas.py`.
+
+Un libro es una lista de operaciones; cada operación es un diccionario con:
+
+- 'curva': 'TIIE28' o 'FTIIE'
+- 'nocional': nocional en MXN
+- 'tasa_fija': tasa fija en porcentaje (p. ej. 8.5)
+- 'plazo': número de periodos de 28 días (p. ej. 130 para 10 años)
+- 'posicion': 'recibe' o 'paga' la tasa fija (por defecto 'recibe')
+- 'inicio': fecha de inicio (opcional, por defecto la fecha spot de la curva)
+- 'id': identificador (opcional)
+
+Las convenciones son las mismas que las de `TIIE28Helpers` y `FTIIESwapHelpers`
+(ver `convenciones.py`).
+"""
+
+import numpy as np
+import QuantLib as ql
+
+from calendarios import calendarioPagos
+from convenciones import convenciones, fechaQL, indiceProyeccion
+
+
+def _calendario(inicio, plazo, dias_liq, calendario):
+    """ Calendario de pagos de 28 días de un swap (compartido, ver `calendarios.py`). """
+
+    if inicio is None: # Inicio spot
+        inicio = calendario.advance(ql.Settings.instance().evaluationDate, dias_liq, ql.Days)
+
+    # Cupones cada 28 días con ajuste Following y fechas hacia atrás, igual que en los helpers
+    return calendarioPagos(fechaQL(inicio), ql.Period(plazo*4, ql.Weeks), ql.EveryFourthWeek, calendario)
+
+
+def _tipo(posicion):
+    """ Tipo de swap de QuantLib según la pata fija. """
+
+    if posicion == 'recibe':
+        return ql.Swap.Receiver
+    if posicion == 'paga':
+        return ql.Swap.Payer
+    raise ValueError(f"La posición debe ser 'recibe' o 'paga', no {posicion!r}")
+
+
+def swapTIIE28(nocional, tasa_fija, plazo, curva_proyeccion, curva_descuento,
+               posicion='recibe', inicio=None):
+    """
+    Crea un swap de TIIE28 con cupones cada 28 días.
+
+    Parameters
+    ----------
+    nocional : float
+        Nocional en MXN.
+    tasa_fija : float
+        Tasa fija en porcentaje.
+    plazo : int
+        Número de periodos de 28 días.
+    curva_proyeccion : ql.YieldTermStructure
+        Curva TIIE28.
+    curva_descuento : ql.YieldTermStructure
+        Curva de descuento MXN.
+    posicion : str
+        'recibe' o 'paga' la tasa fija.
+    inicio : date, optional
+        Fecha de inicio. Por defecto t+1.
+
+    Returns
+    -------
+    ql.VanillaSwap
+        Swap con su motor de valuación.
+    """
+
+    conv = convenciones['TIIE28']
+    dias_liq = conv['dias_liq'] # Días de liquidación (1)
+    cont_dias = conv['conteo'] # Forma de conteo de días
+    calendario = conv['calendario'] # Calendario de México
+
+    descuento = ql.RelinkableYieldTermStructureHandle(curva_descuento)
+    ibor_MXNTIIE = indiceProyeccion('TIIE', curva_proyeccion) # Índice compartido ligado a la curva
+
+    calendario_pagos = _calendario(inicio, plazo, dias_liq, calendario)
+    swap = ql.VanillaSwap(
+        _tipo(posicion), nocional,
+        calendario_pagos, tasa_fija/100, cont_dias, # Pata fija
+        calendario_pagos, ibor_MXNTIIE, 0.0, cont_dias) # Pata flotante
+    swap.setPricingEngine(ql.DiscountingSwapEngine(descuento))
+
+    return swap
+
+
+def swapFTIIE(nocional, tasa_fija, plazo, curva_proyeccion, curva_descuento,
+              posicion='recibe', inicio=None):
+    """
+    Crea un swap OIS de TIIE de Fondeo con cupones cada 28 días.
+
+    Parameters
+    ----------
+    nocional : float
+        Nocional en MXN.
+    tasa_fija : float
+        Tasa fija en porcentaje.
+    plazo : int
+        Número de periodos de 28 días.
+    curva_proyeccion : ql.YieldTermStructure
+        Curva FTIIE.
+    curva_descuento : ql.YieldTermStructure
+        Curva de descuento MXN.
+    posicion : str
+        'recibe' o 'paga' la tasa fija.
+    inicio : date, optional
+        Fecha de inicio. Por defecto t+2.
+
+    Returns
+    -------
+    ql.OvernightIndexedSwap
+        Swap con su motor de valuación.
+    """
+
+    conv = convenciones['FTIIE']
+    dias_liq = conv['dias_liq'] # Días de liquidación (2)
+    dias_pago = conv['dias_pago'] # Días que tarda en pagar después del corte de cupón
+    cont_dias = conv['conteo'] # Forma de conteo de días
+    calendario = conv['calendario'] # Calendario de México
+
+    descuento = ql.RelinkableYieldTermStructureHandle(curva_descuento)
+    index_MXNFTIIE = indiceProyeccion('SWP_FTIIE', curva_proyeccion) # Índice compartido ligado a la curva
+
+    swap = ql.OvernightIndexedSwap(
+        _tipo(posicion), nocional,
+        _calendario(inicio, plazo, dias_liq, calendario),
+        tasa_fija/100, cont_dias,
+        index_MXNFTIIE,
+        0.0, # Spread
+        dias_pago, # Días de pago después del corte
+        conv['ajuste'], # Ajuste de la fecha de pago
+        calendario)
+    swap.setPricingEngine(ql.DiscountingSwapEngine(descuento))
+
+    return swap
+
+
+def crearLibro(libro, curvas):
+    """
+    Crea los swaps de QuantLib de un libro.
+
+    Parameters
+    ----------
+    libro : list
+        Operaciones (ver la descripción del módulo).
+    curvas : dict
+        Curvas con llaves 'DISCTIIE', 'TIIE28' y 'FTIIE' (ver `curvas.genCurvas`).
+
+    Returns
+    -------
+    list
+        Swaps ligados a las curvas: si las curvas se reajustan, los swaps se revalúan.
+    """
+
+    constructores = {'TIIE28': swapTIIE28, 'FTIIE': swapFTIIE}
+    swaps = []
+    for op in libro:
+        if op['curva'] not in constructores:
+            raise ValueError(f"Curva desconocida: {op['curva']!r}")
+        swaps.append(constructores[op['curva']](
+            op['nocional'], op['tasa_fija'], op['plazo'],
+            curvas[op['curva']], curvas['DISCTIIE'],
+            op.get('posicion', 'recibe'), op.get('inicio')))
+    return swaps
+
+
+def idsLibro(libro):
+    """ Identificadores de las operaciones de un libro (su posición si no tienen 'id'). """
+    return [op.get('id', i) for i, op in enumerate(libro)]
+
+
+def valuarLibro(swaps):
+    """ Valor presente de cada swap, en MXN. """
+    return np.array([s.NPV() for s in swaps])
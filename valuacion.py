@@ -0,0 +1,160 @@
+"""
+Valuación vectorizada de libros de swaps de TIIE28 y TIIE de Fondeo.
+
+En lugar de crear un `ql.VanillaSwap` u `ql.OvernightIndexedSwap` por
+operación (ver `swaps.py`), se generan con NumPy las fechas de todos los
+cupones del libro, se toman los factores de descuento de una tabla por día
+natural calculada una sola vez con `consulta.CurvaVectorizada` y se suman los
+flujos por operación.
+
+Con las convenciones de `swaps.py`:
+
+- Cupones cada 28 días ajustados con Following en el calendario de México.
+- TIIE28: el cupón flotante es N (P(s)/P(e) - 1) con P la curva TIIE28 (cupón
+  "par" de QuantLib) y se paga al final del periodo.
+- FTIIE: el cupón compuesto diario se telescopiza a N (P(s)/P(e) - 1) con P la
+  curva FTIIE y se paga dos días hábiles después del final del periodo.
+- La pata fija paga N K (e - s)/360 en las mismas fechas.
+
+Solo se valúan operaciones que no han empezado (inicio posterior a la fecha
+de evaluación), pues no se manejan cupones ya fijados.
+"""
+
+import numpy as np
+import pandas as pd
+
+from calendarios import calendarioNumpy
+from consulta import CurvaVectorizada
+from convenciones import calendario_mexico, convenciones as convenciones_grupo
+
+
+# Días de liquidación y días de pago después del corte de cupón por curva
+convenciones = {curva: {'dias_liq': conv['dias_liq'], 'dias_pago': conv['dias_pago']}
+                for curva, conv in convenciones_grupo.items() if curva in ('TIIE28', 'FTIIE')}
+
+
+def libroColumnar(libro):
+    """
+    Convierte un libro (lista de operaciones de `swaps.py` o DataFrame) a columnas.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas 'id', 'curva', 'nocional', 'tasa_fija', 'plazo', 'posicion' e 'inicio'.
+    """
+
+    tabla = pd.DataFrame(libro).copy()
+    if 'id' not in tabla:
+        tabla['id'] = np.arange(len(tabla))
+    if 'posicion' not in tabla:
+        tabla['posicion'] = 'recibe'
+    if 'inicio' not in tabla:
+        tabla['inicio'] = pd.NaT
+    tabla['posicion'] = tabla['posicion'].fillna('recibe')
+    return tabla[['id', 'curva', 'nocional', 'tasa_fija', 'plazo', 'posicion', 'inicio']]
+
+
+def _flujos(inicio, plazo, following, pago):
+    """
+    Días de todos los cupones de un grupo de operaciones, en un solo arreglo.
+
+    Las fechas se manejan como días desde la fecha de referencia y el ajuste de
+    días hábiles se hace con tablas precalculadas (`following` y `pago`).
+
+    Returns
+    -------
+    tuple
+        (operación de cada cupón, inicio, fin y pago de cada cupón).
+    """
+
+    operacion = np.repeat(np.arange(len(plazo)), plazo)
+    # Número de cupón dentro de cada operación
+    k = np.arange(len(operacion)) - np.repeat(np.cumsum(plazo) - plazo, plazo)
+
+    inicio_sin_ajuste = inicio[operacion] + 28*k
+    s = following[inicio_sin_ajuste]
+    e = following[inicio_sin_ajuste + 28]
+    return operacion, s, e, pago[e]
+
+
+def valuarLibroVectorizado(libro, curvas, tam_bloque=20000):
+    """
+    Valúa un libro de swaps de TIIE28 y FTIIE.
+
+    Parameters
+    ----------
+    libro : list or pd.DataFrame
+        Operaciones (ver `swaps.py`).
+    curvas : dict
+        Curvas 'DISCTIIE', 'TIIE28' y 'FTIIE' de QuantLib (ver `curvas.genCurvas`)
+        o ya convertidas a `consulta.CurvaVectorizada`.
+    tam_bloque : int
+        Operaciones que se valúan juntas; limita la memoria usada.
+
+    Returns
+    -------
+    pd.DataFrame
+        'Valor Presente' (MXN) y 'Tasa Par' (%) de cada operación, indexado por 'id'.
+    """
+
+    tabla = libroColumnar(libro)
+    vect = {n: c if isinstance(c, CurvaVectorizada) else CurvaVectorizada.desdeQL(c)
+            for n, c in curvas.items() if n in ('DISCTIIE', 'TIIE28', 'FTIIE')}
+    referencia = vect['DISCTIIE'].referencia
+
+    plazo = tabla['plazo'].to_numpy(dtype=np.int64)
+    explicito = tabla['inicio'].notna().to_numpy()
+    inicio = np.full(len(tabla), referencia, dtype='datetime64[D]')
+    inicio[explicito] = pd.to_datetime(tabla['inicio'][explicito]).to_numpy().astype('datetime64[D]')
+
+    # Tablas por día natural: día hábil siguiente y día de pago (días desde la referencia)
+    n_dias = int(((inicio + 28*plazo).max() - referencia).astype(np.int64)) + 30
+    dias = referencia + np.arange(n_dias)
+    habiles = calendarioNumpy(calendario_mexico, referencia, dias[-1] + 30)
+    following = (np.busday_offset(dias, 0, roll='forward', busdaycal=habiles) - referencia).astype(np.int64)
+    pago = {n: (np.busday_offset(dias, n, roll='forward', busdaycal=habiles) - referencia).astype(np.int64)
+            for n in {conv['dias_pago'] for conv in convenciones.values()}}
+
+    # Inicio spot por defecto
+    for curva, conv in convenciones.items():
+        spot = np.busday_offset(referencia, conv['dias_liq'], roll='forward', busdaycal=habiles)
+        inicio[~explicito & (tabla['curva'] == curva).to_numpy()] = spot
+
+    if np.any(inicio <= referencia):
+        raise ValueError('Solo se pueden valuar operaciones con inicio posterior a la fecha de evaluación')
+    curvas_desconocidas = set(tabla['curva']) - set(convenciones)
+    if curvas_desconocidas:
+        raise ValueError(f'Curvas desconocidas: {curvas_desconocidas}')
+    inicio = (inicio - referencia).astype(np.int64)
+
+    # Factores de descuento de cada día natural: una sola consulta por curva
+    tiempos = np.arange(n_dias + 10)/360
+    factores = {n: v.descuento(tiempos) for n, v in vect.items()}
+
+    signo = np.where(tabla['posicion'].to_numpy() == 'recibe', 1.0, -1.0)
+    nocional = tabla['nocional'].to_numpy(dtype=float)
+    tasa = tabla['tasa_fija'].to_numpy(dtype=float)/100
+
+    anualidad = np.zeros(len(tabla))
+    flotante = np.zeros(len(tabla))
+
+    for curva, conv in convenciones.items():
+        indices = np.flatnonzero((tabla['curva'] == curva).to_numpy())
+        for bloque in np.array_split(indices, max(1, int(np.ceil(len(indices)/tam_bloque)))):
+            if len(bloque) == 0:
+                continue
+
+            operacion, s, e, p = _flujos(inicio[bloque], plazo[bloque], following, pago[conv['dias_pago']])
+
+            P = factores[curva]
+            D = factores['DISCTIIE'][p]
+            N = nocional[bloque][operacion]
+            anualidad_cupon = N*(e - s)/360*D
+            flotante_cupon = N*(P[s]/P[e] - 1)*D
+
+            anualidad[bloque] = np.bincount(operacion, anualidad_cupon, len(bloque))
+            flotante[bloque] = np.bincount(operacion, flotante_cupon, len(bloque))
+
+    valor = signo*(tasa*anualidad - flotante)
+    return pd.DataFrame({'Valor Presente': valor, 'Tasa Par': 100*flotante/anualidad},
+                        index=pd.Index(tabla['id'], name='id'))